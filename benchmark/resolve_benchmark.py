@@ -0,0 +1,492 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+""" Benchmark of the resolve step.
+
+The benchmark generates a synthetic dependency graph as local bare git
+repositories and measures the time it takes for waf to resolve it. The graph
+has "depth" levels with "width" libraries in each level. The app depends on
+all libraries in the first level and each library depends on all libraries
+in the next level:
+
+          +-----------+
+          |    app    |-----------------+
+          +--+-----+--+                 |
+             |     |                    v
+             v     v              +-----------+
+      +-------+   +-------+       | http_0..N |
+      | lib_1 |   | lib_1 |  ...  +-----------+
+      +---+---+   +---+---+
+          |   \\   /   |
+          v    \\ /    v
+      +-------+ X +-------+
+      | lib_2 |   | lib_2 |  ...
+      +-------+   +-------+
+
+The http dependencies are archives served by a local http.server.
+
+The following runs are timed:
+
+- cold: Configure with no resolved dependencies.
+- warm: Configure again, nothing has changed.
+- warm_force: Configure again with --force_resolve.
+- lock: Configure with --force_resolve using a lock_version_resolve.json.
+- load: Build, which loads the resolved dependencies.
+
+The results are written as JSON, such that the results of two commits
+can be compared e.g.:
+
+    python waf build
+    python benchmark/resolve_benchmark.py --waf build/waf --output old.json
+    ... apply changes ...
+    python waf build
+    python benchmark/resolve_benchmark.py --waf build/waf --output new.json \\
+        --compare old.json
+"""
+
+import argparse
+import functools
+import http.server
+import json
+import os
+import platform
+import random
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+
+HOST = "bench.local"
+
+RESULTS_VERSION = 1
+
+# The environment used when running git to create the repositories
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "benchmark",
+    "GIT_AUTHOR_EMAIL": "benchmark@localhost",
+    "GIT_COMMITTER_NAME": "benchmark",
+    "GIT_COMMITTER_EMAIL": "benchmark@localhost",
+    # Allow submodules using local file URLs, see CVE-2022-39253
+    "GIT_CONFIG_COUNT": "1",
+    "GIT_CONFIG_KEY_0": "protocol.file.allow",
+    "GIT_CONFIG_VALUE_0": "always",
+}
+
+APP_WSCRIPT = """#! /usr/bin/env python
+# encoding: utf-8
+
+top = "."
+
+
+def options(opt):
+    pass
+
+
+def configure(conf):
+    pass
+
+
+def build(bld):
+    pass
+"""
+
+LIBRARY_WSCRIPT = """#! /usr/bin/env python
+# encoding: utf-8
+
+
+def build(bld):
+    pass
+"""
+
+
+def run(args, cwd, env=None):
+    """Runs a command and returns its output, raises if the command fails."""
+    result = subprocess.run(
+        args,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Command {args} failed in {cwd}:\n{result.stdout}")
+
+    return result.stdout
+
+
+def random_bytes(rng, size):
+    """Returns incompressible content, such that the size of the repository
+    is not reduced by git's compression."""
+    return rng.getrandbits(8 * size).to_bytes(size, "little")
+
+
+class Graph(object):
+    """Generates the dependency graph."""
+
+    def __init__(self, root, width, depth, tags, size, submodules, http, method):
+        """Construct an instance.
+
+        :param root: The folder where the graph is created as a string.
+        :param width: The number of libraries per level.
+        :param depth: The number of levels.
+        :param tags: The number of tags in each library.
+        :param size: The size of the content of each library in bytes.
+        :param submodules: The number of libraries with a submodule.
+        :param http: The number of http dependencies.
+        :param method: The git resolver method, "semver" or "checkout".
+        """
+        self.root = root
+        self.width = width
+        self.depth = depth
+        self.tags = tags
+        self.size = size
+        self.submodules = submodules
+        self.http = http
+        self.method = method
+
+        self.repos_path = os.path.join(root, "repos")
+        self.work_path = os.path.join(root, "work")
+        self.archives_path = os.path.join(root, "archives")
+
+        self.env = dict(os.environ, **GIT_ENV)
+        self.rng = random.Random(42)
+
+    def git_protocol(self):
+        """The --git_protocol option rewriting the sources to the local
+        repositories."""
+        return f"file://{self.repos_path}/{{host}}/{{path}}.git"
+
+    def create(self, http_url):
+        """Creates the repositories, archives and returns the resolve.json
+        of the app.
+
+        :param http_url: The URL where the archives are served as a string.
+        """
+        for path in [self.repos_path, self.work_path, self.archives_path]:
+            os.makedirs(path)
+
+        submodule_url = None
+        if self.submodules:
+            submodule_url = self.__create_repository(name="submodule", dependencies=[])
+
+        # Create the libraries bottom-up, such that the dependencies exist
+        below = []
+        count = 0
+
+        for level in reversed(range(1, self.depth + 1)):
+            names = [f"lib_{level}_{i}" for i in range(self.width)]
+
+            for name in names:
+                self.__create_repository(
+                    name=name,
+                    dependencies=below,
+                    submodule_url=submodule_url if count < self.submodules else None,
+                )
+                count += 1
+
+            below = names
+
+        dependencies = [self.__git_dependency(name) for name in below]
+
+        for i in range(self.http):
+            name = f"http_{i}"
+            self.__create_archive(name=name)
+            dependencies.append(
+                {
+                    "name": name,
+                    "resolver": "http",
+                    "extract": True,
+                    "source": f"{http_url}/{name}.tar.gz",
+                }
+            )
+
+        return dependencies
+
+    def __git_dependency(self, name):
+        dependency = {
+            "name": name,
+            "resolver": "git",
+            "method": self.method,
+            "source": f"{HOST}/acme/{name}.git",
+        }
+
+        if self.method == "semver":
+            dependency["major"] = 1
+        else:
+            dependency["checkout"] = self.__tag(self.tags - 1)
+
+        return dependency
+
+    def __tag(self, index):
+        return f"1.{index}.0"
+
+    def __create_repository(self, name, dependencies, submodule_url=None):
+        source = os.path.join(self.work_path, name)
+        os.makedirs(source)
+
+        git = functools.partial(run, cwd=source, env=self.env)
+
+        git(["git", "init", "-q"])
+        git(["git", "symbolic-ref", "HEAD", "refs/heads/master"])
+
+        with open(os.path.join(source, "wscript"), "w") as wscript:
+            wscript.write(LIBRARY_WSCRIPT)
+
+        if dependencies:
+            resolve_json = [self.__git_dependency(d) for d in dependencies]
+            with open(os.path.join(source, "resolve.json"), "w") as f:
+                json.dump(resolve_json, f, indent=4)
+
+        if submodule_url:
+            git(["git", "submodule", "add", "-q", submodule_url, "submodule"])
+
+        # Spread the content over the tags, such that each tag adds content
+        chunk = max(1, self.size // max(1, self.tags))
+
+        for index in range(max(1, self.tags)):
+            with open(os.path.join(source, f"data_{index}.bin"), "wb") as f:
+                f.write(random_bytes(self.rng, chunk))
+
+            git(["git", "add", "-A"])
+            git(["git", "commit", "-q", "-m", f"Version {self.__tag(index)}"])
+            git(["git", "tag", self.__tag(index)])
+
+        bare = os.path.join(self.repos_path, HOST, "acme", name + ".git")
+        run(
+            ["git", "clone", "-q", "--bare", source, bare],
+            cwd=self.work_path,
+            env=self.env,
+        )
+
+        return "file://" + bare
+
+    def __create_archive(self, name):
+        source = os.path.join(self.work_path, name)
+        os.makedirs(source)
+
+        with open(os.path.join(source, "wscript"), "w") as wscript:
+            wscript.write(LIBRARY_WSCRIPT)
+
+        with open(os.path.join(source, "data.bin"), "wb") as f:
+            f.write(random_bytes(self.rng, self.size))
+
+        path = os.path.join(self.archives_path, name + ".tar.gz")
+
+        with tarfile.open(path, "w:gz") as archive:
+            for filename in sorted(os.listdir(source)):
+                archive.add(os.path.join(source, filename), arcname=filename)
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(directory):
+    """Serves the directory using a local http.server.
+
+    :return: The server, which must be shut down when done.
+    """
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server
+
+
+class Benchmark(object):
+    """Runs waf in the app and times the runs."""
+
+    def __init__(self, app_path, waf_args, git_protocol, env, repeat):
+        self.app_path = app_path
+        self.waf_args = waf_args
+        self.git_protocol = git_protocol
+        self.env = env
+        self.repeat = repeat
+        self.results = {}
+
+    def waf(self, args):
+        """Runs waf and returns the elapsed time in seconds."""
+        start = time.perf_counter()
+        run([sys.executable, "waf"] + args, cwd=self.app_path, env=self.env)
+        return time.perf_counter() - start
+
+    def configure(self, args=()):
+        return self.waf(
+            ["configure", f"--git_protocol={self.git_protocol}"]
+            + self.waf_args
+            + list(args)
+        )
+
+    def clean(self):
+        for name in ["build", "resolved_dependencies", "resolve_symlinks"]:
+            path = os.path.join(self.app_path, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+
+        lock_path = os.path.join(self.app_path, "lock_version_resolve.json")
+        if os.path.isfile(lock_path):
+            os.remove(lock_path)
+
+    def time(self, name, run, setup=None):
+        """Times run repeatedly and stores the results under name."""
+        runs = []
+
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            runs.append(run())
+
+        self.results[name] = {
+            "runs": runs,
+            "min": min(runs),
+            "median": statistics.median(runs),
+        }
+
+        print(
+            f"{name:<12} min {min(runs):8.3f}s median {statistics.median(runs):8.3f}s"
+        )
+
+    def run(self):
+        # The waf binary unpacks itself the first time it runs
+        self.waf(["--version"])
+
+        self.time("cold", run=self.configure, setup=self.clean)
+        self.time("warm", run=self.configure)
+        self.time("warm_force", run=lambda: self.configure(["--force_resolve"]))
+
+        self.configure(["--force_resolve", "--lock_versions"])
+        self.time("lock", run=lambda: self.configure(["--force_resolve"]))
+
+        self.clean()
+        self.configure()
+        self.time("load", run=lambda: self.waf(["build"]))
+
+        return self.results
+
+
+def compare(results, baseline):
+    """Prints the change of the median times compared to a baseline."""
+    print(f"\nCompared to {baseline.get('label')}:")
+
+    for name, result in results.items():
+        if name not in baseline["results"]:
+            continue
+
+        old = baseline["results"][name]["median"]
+        new = result["median"]
+        print(f"{name:<12} {old:8.3f}s -> {new:8.3f}s ({new / old:6.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the resolve step")
+    parser.add_argument("--waf", default="build/waf", help="The waf binary to test")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Compare with the results in this file")
+    parser.add_argument("--label", help="A label stored with the results")
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--tags", type=int, default=10)
+    parser.add_argument(
+        "--size", type=int, default=64 * 1024, help="Size of each repository in bytes"
+    )
+    parser.add_argument("--submodules", type=int, default=0)
+    parser.add_argument("--http", type=int, default=1)
+    parser.add_argument("--method", choices=["semver", "checkout"], default="semver")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--waf_args",
+        default="",
+        help='Extra arguments passed to configure e.g. "--resolve_jobs 4"',
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Do not remove the generated graph"
+    )
+    args = parser.parse_args()
+
+    waf_binary = os.path.abspath(args.waf)
+    root = tempfile.mkdtemp(prefix="wurf-benchmark-")
+
+    graph = Graph(
+        root=root,
+        width=args.width,
+        depth=args.depth,
+        tags=args.tags,
+        size=args.size,
+        submodules=args.submodules,
+        http=args.http,
+        method=args.method,
+    )
+
+    server = serve(directory=graph.archives_path)
+
+    try:
+        http_url = f"http://127.0.0.1:{server.server_address[1]}"
+        dependencies = graph.create(http_url=http_url)
+
+        app_path = os.path.join(root, "app")
+        os.makedirs(app_path)
+        shutil.copy(waf_binary, os.path.join(app_path, "waf"))
+
+        with open(os.path.join(app_path, "wscript"), "w") as wscript:
+            wscript.write(APP_WSCRIPT)
+
+        with open(os.path.join(app_path, "resolve.json"), "w") as f:
+            json.dump(dependencies, f, indent=4)
+
+        benchmark = Benchmark(
+            app_path=app_path,
+            waf_args=shlex.split(args.waf_args),
+            git_protocol=graph.git_protocol(),
+            env=graph.env,
+            repeat=args.repeat,
+        )
+
+        results = benchmark.run()
+    finally:
+        server.shutdown()
+        if args.keep:
+            print(f"The graph is kept in {root}")
+        else:
+            shutil.rmtree(root)
+
+    output = {
+        "version": RESULTS_VERSION,
+        "label": args.label,
+        "timestamp": time.time(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "git": run(["git", "--version"], cwd=os.getcwd()).strip(),
+        "graph": {
+            "width": args.width,
+            "depth": args.depth,
+            "tags": args.tags,
+            "size": args.size,
+            "submodules": args.submodules,
+            "http": args.http,
+            "method": args.method,
+        },
+        "waf_args": args.waf_args,
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=4, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare(results=results, baseline=json.load(f))
+
+
+if __name__ == "__main__":
+    main()
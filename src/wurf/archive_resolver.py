@@ -2,15 +2,18 @@
 # encoding: utf-8
 
 import os
+import json
 import hashlib
 
+from .directory import atomic_directory, remove_directory
+
 
 class ArchiveResolver(object):
     """
     Extracts an archive
     """
 
-    def __init__(self, ctx, archive_extractor, resolver, cwd):
+    def __init__(self, ctx, archive_extractor, resolver, cwd, stream_path=None):
         """Construct a new instance.
 
         :param ctx: A Waf Context instance.
@@ -20,11 +23,14 @@ class ArchiveResolver(object):
             archive.
         :param cwd: Current working directory as a string. This is the place
             where we should create new folders etc.
+        :param stream_path: The folder where the HttpResolver extracted the
+            archive while it was downloaded as a string or None.
         """
         self.ctx = ctx
         self.archive_extractor = archive_extractor
         self.resolver = resolver
         self.cwd = cwd
+        self.stream_path = stream_path
 
     def resolve(self):
         """
@@ -41,14 +47,90 @@ class ArchiveResolver(object):
         extract_folder = "extract-" + extract_hash
 
         extract_path = os.path.join(self.cwd, extract_folder)
+
+        # The stamp identifies the archive which was extracted, such that we
+        # extract again if the archive was downloaded again
+        stamp_path = extract_path + ".json"
+        stamp = ArchiveResolver.__stamp(path=path)
+
         if os.path.exists(extract_path) and len(os.listdir(extract_path)) != 0:
+            stored = ArchiveResolver.__read_stamp(stamp_path=stamp_path)
+
+            if stored is None:
+                # Extracted by an earlier version without stamps
+                ArchiveResolver.__write_stamp(stamp_path=stamp_path, stamp=stamp)
+                stored = stamp
+
+            if stored == stamp:
+                self.ctx.to_log(
+                    f"wurf: ArchiveResolver: {extract_path} is not empty. "
+                    "Skipping extraction."
+                )
+
+                return extract_path
+
+            self.ctx.to_log(f"wurf: ArchiveResolver: {path} changed. Extracting again.")
+            remove_directory(path=extract_path)
+
+        if os.path.isdir(extract_path):
+            # An empty folder may be left behind by an earlier version
+            os.rmdir(extract_path)
+
+        if self.__use_stream(path=path, stamp=stamp, extract_path=extract_path):
             self.ctx.to_log(
-                f"wurf: ArchiveResolver: {extract_path} is not empty. "
-                "Skipping extraction."
+                f"wurf: ArchiveResolver: {path} was extracted while downloading."
             )
+        else:
+            # A partially extracted archive must not be used the next time we
+            # resolve, so we extract to a temporary folder
+            with atomic_directory(path=extract_path) as temp_path:
+                self.archive_extractor(path=path, to_path=temp_path)
 
-            return extract_path
-
-        self.archive_extractor(path=path, to_path=extract_path)
+        ArchiveResolver.__write_stamp(stamp_path=stamp_path, stamp=stamp)
 
         return extract_path
+
+    def __use_stream(self, path, stamp, extract_path):
+        """Moves the archive extracted while downloading to the extract_path.
+
+        :return: True if the extracted archive was available.
+        """
+        if self.stream_path is None or not os.path.isdir(self.stream_path):
+            return False
+
+        stream_stamp_path = self.stream_path + ".json"
+        stored = ArchiveResolver.__read_stamp(stamp_path=stream_stamp_path)
+
+        if stored == dict(stamp, path=path):
+            os.rename(self.stream_path, extract_path)
+            os.remove(stream_stamp_path)
+            return True
+
+        # The folder belongs to another archive
+        remove_directory(path=self.stream_path)
+
+        if os.path.isfile(stream_stamp_path):
+            os.remove(stream_stamp_path)
+
+        return False
+
+    @staticmethod
+    def __stamp(path):
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @staticmethod
+    def __read_stamp(stamp_path):
+        if not os.path.isfile(stamp_path):
+            return None
+
+        try:
+            with open(stamp_path, "r") as stamp_file:
+                return json.load(stamp_file)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def __write_stamp(stamp_path, stamp):
+        with open(stamp_path, "w") as stamp_file:
+            json.dump(stamp, stamp_file)
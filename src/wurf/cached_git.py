@@ -0,0 +1,307 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import json
+import threading
+
+from .git import Git
+
+
+class CachedGit(Git):
+    """Git which caches the results of read-only queries.
+
+    The results are cached per repository and stored in a file inside the
+    git directory, such that they can be reused the next time we resolve.
+
+    The results of new queries are kept in memory and stored by write(), such
+    that the files are written once per resolve.
+
+    The cached results are only valid as long as the refs, HEAD and config of
+    the repository are unchanged. To detect changes we compute a stamp from
+    the inode, modification time and size of these files. Any change to the
+    repository made by git e.g. by a fetch, checkout or tag will change the
+    stamp and invalidate the cache.
+
+    Computing the stamp requires walking the refs of the repository, so it
+    is only computed the first time a repository is queried. The commands
+    of this class which change the repository e.g. fetch(...) or
+    checkout(...) invalidate the cache and the stamp of the repository.
+    """
+
+    CACHE_FILE = "wurf_git_cache.json"
+
+    VERSION = 1
+
+    def __init__(self, git_binary, ctx):
+        """Construct a new CachedGit instance.
+
+        :param git_binary: A string containing the path to a git executable.
+        :param ctx: A Waf Context instance.
+        """
+        super(CachedGit, self).__init__(git_binary=git_binary, ctx=ctx)
+
+        # Dict where the key is the git directory and the value is a dict
+        # with the stamp and the cached query results
+        self.cache = {}
+
+        # Dict where the key is the git directory and the value is the stamp
+        # computed the first time the repository was queried
+        self.stamps = {}
+
+        # Set with the git directories whose cache entry has changed since
+        # it was written
+        self.dirty = set()
+
+        # The queries may be run from multiple threads
+        self.lock = threading.Lock()
+
+        self.cached_version = None
+
+    def version(self):
+        """See Git.version(...), the version is cached for the lifetime of
+        this object."""
+        if self.cached_version is None:
+            self.cached_version = super(CachedGit, self).version()
+        return self.cached_version
+
+    def current_commit(self, cwd):
+        """See Git.current_commit(...)"""
+        return self.__query(
+            cwd, "current_commit", lambda: super(CachedGit, self).current_commit(cwd)
+        )
+
+    def head(self, cwd):
+        """See Git.head(...)"""
+        commit_id, refname = self.__query(
+            cwd, "head", lambda: super(CachedGit, self).head(cwd)
+        )
+        return commit_id, refname
+
+    def tags(self, cwd):
+        """See Git.tags(...)"""
+        tags = self.__query(cwd, "tags", lambda: super(CachedGit, self).tags(cwd))
+        return list(tags)
+
+    def remote_origin_url(self, cwd):
+        """See Git.remote_origin_url(...)"""
+        return self.__query(
+            cwd,
+            "remote_origin_url",
+            lambda: super(CachedGit, self).remote_origin_url(cwd),
+        )
+
+    def checkout_to_commit_id(self, cwd, checkout):
+        """See Git.checkout_to_commit_id(...)"""
+        return self.__query(
+            cwd,
+            f"checkout_to_commit_id {checkout}",
+            lambda: super(CachedGit, self).checkout_to_commit_id(
+                cwd=cwd, checkout=checkout
+            ),
+        )
+
+    def for_each_ref(self, cwd):
+        """See Git.for_each_ref(...)"""
+        lines = self.__query(
+            cwd, "for_each_ref", lambda: super(CachedGit, self).for_each_ref(cwd)
+        )
+        return list(lines)
+
+    def default_branch(self, cwd):
+        """See Git.default_branch(...)"""
+        return self.__query(
+            cwd, "default_branch", lambda: super(CachedGit, self).default_branch(cwd)
+        )
+
+    def has_object(self, cwd, revision):
+        """See Git.has_object(...)"""
+        return self.__query(
+            cwd,
+            f"has_object {revision}",
+            lambda: super(CachedGit, self).has_object(cwd=cwd, revision=revision),
+        )
+
+    def clone(self, repository, directory, cwd, **kwargs):
+        """See Git.clone(...)"""
+        try:
+            super(CachedGit, self).clone(
+                repository=repository, directory=directory, cwd=cwd, **kwargs
+            )
+        finally:
+            self.__invalidate(os.path.join(cwd, directory))
+
+    def remote_update(self, cwd):
+        """See Git.remote_update(...)"""
+        try:
+            super(CachedGit, self).remote_update(cwd=cwd)
+        finally:
+            self.__invalidate(cwd)
+
+    def pull(self, cwd):
+        """See Git.pull(...)"""
+        try:
+            super(CachedGit, self).pull(cwd=cwd)
+        finally:
+            self.__invalidate(cwd)
+
+    def fetch(self, cwd, repository, refspec):
+        """See Git.fetch(...)"""
+        try:
+            super(CachedGit, self).fetch(
+                cwd=cwd, repository=repository, refspec=refspec
+            )
+        finally:
+            self.__invalidate(cwd)
+
+    def set_remote_origin_url(self, cwd, url):
+        """See Git.set_remote_origin_url(...)"""
+        try:
+            super(CachedGit, self).set_remote_origin_url(cwd=cwd, url=url)
+        finally:
+            self.__invalidate(cwd)
+
+    def checkout(self, branch, cwd):
+        """See Git.checkout(...)"""
+        try:
+            super(CachedGit, self).checkout(branch=branch, cwd=cwd)
+        finally:
+            self.__invalidate(cwd)
+
+    def __query(self, cwd, key, run):
+        """Returns the cached result of a query or runs it.
+
+        :param cwd: The current working directory as a string
+        :param key: The key identifying the query as a string
+        :param run: Function running the query
+        :return: The result of the query
+        """
+        git_dir = os.path.join(str(cwd), ".git")
+
+        if not os.path.isdir(git_dir):
+            # We only cache queries for the root folder of a repository
+            return run()
+
+        with self.lock:
+            stamp = self.stamps.get(git_dir, None)
+
+        if stamp is None:
+            # The stamp must be computed before running the query. Otherwise
+            # we might store a stale result if the repository is changed
+            # concurrently.
+            stamp = self.__stamp(git_dir=git_dir)
+
+            with self.lock:
+                stamp = self.stamps.setdefault(git_dir, stamp)
+
+        with self.lock:
+            entry = self.__entry(git_dir=git_dir, stamp=stamp)
+            if key in entry["queries"]:
+                return entry["queries"][key]
+
+        result = run()
+
+        with self.lock:
+            # The repository may have been changed while running the query,
+            # in that case the result is not stored
+            if self.stamps.get(git_dir, None) == stamp:
+                entry = self.__entry(git_dir=git_dir, stamp=stamp)
+                entry["queries"][key] = result
+                self.dirty.add(git_dir)
+
+        return result
+
+    def write(self):
+        """Writes the changed cache entries to the git directories."""
+        with self.lock:
+            entries = [(d, self.cache[d]) for d in self.dirty if d in self.cache]
+            self.dirty = set()
+
+        for git_dir, entry in entries:
+            self.__write(git_dir=git_dir, entry=entry)
+
+    def __entry(self, git_dir, stamp):
+        """Returns the cache entry of a repository for the given stamp.
+
+        Must be called with the lock held.
+        """
+        entry = self.cache.get(git_dir, None)
+
+        if entry is None:
+            entry = self.__read(git_dir=git_dir)
+
+        if entry is None or entry["stamp"] != stamp:
+            entry = {"version": CachedGit.VERSION, "stamp": stamp, "queries": {}}
+
+        self.cache[git_dir] = entry
+        return entry
+
+    def __invalidate(self, cwd):
+        git_dir = os.path.join(str(cwd), ".git")
+
+        with self.lock:
+            self.cache.pop(git_dir, None)
+            self.stamps.pop(git_dir, None)
+
+    def __read(self, git_dir):
+        path = os.path.join(git_dir, CachedGit.CACHE_FILE)
+
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "r") as cache_file:
+                entry = json.load(cache_file)
+        except ValueError:
+            return None
+
+        if entry.get("version", None) != CachedGit.VERSION:
+            return None
+
+        return entry
+
+    def __write(self, git_dir, entry):
+        path = os.path.join(git_dir, CachedGit.CACHE_FILE)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            with open(temp_path, "w") as cache_file:
+                json.dump(entry, cache_file)
+            os.replace(temp_path, path)
+        except OSError as e:
+            # The cache is only an optimization e.g. the repository may be
+            # read-only
+            self.ctx.to_log(f"wurf: CachedGit could not write {path}: {e}")
+
+    def __stamp(self, git_dir):
+        """Computes a stamp which changes when the refs, HEAD or config
+        of the repository changes.
+
+        Git updates these files by writing a new file and renaming it,
+        so the inode of the file and the modification time of the
+        containing folder changes.
+
+        :param git_dir: The path to the git directory as a string.
+        :return: The stamp as a list.
+        """
+
+        def stat(path):
+            try:
+                s = os.stat(path)
+            except OSError:
+                return None
+            return [s.st_ino, s.st_mtime_ns, s.st_size]
+
+        stamp = [git_dir]
+
+        for name in ["HEAD", "config", "packed-refs"]:
+            stamp.append([name, stat(os.path.join(git_dir, name))])
+
+        refs_path = os.path.join(git_dir, "refs")
+
+        for root, dirs, files in os.walk(refs_path):
+            dirs.sort()
+            for name in [root] + sorted(os.path.join(root, f) for f in files):
+                stamp.append([os.path.relpath(name, git_dir), stat(name)])
+
+        return stamp
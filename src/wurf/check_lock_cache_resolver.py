@@ -5,18 +5,28 @@ from .error import DependencyError
 
 
 class CheckLockCacheResolver(object):
-    """Iterates through a list of resolvers until a path is resolved."""
+    """Checks that a dependency matches the lock when resolving it.
 
-    def __init__(self, resolver, lock_cache_from, dependency):
+    The cheap checks, i.e. the SHA1 of the dependency and the commit of git
+    dependencies, fail the resolve right away. Hashing the content of http
+    dependencies is expensive, so it is verified against the lock after the
+    resolve, see the LockVerifier.
+    """
+
+    def __init__(self, resolver, lock_cache_from, dependency, from_lock_names):
         """Construct an instance.
 
         :param resolver: The resolver to use
         :param lock_cache_from: The lock cache to use
         :param dependency: The dependency to resolve
+        :param from_lock_names: List where the names of the http
+            dependencies resolved from the lock are added, such that their
+            content can be verified when all dependencies have been resolved.
         """
         self.resolver = resolver
         self.lock_cache = lock_cache_from
         self.dependency = dependency
+        self.from_lock_names = from_lock_names
 
     def resolve(self):
         """Resolve the dependency.
@@ -39,8 +49,6 @@ class CheckLockCacheResolver(object):
                 dependency=self.dependency,
             )
 
-        # We need to call resolve before checking the content as we need to know
-        # where the content is located.
         path = self.resolver.resolve()
 
         # restore the resolver info
@@ -48,7 +56,7 @@ class CheckLockCacheResolver(object):
             dependency=self.dependency
         )
 
-        if self.lock_cache.check_content(dependency=self.dependency, path=path):
+        if self.lock_cache.check_resolved(dependency=self.dependency, path=path):
             raise DependencyError(
                 msg=(
                     "The content does not match the data "
@@ -56,4 +64,8 @@ class CheckLockCacheResolver(object):
                 ),
                 dependency=self.dependency,
             )
+
+        if self.dependency.resolver == "http":
+            self.from_lock_names.append(self.dependency.name)
+
         return path
@@ -11,6 +11,8 @@ USER_CONFIG_FILE = os.path.abspath(os.path.expanduser("~/.wurf_config"))
 class ConfigFile(object):
     def __init__(self, ctx):
         self.default_resolve_path = None
+        self.mirror_path = None
+        self.download_cache_path = None
         self.ctx = ctx
         if os.path.isfile(LOCAL_CONFIG_FILE):
             config_file = LOCAL_CONFIG_FILE
@@ -37,3 +39,15 @@ class ConfigFile(object):
             self.ctx.end_msg(config_file)
 
         self.default_resolve_path = config.get("DEFAULT", "resolve_path", fallback=None)
+
+        mirror_path = config.get("DEFAULT", "mirror_path", fallback=None)
+        if mirror_path:
+            self.mirror_path = os.path.abspath(os.path.expanduser(mirror_path))
+
+        download_cache_path = config.get(
+            "DEFAULT", "download_cache_path", fallback=None
+        )
+        if download_cache_path:
+            self.download_cache_path = os.path.abspath(
+                os.path.expanduser(download_cache_path)
+            )
@@ -101,6 +101,37 @@ class Configuration(object):
             return True
         return False
 
+    def update_lock(self):
+        # Update the lock file if resolving and the update lock option was
+        # passed
+        return self.choose_resolve() and len(self.options.update_lock()) > 0
+
+    def verify_lock(self):
+        """Choose whether the resolved dependencies should be verified
+        against the lock file. This is the case if verify_lock was passed
+        as a command.
+        """
+        return "verify_lock" in self.args
+
+    def choose_fingerprint(self):
+        """Choose whether the resolve fingerprint should be used.
+
+        The fingerprint allows us to skip a resolve if none of its inputs
+        have changed. We do not use it when resolving from, writing or
+        verifying lock files, since the lock files are produced and checked
+        after the resolvers and the fingerprint does not cover the content
+        of e.g. http dependencies.
+        """
+        if self.resolver_chain() != Configuration.RESOLVE:
+            return False
+
+        return not (
+            self.lock_paths()
+            or self.lock_versions()
+            or self.update_lock()
+            or self.verify_lock()
+        )
+
     def choose_resolve_from_lock(self, lock_file):
         if not self.choose_resolve():
             # We are not configuring or resolving
@@ -3,6 +3,7 @@
 
 import os
 import json
+import concurrent.futures
 
 from .dependency import Dependency
 from .error import WurfError
@@ -12,7 +13,17 @@ from .lock_version_cache import LockVersionCache
 class DependencyManager(object):
     RESOLVE_FILE = "resolve.json"
 
-    def __init__(self, registry, dependency_cache, ctx, git, options, skip_internal):
+    def __init__(
+        self,
+        registry,
+        dependency_cache,
+        ctx,
+        git,
+        options,
+        skip_internal,
+        resolve_jobs=1,
+        resolve_json_reader=None,
+    ):
         """Construct an instance.
 
         As the manager resolves dependencies it will store the results
@@ -31,6 +42,15 @@ class DependencyManager(object):
         :param cache: Dict where paths to dependencies should be stored.
         :param ctx: A Waf Context instance.
         :param options: Options instance for collecting / parsing options
+        :param skip_internal: True if internal dependencies should be skipped.
+        :param resolve_jobs: The number of dependencies which may be
+            resolved concurrently. If larger than one, the dependencies
+            found in a resolve.json file are resolved ahead of time on a
+            thread pool. The results are still added to the dependency cache
+            one at a time in the order they are specified.
+        :param resolve_json_reader: A ResolveJsonReader instance used to
+            discover the dependency graph when resolve_jobs is larger than
+            one.
         """
 
         self.registry = registry
@@ -59,6 +79,20 @@ class DependencyManager(object):
         # Dict where we store the locked versions of dependencies
         self.locked_versions = {}
 
+        self.resolve_jobs = resolve_jobs
+
+        # The thread pool used to resolve dependencies ahead of time. It is
+        # created on first use.
+        self.executor = None
+
+        # Dict where we store the dependencies that are being resolved
+        # ahead of time. The key is the dependency name and the value is a
+        # tuple with the Dependency instance and the future holding the
+        # resolved path.
+        self.prefetched = {}
+
+        self.resolve_json_reader = resolve_json_reader
+
     def load_dependencies(self, path):
         """Loads dependencies from a resolve.json file.
 
@@ -80,6 +114,12 @@ class DependencyManager(object):
             with open(resolve_lock_version_path, "r") as f:
                 self.locked_versions = json.load(f)
 
+        if self.resolve_jobs > 1:
+            if self.ctx.is_toplevel() and self.resolve_json_reader is not None:
+                self.__plan(path=path, resolve_json=resolve_json)
+            else:
+                self.__prefetch(resolve_json=resolve_json)
+
         for dependency in resolve_json:
             self.add_dependency(dependency_args=dependency)
 
@@ -89,19 +129,32 @@ class DependencyManager(object):
         :param kwargs: Keyword arguments containing options for the dependency.
         """
 
-        dependency = Dependency(**dependency_args)
+        dependency = self.__create_dependency(dependency_args)
 
         if self.__skip_dependency(dependency):
             return
-        locked_version = self.locked_versions.get(dependency.name, None)
-        if locked_version is not None:
-            dependency.locked_version = locked_version
-            dependency.resolver_info = locked_version.get("resolver_info", None)
 
-        self.seen_dependencies[dependency.name] = dependency
-        self.options.add_dependency(dependency)
+        prefetched = self.prefetched.pop(dependency.name, None)
 
         with self.registry.provide_temporary() as tmp:
+            if prefetched is None:
+                self.options.add_dependency(dependency)
+
+            elif prefetched[0].sha1 == dependency.sha1:
+                # The dependency is already being resolved on the thread
+                # pool, we continue with the dependency object used there
+                # since the resolvers store information on it.
+                dependency, future = prefetched
+                tmp.provide_value("resolve_future", future)
+
+            else:
+                # A different definition of the dependency was prefetched.
+                # We resolve this definition in the usual way, but wait for
+                # the prefetch to finish since it works in the same folders.
+                concurrent.futures.wait([prefetched[1]])
+
+            self.seen_dependencies[dependency.name] = dependency
+
             tmp.provide_value("dependency", dependency)
             resolver = self.registry.require("dependency_resolver")
 
@@ -128,37 +181,260 @@ class DependencyManager(object):
             "added_by": self.ctx.path.abspath(),
         }
 
+    def __create_dependency(self, dependency_args):
+        """Creates a dependency and applies any locked version to it.
+
+        :param dependency_args: Dict containing options for the dependency.
+        :return: A Dependency instance.
+        """
+        dependency = Dependency(**dependency_args)
+
+        locked_version = self.locked_versions.get(dependency.name, None)
+        if locked_version is not None:
+            dependency.locked_version = locked_version
+            dependency.resolver_info = locked_version.get("resolver_info", None)
+
+        return dependency
+
+    def __plan(self, path, resolve_json):
+        """Discovers the dependency graph before recursing the dependencies.
+
+        The graph is walked one level at a time. First we read all the
+        resolve.json files which are available without resolving, i.e. the
+        files of dependencies pinned to a tag or commit which are read
+        directly from the git object store. The definitions found are
+        checked for SHA1 mismatches before any dependency is resolved.
+
+        Once no more files can be read this way, the planned dependencies
+        are resolved ahead of time on the thread pool and the remaining
+        resolve.json files are read from the resolved paths to find the
+        next level.
+
+        This allows us to report SHA1 mismatches before resolving
+        the entire graph.
+
+        :param path: The path of the top-level project as a string.
+        :param resolve_json: The list of dependencies from a resolve.json
+        """
+
+        # Dict where we store the planned dependencies and who added them.
+        # The dependencies are added by a path or by a planned dependency.
+        planned = {}
+        for name, dependency in self.seen_dependencies.items():
+            planned[name] = (dependency, self.dependency_cache[name]["added_by"])
+
+        level = [(path, dependency_args) for dependency_args in resolve_json]
+        toplevel = True
+
+        # The dependencies where we have to wait for the resolve to finish
+        # to read their resolve.json
+        deferred = []
+
+        while level or deferred:
+            next_level = []
+
+            for added_by, dependency_args in level:
+                dependency = self.__create_dependency(dependency_args)
+
+                if self.__skip_internal(dependency, toplevel=toplevel):
+                    continue
+
+                if not self.__is_toggled_on(dependency):
+                    # The dependency may still be enabled when recursing
+                    continue
+
+                if dependency.name in planned:
+                    seen_dependency, seen_added_by = planned[dependency.name]
+                    if seen_dependency.sha1 != dependency.sha1:
+                        raise self.__sha1_mismatch(
+                            dependency=dependency,
+                            current=self.__planned_path(added_by),
+                            seen_dependency=seen_dependency,
+                            added_by=self.__planned_path(seen_added_by),
+                        )
+                    continue
+
+                planned[dependency.name] = (dependency, added_by)
+
+                if not dependency.recurse:
+                    continue
+
+                if dependency.name in self.prefetched:
+                    deferred.append(dependency)
+                    continue
+
+                dependency_json = self.resolve_json_reader.read_pinned(
+                    dependency=dependency
+                )
+
+                if dependency_json is None:
+                    deferred.append(dependency)
+                    continue
+
+                for dependency_args in dependency_json:
+                    next_level.append((dependency, dependency_args))
+
+            level = next_level
+            toplevel = False
+
+            if level:
+                continue
+
+            # All the definitions we could read without resolving are
+            # consistent, so we start resolving the planned dependencies
+            for dependency, _ in planned.values():
+                self.__prefetch_dependency(dependency)
+
+            for dependency in deferred:
+                if dependency.name not in self.prefetched:
+                    continue
+
+                _, future = self.prefetched[dependency.name]
+
+                dependency_json = self.resolve_json_reader.read(
+                    dependency=dependency, future=future
+                )
+
+                if not dependency_json:
+                    continue
+
+                for dependency_args in dependency_json:
+                    level.append((dependency, dependency_args))
+
+            deferred = []
+
+    def __planned_path(self, added_by):
+        """Returns the path of the project which added a planned dependency.
+
+        :param added_by: The path as a string or the planned Dependency
+            instance which added the dependency.
+        :return: The path as a string, such that errors found while
+            planning are reported as when recursing the dependencies.
+        """
+        if not isinstance(added_by, Dependency):
+            return added_by
+
+        try:
+            if added_by.name in self.prefetched:
+                _, future = self.prefetched[added_by.name]
+                path = future.result()
+            else:
+                with self.registry.provide_temporary() as tmp:
+                    tmp.provide_value("dependency", added_by)
+                    resolver = self.registry.require("dependency_chain")
+                path = resolver.resolve()
+        except Exception:
+            self.ctx.to_log(f"wurf: Could not resolve {added_by.name} while planning")
+            path = None
+
+        return path if path else added_by.name
+
+    def __prefetch(self, resolve_json):
+        """Starts resolving the dependencies on the thread pool.
+
+        Only the resolver chain is run ahead of time. The resolved paths
+        are picked up by add_dependency(...), which prints the result and
+        recurses into the dependency in the same order as a serial resolve.
+
+        :param resolve_json: The list of dependencies from a resolve.json
+        """
+        for dependency_args in resolve_json:
+            dependency = self.__create_dependency(dependency_args)
+
+            if self.__skip_internal(dependency, toplevel=self.ctx.is_toplevel()):
+                continue
+
+            if not self.__is_toggled_on(dependency):
+                continue
+
+            self.__prefetch_dependency(dependency)
+
+    def __prefetch_dependency(self, dependency):
+        """Starts resolving a dependency on the thread pool.
+
+        :param dependency: A Dependency instance.
+        :return: The future holding the resolved path or None if the
+            dependency was already added or prefetched.
+        """
+        if dependency.name in self.prefetched:
+            return None
+
+        if dependency.name in self.seen_dependencies:
+            # Any SHA1 mismatch will be reported by add_dependency(...)
+            return None
+
+        self.options.add_dependency(dependency)
+
+        with self.registry.provide_temporary() as tmp:
+            tmp.provide_value("dependency", dependency)
+            resolver = self.registry.require("dependency_chain")
+
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.resolve_jobs
+            )
+
+        future = self.executor.submit(resolver.resolve)
+        self.prefetched[dependency.name] = (dependency, future)
+
+        return future
+
+    def shutdown(self):
+        """Stops the thread pool used for resolving ahead of time.
+
+        Prefetched dependencies which did not start resolving are cancelled,
+        while the running ones are allowed to finish.
+        """
+        for _, future in self.prefetched.values():
+            future.cancel()
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def __skip_internal(self, dependency, toplevel):
+        """Checks if the dependency is an internal dependency to be skipped.
+
+        :param dependency: A WurfDependency instance.
+        :param toplevel: True if the dependency is added by the top-level
+            project.
+        :return: True if the dependency should be skipped, otherwise False.
+        """
+        if not dependency.internal:
+            return False
+
+        if not toplevel:
+            # Internal dependencies should be skipped, if this is not the
+            # top-level wscript
+            return True
+
+        if self.skip_internal:
+            # Skip internal dependencies if the user has specified
+            # the --skip_internal option.
+            return True
+
+        return False
+
     def __skip_dependency(self, dependency):
         """Checks if we should skip the dependency.
 
         :param dependency: A WurfDependency instance.
         :return: True if the dependency should be skipped, otherwise False.
         """
-        if dependency.internal:
-            if not self.ctx.is_toplevel():
-                # Internal dependencies should be skipped, if this is not the
-                # top-level wscript
-                return True
-
-            if self.skip_internal:
-                # Skip internal dependencies if the user has specified
-                # the --skip_internal option.
-                return True
+        if self.__skip_internal(dependency, toplevel=self.ctx.is_toplevel()):
+            return True
 
         if dependency.name in self.seen_dependencies:
             seen_dependency = self.seen_dependencies[dependency.name]
 
             # We've seen this dependency before. We need to make sure they
             # are specified identically by checking the SHA1
-            current = self.ctx.path.abspath()
-            added_by = self.dependency_cache[dependency.name]["added_by"]
             if seen_dependency.sha1 != dependency.sha1:
-                raise WurfError(
-                    f"Adding {dependency.name} in {current}:\n"
-                    f"First added by {added_by}:\n"
-                    f"SHA1 mismatch\n"
-                    f"As seen in {current}\n:{dependency}\n"
-                    f"the previous definition from {added_by} was:\n{seen_dependency}"
+                raise self.__sha1_mismatch(
+                    dependency=dependency,
+                    current=self.ctx.path.abspath(),
+                    seen_dependency=seen_dependency,
+                    added_by=self.dependency_cache[dependency.name]["added_by"],
                 )
 
             # This dependency is already in the seen_dependencies
@@ -170,6 +446,23 @@ class DependencyManager(object):
 
         return False
 
+    def __sha1_mismatch(self, dependency, current, seen_dependency, added_by):
+        """Creates the error for a dependency which is specified differently.
+
+        :param dependency: The Dependency instance being added.
+        :param current: The path of the project adding the dependency.
+        :param seen_dependency: The Dependency instance added first.
+        :param added_by: The path of the project which added seen_dependency.
+        :return: A WurfError instance.
+        """
+        return WurfError(
+            f"Adding {dependency.name} in {current}:\n"
+            f"First added by {added_by}:\n"
+            f"SHA1 mismatch\n"
+            f"As seen in {current}\n:{dependency}\n"
+            f"the previous definition from {added_by} was:\n{seen_dependency}"
+        )
+
     def post_resolve(self):
         """Function called when all dependencies have been resolved."""
 
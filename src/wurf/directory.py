@@ -4,6 +4,7 @@
 import shutil
 import stat
 import os
+import contextlib
 
 
 def copy_directory(path, to_path):
@@ -20,7 +21,10 @@ def remove_directory(path):
         for name in files:
             filename = os.path.join(root, name)
             if not os.path.islink(filename):
-                os.chmod(filename, stat.S_IWUSR)
+                # Add the write permission, the file may be hardlinked so we
+                # keep the other permissions
+                mode = os.stat(filename).st_mode
+                os.chmod(filename, mode | stat.S_IWUSR)
             os.remove(filename)
         for name in dirs:
             dir = os.path.join(root, name)
@@ -30,3 +34,45 @@ def remove_directory(path):
                 os.rmdir(dir)
 
     os.rmdir(path)
+
+
+@contextlib.contextmanager
+def atomic_directory(path):
+    """Creates a directory atomically.
+
+    The content is created in a temporary directory, which is renamed to
+    path when the with block completes. So an interrupted or failed
+    operation never leaves a partially created directory at path. If the
+    with block raises, the temporary directory is removed.
+
+    Example:
+
+        with atomic_directory(path="/tmp/foo") as temp_path:
+            # Create temp_path and its content
+
+    :param path: The path to the directory as a string. The directory must
+        not exist.
+    :return: The path to the temporary directory as a string. The directory
+        does not exist when the with block starts.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+
+    if os.path.lexists(temp_path):
+        # Left behind by an interrupted process with the same pid
+        remove_directory(path=temp_path)
+
+    try:
+        yield temp_path
+    except BaseException:
+        if os.path.lexists(temp_path):
+            remove_directory(path=temp_path)
+        raise
+
+    try:
+        os.rename(temp_path, path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+
+        # The directory was created by someone else in the meantime
+        remove_directory(path=temp_path)
@@ -0,0 +1,258 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import json
+import shutil
+import stat
+import hashlib
+import tempfile
+from urllib.parse import urlparse
+
+from .directory import remove_directory
+from .error import WurfError
+from .file_lock import FileLock
+
+
+class DownloadCache(object):
+    """Machine-wide content-addressed store of downloaded files.
+
+    The files are stored by the SHA256 of their content and an index maps the
+    URL of a download to the stored file. A file is downloaded once per host
+    and hardlinked into the folders of the dependencies (or copied if the
+    folders are on a different file system).
+
+    Layout of the store:
+
+        files/<sha256[:2]>/<sha256>  The downloaded files
+        urls/<sha1 of the url>.json  The "sha256" and "filename" of a url
+
+    The content is hashed while it is downloaded. If the expected SHA256 of
+    a file is known, the file is looked up by its content and a download
+    with different content is rejected.
+
+    The files in the store are read-only, since changing a hardlinked file
+    in a dependency folder would also change the stored file.
+
+    The index also stores the ETag, Last-Modified and Content-Length of a
+    download, such that a stored URL can be revalidated with a conditional
+    request.
+    """
+
+    def __init__(self, url_download, cache_path):
+        """Construct an instance.
+
+        :param url_download: An UrlDownload instance
+        :param cache_path: The path to the store as a string.
+        """
+        self.url_download = url_download
+        self.cache_path = cache_path
+
+    def download(
+        self, source, cwd, filename=None, sha256=None, revalidate=False, stream=None
+    ):
+        """Downloads a file unless it is already in the store.
+
+        :param source: The URL of the file as a string.
+        :param cwd: The folder where the file should be linked as a string.
+        :param filename: The name of the file as a string or None to use the
+            name of the download.
+        :param sha256: The expected SHA256 of the file as a hex string or
+            None if it is not known.
+        :param revalidate: If True and the sha256 is not known, a stored file
+            is downloaded again if it was modified on the server.
+        :param stream: An object with an update(chunk) method which is given
+            the content of the file if it is downloaded or None.
+        :return: The path to the file in cwd as a string.
+        """
+        urls_path = os.path.join(self.cache_path, "urls")
+        os.makedirs(urls_path, exist_ok=True)
+
+        # The same file may be downloaded by concurrent waf processes
+        with FileLock(path=self.__url_path(source) + ".lock"):
+            entry = self.lookup(source=source, filename=filename, sha256=sha256)
+
+            if entry is not None and revalidate and sha256 is None:
+                validators = self.__read_validators(source=source)
+
+                if validators:
+                    # The stored file is used if it was not modified
+                    entry = (
+                        self.__download(
+                            source=source,
+                            filename=filename,
+                            sha256=sha256,
+                            validators=validators,
+                            stream=stream,
+                        )
+                        or entry
+                    )
+                else:
+                    # Without validators we cannot know if it was modified
+                    entry = None
+
+            if entry is None:
+                entry = self.__download(
+                    source=source, filename=filename, sha256=sha256, stream=stream
+                )
+
+        return self.__link(entry=entry, cwd=cwd)
+
+    def lookup(self, source, filename=None, sha256=None):
+        """Finds a file in the store without downloading it.
+
+        :param source: The URL of the file as a string.
+        :param filename: The name of the file as a string or None.
+        :param sha256: The expected SHA256 of the file as a hex string or
+            None if it is not known.
+        :return: A dict with the "sha256" and "filename" of the stored file
+            or None if the file is not in the store.
+        """
+        entry = self.__read_url(source=source)
+
+        if sha256 is not None:
+            sha256 = sha256.lower()
+
+            if entry is None or entry["sha256"] != sha256:
+                # The content may have been downloaded from another URL
+                entry = {"sha256": sha256, "filename": self.__url_filename(source)}
+
+        if entry is None or not os.path.isfile(self.__file_path(entry["sha256"])):
+            return None
+
+        if filename:
+            entry["filename"] = filename
+
+        if not entry["filename"]:
+            return None
+
+        return entry
+
+    def __download(self, source, filename, sha256, validators=None, stream=None):
+        hasher = hashlib.sha256()
+
+        # The validators of the download are stored in the index
+        validators = dict(validators) if validators else {}
+
+        # The file is downloaded to a temporary folder, such that an
+        # interrupted download is not stored. The partial file of an
+        # interrupted download is kept in the "partial" folder and resumed.
+        download_path = tempfile.mkdtemp(prefix="download-", dir=self.cache_path)
+
+        try:
+            path = self.url_download.download(
+                source=source,
+                cwd=download_path,
+                filename=filename,
+                hasher=hasher,
+                part_path=os.path.join(self.cache_path, "partial"),
+                validators=validators,
+                stream=stream,
+            )
+
+            if path is None:
+                # The file was not modified
+                return None
+
+            digest = hasher.hexdigest()
+
+            if sha256 is not None and digest != sha256.lower():
+                raise WurfError(
+                    f"Failed integrity check for {source}: expected sha256 "
+                    f"{sha256} but the download has sha256 {digest}"
+                )
+
+            file_path = self.__file_path(digest)
+
+            if not os.path.isfile(file_path):
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                os.replace(path, file_path)
+        finally:
+            remove_directory(path=download_path)
+
+        entry = {"sha256": digest, "filename": os.path.basename(path)}
+        self.__write_url(source=source, entry=entry, validators=validators)
+
+        return entry
+
+    def __link(self, entry, cwd):
+        path = os.path.join(cwd, entry["filename"])
+        file_path = self.__file_path(entry["sha256"])
+
+        try:
+            os.link(file_path, path)
+        except OSError:
+            # E.g. the folder is on a different file system
+            shutil.copyfile(file_path, path)
+
+        return path
+
+    def __read_url(self, source):
+        stored = self.__read_stored(source=source)
+
+        if stored is None:
+            return None
+
+        return {"sha256": stored["sha256"], "filename": stored["filename"]}
+
+    def __read_validators(self, source):
+        stored = self.__read_stored(source=source)
+
+        if stored is None:
+            return None
+
+        validators = {
+            "etag": stored.get("etag", None),
+            "last_modified": stored.get("last_modified", None),
+        }
+
+        if not any(validators.values()):
+            return None
+
+        return validators
+
+    def __read_stored(self, source):
+        path = self.__url_path(source)
+
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "r") as url_file:
+                return json.load(url_file)
+        except ValueError:
+            return None
+
+    def __write_url(self, source, entry, validators):
+        path = self.__url_path(source)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        stored = dict(validators, url=source, **entry)
+
+        with open(temp_path, "w") as url_file:
+            json.dump(stored, url_file, indent=4, sort_keys=True)
+
+        os.replace(temp_path, path)
+
+    def __url_path(self, source):
+        digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_path, "urls", digest + ".json")
+
+    def __file_path(self, sha256):
+        return os.path.join(self.cache_path, "files", sha256[:2], sha256)
+
+    @staticmethod
+    def __url_filename(source):
+        # Same as UrlDownload, the URL only gives the name if it has an
+        # extension
+        basename = os.path.basename(urlparse(source).path)
+        _, extension = os.path.splitext(basename)
+
+        return basename if extension else None
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
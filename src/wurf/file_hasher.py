@@ -0,0 +1,271 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import json
+import time
+import hashlib
+import threading
+import concurrent.futures
+
+from .error import WurfError
+
+
+class FileHasher(object):
+    """Computes the content hash of files and directories.
+
+    The files are read in chunks and the files of a directory are hashed on a
+    thread pool. The digest of a file is cached by its path, size,
+    modification time and inode, so an unchanged file is not read again. The
+    cache is stored in a file, such that it is available the next time we
+    resolve.
+
+    The content hash of a directory is the root of a hash tree: The digest
+    of a directory is the SHA1 of the sorted list of its entries, where each
+    entry is the kind ("file", "dir" or "link"), the digest and the name of
+    the entry. The digest of a file is the SHA1 of its content and the
+    digest of a symbolic link is the SHA1 of the link target.
+    """
+
+    CACHE_FILE = "file_hash_cache.json"
+
+    VERSION = 1
+
+    # The size of the chunks read from the files
+    CHUNK_SIZE = 1024 * 1024
+
+    # A file modified less than this many seconds before it was hashed is not
+    # cached, since a change within the resolution of the file system
+    # timestamps would not be detected
+    RACY_SECONDS = 2
+
+    def __init__(self, cache_path=None, jobs=None):
+        """Construct an instance.
+
+        :param cache_path: The path to the cache file as a string or None if
+            the digests should not be stored.
+        :param jobs: The number of files hashed in parallel or None to use
+            the default of concurrent.futures.ThreadPoolExecutor.
+        """
+        self.cache_path = cache_path
+        self.jobs = jobs
+
+        # Dict with [size, mtime_ns, inode, digest] per path, None until the
+        # cache has been read
+        self.cache = None
+        self.changed = False
+
+        # The files may be hashed from multiple threads
+        self.lock = threading.Lock()
+
+    def content_hash(self, path):
+        """Computes the content hash of a file or directory.
+
+        :param path: The path to the file or directory as a string.
+        :return: The hash as a hex string.
+        """
+        return self.content_tree(path=path)["digest"]
+
+    def content_tree(self, path):
+        """Computes the hash tree of a file or directory.
+
+        :param path: The path to the file or directory as a string.
+        :return: The hash tree of the directory, see tree(...), or a dict
+            with the "kind" and "digest" of the file.
+        """
+        if os.path.isfile(path):
+            return {"kind": "file", "digest": self.file_hash(path=path)}
+        elif os.path.isdir(path):
+            return self.tree(path=path)
+        else:
+            raise WurfError(f"Unknown file type: {path}")
+
+    @staticmethod
+    def compare(expected, actual):
+        """Finds the entries which differ between two hash trees.
+
+        Only the sub-trees with different digests are visited.
+
+        :param expected: The hash tree as returned by content_tree(...).
+        :param actual: The hash tree as returned by content_tree(...).
+        :return: A list of (change, path) tuples, where the change is
+            "added", "removed" or "modified" and the path is relative to the
+            root of the trees using "/" as separator. The root itself is
+            ".". The list is empty if the trees are equal.
+        """
+        changes = []
+        FileHasher.__compare(expected=expected, actual=actual, path="", changes=changes)
+        return changes
+
+    def tree(self, path):
+        """Computes the hash tree of a directory.
+
+        :param path: The path to the directory as a string.
+        :return: A dict with the "kind" and "digest" of the directory and a
+            dict with the "entries" of the directory by name. The entries of
+            sub-directories are dicts of the same form, the other entries
+            are dicts with the "kind" and "digest" of the entry.
+        """
+        tree = self.__scan(path=path)
+
+        files = []
+        FileHasher.__collect_files(tree=tree, path=path, files=files)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            digests = pool.map(self.file_hash, [file_path for file_path, _ in files])
+
+            for (_, node), digest in zip(files, digests):
+                node["digest"] = digest
+
+        FileHasher.__digest_tree(tree=tree)
+        return tree
+
+    def file_hash(self, path):
+        """Computes the SHA1 of the content of a file.
+
+        :param path: The path to the file as a string.
+        :return: The SHA1 as a hex string.
+        """
+        stat = os.stat(path)
+        key = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+        with self.lock:
+            if self.cache is None:
+                self.cache = self.__read()
+
+            cached = self.cache.get(path, None)
+
+        if cached is not None and cached[:3] == key:
+            return cached[3]
+
+        sha1 = hashlib.sha1()
+
+        with open(path, "rb") as hash_file:
+            for chunk in iter(lambda: hash_file.read(FileHasher.CHUNK_SIZE), b""):
+                sha1.update(chunk)
+
+        digest = sha1.hexdigest()
+
+        if stat.st_mtime_ns < time.time_ns() - FileHasher.RACY_SECONDS * 10**9:
+            with self.lock:
+                self.cache[path] = key + [digest]
+                self.changed = True
+
+        return digest
+
+    def write(self):
+        """Writes the cached digests to the cache file."""
+        if self.cache_path is None:
+            return
+
+        with self.lock:
+            if not self.changed:
+                return
+
+            # Drop the files which no longer exist
+            files = {p: v for p, v in self.cache.items() if os.path.isfile(p)}
+            self.changed = False
+
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+
+        with open(temp_path, "w") as cache_file:
+            json.dump({"version": FileHasher.VERSION, "files": files}, cache_file)
+
+        os.replace(temp_path, self.cache_path)
+
+    def __read(self):
+        if self.cache_path is None or not os.path.isfile(self.cache_path):
+            return {}
+
+        try:
+            with open(self.cache_path, "r") as cache_file:
+                cache = json.load(cache_file)
+        except ValueError:
+            return {}
+
+        if cache.get("version", None) != FileHasher.VERSION:
+            return {}
+
+        return cache["files"]
+
+    def __scan(self, path):
+        entries = {}
+
+        with os.scandir(path) as scan:
+            for entry in scan:
+                if entry.is_symlink():
+                    target = os.readlink(entry.path).encode("utf-8", "surrogateescape")
+                    entries[entry.name] = {
+                        "kind": "link",
+                        "digest": hashlib.sha1(target).hexdigest(),
+                    }
+                elif entry.is_dir():
+                    entries[entry.name] = self.__scan(path=entry.path)
+                else:
+                    entries[entry.name] = {"kind": "file", "digest": None}
+
+        return {"kind": "dir", "digest": None, "entries": entries}
+
+    @staticmethod
+    def __collect_files(tree, path, files):
+        for name, node in tree["entries"].items():
+            if node["kind"] == "file":
+                files.append((os.path.join(path, name), node))
+            elif node["kind"] == "dir":
+                FileHasher.__collect_files(
+                    tree=node, path=os.path.join(path, name), files=files
+                )
+
+    @staticmethod
+    def __compare(expected, actual, path, changes):
+        if (
+            expected["kind"] == actual["kind"]
+            and expected["digest"] == actual["digest"]
+        ):
+            return
+
+        if expected["kind"] != "dir" or actual["kind"] != "dir":
+            changes.append(("modified", path or "."))
+            return
+
+        expected_entries = expected["entries"]
+        actual_entries = actual["entries"]
+
+        for name in sorted(set(expected_entries) | set(actual_entries)):
+            entry_path = f"{path}/{name}" if path else name
+
+            if name not in actual_entries:
+                changes.append(("removed", entry_path))
+            elif name not in expected_entries:
+                changes.append(("added", entry_path))
+            else:
+                FileHasher.__compare(
+                    expected=expected_entries[name],
+                    actual=actual_entries[name],
+                    path=entry_path,
+                    changes=changes,
+                )
+
+    @staticmethod
+    def __digest_tree(tree):
+        sha1 = hashlib.sha1()
+
+        for name in sorted(tree["entries"]):
+            node = tree["entries"][name]
+
+            if node["kind"] == "dir":
+                FileHasher.__digest_tree(tree=node)
+
+            line = f"{node['kind']} {node['digest']} {name}\n"
+            sha1.update(line.encode("utf-8", "surrogateescape"))
+
+        tree["digest"] = sha1.hexdigest()
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (
+            self.__class__.__name__,
+            {"cache_path": self.cache_path, "jobs": self.jobs},
+        )
@@ -0,0 +1,87 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock(object):
+    """Exclusive lock shared between processes on the same host.
+
+    The lock is an advisory lock on a lock file, so all processes accessing
+    the protected resource must use a FileLock with the same path. The lock
+    file is created if it does not exist and it is never removed, since
+    removing it could allow two processes to hold the lock at the same time.
+
+    Example:
+
+        with FileLock(path="/tmp/foo.lock"):
+            # Access the resource
+    """
+
+    def __init__(self, path):
+        """Construct an instance.
+
+        :param path: The path to the lock file as a string.
+        """
+        self.path = path
+        self.lock_file = None
+
+    def acquire(self):
+        """Acquires the lock, blocking until it is available."""
+        lock_file = open(self.path, "a+")
+
+        try:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                FileLock.__lock_windows(lock_file)
+        except BaseException:
+            lock_file.close()
+            raise
+
+        self.lock_file = lock_file
+
+    def release(self):
+        """Releases the lock."""
+        lock_file, self.lock_file = self.lock_file, None
+
+        try:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            lock_file.close()
+
+    @staticmethod
+    def __lock_windows(lock_file):
+        # msvcrt.LK_LOCK gives up after 10 attempts, so we keep trying until
+        # we get the lock
+        while True:
+            lock_file.seek(0)
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.1)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
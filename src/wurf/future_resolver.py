@@ -0,0 +1,29 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+
+class FutureResolver(object):
+    """Returns the result of a resolve which was started ahead of time."""
+
+    def __init__(self, future):
+        """Construct an instance.
+
+        :param future: A concurrent.futures.Future which will hold the
+            resolved path once the resolve has finished.
+        """
+        self.future = future
+
+    def resolve(self):
+        """Wait for the resolve to finish.
+
+        If the resolve raised an exception it will be re-raised here.
+
+        :return: The path as a string.
+        """
+        return self.future.result()
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
@@ -4,6 +4,8 @@
 import os
 import re
 
+from .git_ref_index import GitRefIndex
+
 
 class Git(object):
     def __init__(self, git_binary, ctx):
@@ -59,25 +61,71 @@ class Git(object):
 
         return output
 
+    def head(self, cwd):
+        """
+        Runs 'git rev-parse' to read the commit id and the branch of HEAD
+        with a single command.
+
+        :param cwd: The current working directory as a string
+        :return: A tuple with the commit id and the full name of the
+            current branch e.g. "refs/heads/main". The name is None in
+            detached HEAD state.
+        """
+        args = [
+            self.git_binary,
+            "rev-parse",
+            "HEAD",
+            "--symbolic-full-name",
+            "HEAD",
+        ]
+        output = self.ctx.cmd_and_log(args, cwd=cwd).split()
+
+        commit_id = output[0]
+        refname = output[1] if len(output) > 1 else "HEAD"
+
+        if refname == "HEAD":
+            # In detached HEAD state the symbolic name is just HEAD
+            return commit_id, None
+
+        return commit_id, refname
+
     def current_tag(self, cwd):
         """
         Check if the current commmit matches a tag
 
         :return: The current tags as a string otherwise None
         """
-        args = [self.git_binary, "tag", "--points-at", self.current_commit(cwd)]
-
-        output = self.ctx.cmd_and_log(args, cwd=cwd).strip()
+        commit_id, _ = self.head(cwd=cwd)
+        tags = self.ref_index(cwd=cwd).tags_at(commit_id)
 
-        if not output:
+        if not tags:
             return None
         else:
             # Return the first tag as a commit may have multiple tags
-            return output.splitlines()[0]
-
-    def clone(self, repository, directory, cwd, branch=None, depth=None):
+            return tags[0]
+
+    def clone(
+        self,
+        repository,
+        directory,
+        cwd,
+        branch=None,
+        depth=None,
+        shared=False,
+        no_checkout=False,
+        reference=None,
+        mirror=False,
+    ):
         """
         Runs 'git clone <repository> <directory>' in the directory cwd.
+
+        :param shared: If True the clone will use the objects of a local
+            repository instead of copying them, see 'git clone --shared'.
+        :param no_checkout: If True no working tree is checked out.
+        :param reference: Path to a local repository whose objects should be
+            used by the clone, see 'git clone --reference'.
+        :param mirror: If True a bare mirror of the repository is created,
+            see 'git clone --mirror'.
         """
         args = [self.git_binary, "clone", repository, directory]
 
@@ -87,6 +135,25 @@ class Git(object):
         if branch:
             args += ["--branch", branch]
 
+        if shared:
+            args += ["--shared"]
+
+        if no_checkout:
+            args += ["--no-checkout"]
+
+        if reference:
+            args += ["--reference", reference]
+
+        if mirror:
+            args += ["--mirror"]
+
+        self.ctx.cmd_and_log(args, cwd=cwd)
+
+    def remote_update(self, cwd):
+        """
+        Runs 'git remote update' in the directory cwd
+        """
+        args = [self.git_binary, "remote", "update"]
         self.ctx.cmd_and_log(args, cwd=cwd)
 
     def pull(self, cwd):
@@ -97,49 +164,51 @@ class Git(object):
         args = [self.git_binary, "pull"]
         self.ctx.cmd_and_log(args, cwd=cwd)
 
-    def branch(self, cwd):
+    def fetch(self, cwd, repository, refspec):
         """
-        Runs 'git branch' and returns the current branch and a list of
-        additional branches
+        Runs 'git fetch <repository> <refspec>' in the directory cwd
         """
-        args = [self.git_binary, "branch"]
-        o = self.ctx.cmd_and_log(args, cwd=cwd)
-
-        branch = o.split("\n")
-        branch = [b for b in branch if b != ""]
+        args = [self.git_binary, "fetch", repository, refspec]
+        self.ctx.cmd_and_log(args, cwd=cwd)
 
-        current = ""
-        others = []
+    def set_remote_origin_url(self, cwd, url):
+        """
+        Runs 'git remote set-url origin <url>' in the directory cwd
+        """
+        args = [self.git_binary, "remote", "set-url", "origin", url]
+        self.ctx.cmd_and_log(args, cwd=cwd)
 
-        for b in branch:
-            if b.startswith("*"):
-                current = b[1:].strip()
-            else:
-                others.append(b)
+    def branch(self, cwd):
+        """
+        Returns the current branch and a list of additional branches, the
+        branches of the remotes are included by their name on the remote.
 
-        if current == "":
-            self.ctx.fatal("Failed to locate current branch")
+        In detached HEAD state the current branch is e.g.
+        "(HEAD detached at 044d595)".
+        """
+        commit_id, refname = self.head(cwd=cwd)
 
-        # include remote branches
-        args = [self.git_binary, "branch", "-r"]
-        o = self.ctx.cmd_and_log(args, cwd=cwd)
+        if refname is None:
+            current = f"(HEAD detached at {commit_id[:7]})"
+        else:
+            # Strip "refs/heads/"
+            current = refname.split("/", 2)[2]
 
-        lines = o.split("\n")
-        for line in lines:
-            if line.startswith("origin/HEAD"):
-                continue
-            branch = line.strip().split("/")[-1]
-            if branch not in others and branch != current:
-                others.append(branch)
+        others = [b for b in self.branches(cwd=cwd) if b != current]
 
         return current, others
 
     def branches(self, cwd):
         """
-        Runs 'git branch' and returns a list of branches
+        Returns the names of the local and remote branches as a list
         """
-        current, branches = self.branch(cwd=cwd)
-        branches.append(current)
+        refs = self.ref_index(cwd=cwd)
+
+        branches = refs.local_branches()
+        for branch in refs.remote_branches():
+            if branch not in branches:
+                branches.append(branch)
+
         return branches
 
     def current_branch(self, cwd):
@@ -156,14 +225,8 @@ class Git(object):
 
             https://git-scm.com/docs/git-checkout
         """
-        current, _ = self.branch(cwd=cwd)
-
-        # Different git versions denote the detached HEAD state differently,
-        # possible variants are the following:
-        # * (no branch)
-        # * (detached from waf-1.9.7)
-        # * (HEAD detached at waf-1.9.7)
-        return current.startswith("(") and current.endswith(")")
+        _, refname = self.head(cwd=cwd)
+        return refname is None
 
     def checkout(self, branch, cwd):
         """
@@ -241,12 +304,40 @@ class Git(object):
 
         return output.strip()
 
+    def for_each_ref(self, cwd):
+        """
+        Runs 'git for-each-ref' in the directory cwd and returns the refs
+        with their commit ids in the GitRefIndex.FORMAT
+
+        :param cwd: The current working directory as a string
+        :return: The lines of the output as a list of strings
+        """
+        args = [self.git_binary, "for-each-ref", f"--format={GitRefIndex.FORMAT}"]
+        output = self.ctx.cmd_and_log(args, cwd=cwd)
+
+        lines = output.split("\n")
+        return [line for line in lines if line != ""]
+
+    def ref_index(self, cwd):
+        """
+        Returns a GitRefIndex with the tags and branches of the repository in
+        directory cwd, see for_each_ref(...)
+
+        :param cwd: The current working directory as a string
+        """
+        return GitRefIndex(lines=self.for_each_ref(cwd=cwd))
+
     def default_branch(self, cwd):
         """
         Returns the default branch of the repository in directory cwd.
 
         :param cwd: The current working directory as a string
         """
+        default_branch = self.ref_index(cwd=cwd).default_branch()
+
+        if default_branch is not None:
+            return default_branch
+
         args = [
             self.git_binary,
             "symbolic-ref",
@@ -265,3 +356,66 @@ class Git(object):
         output = self.ctx.cmd_and_log(args, cwd=cwd)
 
         return output != ""
+
+    def has_object(self, cwd, revision):
+        """
+        Runs 'git cat-file -e <revision>^{commit}' in the directory cwd to
+        check whether the commit is available locally without contacting
+        the remote.
+
+        :param cwd: The current working directory as a string
+        :param revision: The revision as a string e.g. a tag or commit id
+        :return: True if the commit exists in the repository, otherwise False
+        """
+        args = [self.git_binary, "cat-file", "-e", revision + "^{commit}"]
+
+        try:
+            self.ctx.cmd_and_log(args, cwd=cwd)
+            return True
+        except Exception:
+            return False
+
+    def ls_tree(self, cwd, revision):
+        """
+        Runs 'git ls-tree --name-only <revision>' against the repository in
+        directory cwd and returns the names in the root folder of the revision.
+
+        The git directory is passed explicitly, such that git will not search
+        the parent folders if cwd does not contain a repository.
+
+        :param cwd: The current working directory as a string
+        :param revision: The revision as a string e.g. a tag or commit id
+        """
+        args = [
+            self.git_binary,
+            "--git-dir",
+            os.path.join(cwd, ".git"),
+            "ls-tree",
+            "--name-only",
+            revision,
+        ]
+        output = self.ctx.cmd_and_log(args, cwd=cwd)
+
+        names = output.split("\n")
+        return [n for n in names if n != ""]
+
+    def show(self, cwd, revision, path):
+        """
+        Runs 'git show <revision>:<path>' against the repository in directory
+        cwd and returns the content of the file as a string.
+
+        The git directory is passed explicitly, such that git will not search
+        the parent folders if cwd does not contain a repository.
+
+        :param cwd: The current working directory as a string
+        :param revision: The revision as a string e.g. a tag or commit id
+        :param path: The path of the file relative to the repository root
+        """
+        args = [
+            self.git_binary,
+            "--git-dir",
+            os.path.join(cwd, ".git"),
+            "show",
+            f"{revision}:{path}",
+        ]
+        return self.ctx.cmd_and_log(args, cwd=cwd)
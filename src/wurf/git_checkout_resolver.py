@@ -2,9 +2,8 @@
 # encoding: utf-8
 
 import os
-import shutil
 
-from .directory import copy_directory
+from .directory import atomic_directory
 
 
 class GitCheckoutResolver(object):
@@ -30,7 +29,17 @@ class GitCheckoutResolver(object):
         """
         return "branch-%s" % branch
 
-    def __init__(self, git, resolver, ctx, dependency, checkout, cwd):
+    def __init__(
+        self,
+        git,
+        resolver,
+        ctx,
+        dependency,
+        checkout,
+        cwd,
+        checkout_strategy,
+        offline=False,
+    ):
         """Construct an instance.
 
         :param git: A Git instance
@@ -39,6 +48,10 @@ class GitCheckoutResolver(object):
         :param checkout: The branch, tag, or sha1 as a string.
         :param cwd: Current working directory as a string. This is the place
             where we should create new folders etc.
+        :param checkout_strategy: A GitCopyCheckout or GitSharedCheckout
+            instance used to create the checkout folder.
+        :param offline: If True the network is not accessed, so branches are
+            not pulled.
         """
         self.git = git
         self.resolver = resolver
@@ -46,6 +59,8 @@ class GitCheckoutResolver(object):
         self.dependency = dependency
         self.checkout = checkout
         self.cwd = cwd
+        self.checkout_strategy = checkout_strategy
+        self.offline = offline
 
     def resolve(self):
         """Fetches the dependency if necessary.
@@ -56,16 +71,22 @@ class GitCheckoutResolver(object):
 
         assert os.path.isdir(path)
 
-        is_branch = self.checkout in self.git.branches(cwd=path)
+        refs = self.git.ref_index(cwd=path)
+
+        is_branch = refs.is_branch(self.checkout)
         if is_branch:
             # If the checkout is a branch, we cannot use the commit id as
             # folder name, as the branch may be updated later.
             folder_name = GitCheckoutResolver.branch_folder_name(self.checkout)
         else:
-            commit_id = self.git.checkout_to_commit_id(
-                cwd=path,
-                checkout=self.checkout,
-            )
+            commit_id = refs.commit_id(self.checkout)
+
+            if commit_id is None:
+                # The checkout is not a tag, so it should be a commit id
+                commit_id = self.git.checkout_to_commit_id(
+                    cwd=path,
+                    checkout=self.checkout,
+                )
             folder_name = GitCheckoutResolver.commit_folder_name(commit_id)
 
         # The folder for storing the requested checkout
@@ -76,27 +97,17 @@ class GitCheckoutResolver(object):
         )
 
         # If the folder for the chosen version does not exist,
-        # then copy the master and checkout that version
+        # then create it from the master and checkout that version
         if not os.path.isdir(checkout_path):
-            try:
-                copy_directory(path=path, to_path=checkout_path)
-                self.git.checkout(branch=self.checkout, cwd=checkout_path)
-            except Exception:
-                # The checkout_path must be removed if the checkout is not
-                # successful, as the folder would be considered a valid
-                # checkout when the user configures again
-                def onerror(func, path, exc_info):
-                    import stat
-
-                    if not os.access(path, os.W_OK):
-                        os.chmod(path, stat.S_IWUSR)
-                        func(path)
-                    else:
-                        raise
-
-                shutil.rmtree(checkout_path, onerror=onerror)
-                # The blank "raise" re-raises the last exception
-                raise
+            # The checkout folder is created in a temporary folder, since a
+            # partial checkout would be considered a valid checkout when the
+            # user configures again
+            with atomic_directory(path=checkout_path) as temp_path:
+                self.checkout_strategy.create(
+                    path=path, checkout_path=temp_path, checkout=self.checkout
+                )
+        elif self.offline:
+            self.ctx.to_log(f"wurf: GitCheckoutResolver offline, using {checkout_path}")
         elif not self.git.is_detached_head(cwd=checkout_path):
             # If the checkout is a tag or a commit (we will be in detached
             # HEAD state), then we cannot pull. On the other hand,
@@ -104,7 +115,7 @@ class GitCheckoutResolver(object):
             self.git.pull(cwd=checkout_path)
 
         # If the dependency contains submodules, we also get those
-        if self.dependency.pull_submodules:
+        if self.dependency.pull_submodules and not self.offline:
             self.git.pull_submodules(cwd=checkout_path)
 
         # Record the commmit id of the current working copy
@@ -0,0 +1,34 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+from .directory import copy_directory
+
+
+class GitCopyCheckout(object):
+    """Creates a checkout folder by copying a repository.
+
+    The copy includes the full git object database of the repository.
+    """
+
+    def __init__(self, git):
+        """Construct an instance.
+
+        :param git: A Git instance
+        """
+        self.git = git
+
+    def create(self, path, checkout_path, checkout):
+        """Creates the checkout folder.
+
+        :param path: The path to the repository to copy as a string.
+        :param checkout_path: The path to the checkout folder as a string.
+        :param checkout: The branch, tag, or sha1 as a string.
+        """
+        copy_directory(path=path, to_path=checkout_path)
+        self.git.checkout(branch=checkout, cwd=checkout_path)
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
@@ -12,7 +12,7 @@ class GitExistingCheckoutResolver(object):
     out.
     """
 
-    def __init__(self, ctx, git, dependency, resolver, checkout, cwd):
+    def __init__(self, ctx, git, dependency, resolver, checkout, cwd, offline=False):
         """Construct a new GitExistingCheckoutResolver instance.
 
         :param ctx: A Waf Context instance.
@@ -22,6 +22,8 @@ class GitExistingCheckoutResolver(object):
         :param checkout: The branch, tag, or sha1 as a string.
         :param cwd: Current working directory as a string. This is the place
             where we should create new folders etc.
+        :param offline: If True the network is not accessed, so branches are
+            not pulled.
         """
         self.ctx = ctx
         self.git = git
@@ -29,6 +31,7 @@ class GitExistingCheckoutResolver(object):
         self.resolver = resolver
         self.checkout = checkout
         self.cwd = cwd
+        self.offline = offline
 
     def resolve(self):
         """
@@ -54,15 +57,22 @@ class GitExistingCheckoutResolver(object):
         )
         if os.path.isdir(checkout_path):
             # Checkout is a branch, pull any changes and return path
-            self.git.pull(cwd=checkout_path)
+            if not self.offline:
+                self.git.pull(cwd=checkout_path)
             self.dependency.resolver_info = self.checkout
             return checkout_path
 
         # Checkout is a commit, check if it is cached
         try:
-            commit_id = self.git.checkout_to_commit_id(
-                cwd=default_branch_cwd, checkout=self.checkout
+            commit_id = self.git.ref_index(cwd=default_branch_cwd).commit_id(
+                self.checkout
             )
+
+            if commit_id is None:
+                # The checkout is not a tag, so it should be a commit id
+                commit_id = self.git.checkout_to_commit_id(
+                    cwd=default_branch_cwd, checkout=self.checkout
+                )
         except Exception as e:
             # Checkout is not a valid branch or commit, we may need to pull
             self.ctx.to_log(
@@ -0,0 +1,123 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import hashlib
+import threading
+
+from .directory import atomic_directory
+from .file_lock import FileLock
+
+
+class GitMirror(object):
+    """Machine-wide store of bare mirrors of the git repositories.
+
+    The store contains one bare mirror per repository, named after the host
+    and path of the dependency source, such that the same repository is only
+    downloaded once even if it is used by many projects and regardless of
+    the protocol used. The git resolver clones using the mirror as a
+    reference (see 'git clone --reference'), so the objects are shared with
+    the mirror and only the missing objects are downloaded.
+
+    Each mirror is updated at most once per resolve. A file lock per mirror
+    ensures that concurrent waf processes on the same host can share the
+    store safely.
+
+    Note, that clones made with a reference depend on the objects of the
+    mirror, so the store must not be removed while it is in use. We never
+    prune the refs of a mirror to avoid removing objects used by a clone.
+    """
+
+    def __init__(self, git, ctx, git_url_parser, mirror_path):
+        """Construct an instance.
+
+        :param git: A Git instance
+        :param ctx: A Waf Context instance.
+        :param git_url_parser: A GitUrlParser instance.
+        :param mirror_path: The path to the mirror store as a string.
+        """
+        self.git = git
+        self.ctx = ctx
+        self.git_url_parser = git_url_parser
+        self.mirror_path = mirror_path
+
+        # The mirrors updated during this resolve
+        self.updated = set()
+
+        # The dependencies may be resolved from multiple threads
+        self.lock = threading.Lock()
+
+    def update(self, source, repository):
+        """Creates or updates the mirror of a repository.
+
+        :param source: The source of the dependency as a string, which
+            identifies the mirror.
+        :param repository: The URL of the repository as a string.
+        :return: The path to the mirror as a string or None if the mirror
+            is not available.
+        """
+        path = self.path(source=source)
+
+        with self.lock:
+            if path in self.updated:
+                return path
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with FileLock(path=path + ".lock"):
+            try:
+                if os.path.isdir(path):
+                    self.git.remote_update(cwd=path)
+                else:
+                    self.__clone(repository=repository, path=path)
+            except Exception as e:
+                # A failed update is not a problem, the resolver will
+                # download what is missing from the repository
+                self.ctx.to_log(f"wurf: GitMirror failed to update {path}:")
+                self.ctx.to_log(e)
+
+        if not os.path.isdir(path):
+            return None
+
+        with self.lock:
+            self.updated.add(path)
+
+        return path
+
+    def path(self, source):
+        """Returns the path to the mirror of a repository.
+
+        :param source: The source of the dependency as a string.
+        :return: The path as a string.
+        """
+        try:
+            url = self.git_url_parser.parse(source)
+            parts = [url.host] + url.path.split("/")
+        except AttributeError:
+            # The source could not be parsed
+            parts = []
+
+        if not parts or not all(parts) or ".." in parts:
+            # The source is e.g. a local path, we use a hash to make sure
+            # the mirror is inside the store
+            digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+            parts = [digest]
+
+        return os.path.join(self.mirror_path, *parts) + ".git"
+
+    def __clone(self, repository, path):
+        # We clone to a temporary folder, such that an interrupted clone does
+        # not leave an incomplete mirror behind
+        with atomic_directory(path=path) as temp_path:
+            self.git.clone(
+                repository=repository,
+                directory=temp_path,
+                cwd=os.path.dirname(path),
+                mirror=True,
+            )
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
@@ -0,0 +1,152 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+
+class GitRefIndex(object):
+    """Index of the refs of a git repository.
+
+    The index is built from the output of a single 'git for-each-ref', so
+    the tags, branches and the commits they point to can be looked up
+    without running git for every lookup.
+
+    Example:
+
+        refs = git.ref_index(cwd="/path/to/repository")
+
+        if refs.is_branch("main"):
+            ...
+
+        commit_id = refs.commit_id("1.0.0")
+    """
+
+    # The format passed to 'git for-each-ref', the "*objectname" is the
+    # commit an annotated tag points to and the "symref" is the target of a
+    # symbolic ref such as refs/remotes/origin/HEAD
+    FORMAT = "%(refname) %(objectname) %(*objectname) %(symref)"
+
+    def __init__(self, lines):
+        """Construct an instance.
+
+        :param lines: The lines printed by 'git for-each-ref' with the
+            GitRefIndex.FORMAT as a list of strings.
+        """
+        # Dict with the commit id of each ref by the full ref name
+        self.commits = {}
+
+        # Dict with the target of each symbolic ref by the full ref name
+        self.symrefs = {}
+
+        for line in lines:
+            if not line.strip():
+                continue
+
+            refname, objectname, peeled, symref = (line.split(" ") + ["", ""])[:4]
+
+            # Annotated tags point to a tag object, use the commit it peels to
+            self.commits[refname] = peeled or objectname
+
+            if symref:
+                self.symrefs[refname] = symref
+
+    def tags(self):
+        """
+        :return: The names of the tags as a list of strings.
+        """
+        return [r.split("/", 2)[2] for r in self.__refs("refs/tags/")]
+
+    def local_branches(self):
+        """
+        :return: The names of the local branches as a list of strings.
+        """
+        return [r.split("/", 2)[2] for r in self.__refs("refs/heads/")]
+
+    def remote_branches(self):
+        """
+        :return: The names of the remote branches without the name of the
+            remote e.g. "main" for "refs/remotes/origin/main" as a list of
+            strings.
+        """
+        branches = []
+
+        for refname in self.__refs("refs/remotes/"):
+            if refname in self.symrefs:
+                # E.g. refs/remotes/origin/HEAD
+                continue
+
+            # Strip "refs/remotes/<remote>/"
+            name = refname.split("/", 3)[3]
+
+            if name not in branches:
+                branches.append(name)
+
+        return branches
+
+    def tags_at(self, commit_id):
+        """Finds the tags pointing at a commit.
+
+        :param commit_id: The commit id as a string.
+        :return: The names of the tags as a list of strings.
+        """
+        return [
+            r.split("/", 2)[2]
+            for r in self.__refs("refs/tags/")
+            if self.commits[r] == commit_id
+        ]
+
+    def is_branch(self, name):
+        """Checks if a local or remote branch has the name.
+
+        :param name: The name of the branch as a string.
+        :return: True if the branch exists.
+        """
+        return name in self.local_branches() or name in self.remote_branches()
+
+    def default_branch(self, remote="origin"):
+        """
+        :param remote: The name of the remote as a string.
+        :return: The name of the default branch of the remote as a string or
+            None if it is not known.
+        """
+        prefix = f"refs/remotes/{remote}/"
+        target = self.symrefs.get(prefix + "HEAD", None)
+
+        if target is None or not target.startswith(prefix):
+            return None
+
+        # Strip "refs/remotes/<remote>/"
+        return target.split("/", 3)[3]
+
+    def commit_id(self, checkout):
+        """Looks up the commit of a tag or branch.
+
+        The name is resolved using the same rules as git, see 'git help
+        revisions'. Annotated tags are peeled to the commit they point to.
+
+        :param checkout: The name of the ref as a string e.g. "1.0.0",
+            "main", "origin/main" or "refs/tags/1.0.0".
+        :return: The commit id as a string or None if the checkout is not a
+            ref e.g. if it is a commit id.
+        """
+        for refname in [
+            checkout,
+            f"refs/{checkout}",
+            f"refs/tags/{checkout}",
+            f"refs/heads/{checkout}",
+            f"refs/remotes/{checkout}",
+            f"refs/remotes/{checkout}/HEAD",
+        ]:
+            refname = self.symrefs.get(refname, refname)
+
+            if refname.startswith("refs/") and refname in self.commits:
+                return self.commits[refname]
+
+        return None
+
+    def __refs(self, prefix):
+        return sorted(r for r in self.commits if r.startswith(prefix))
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
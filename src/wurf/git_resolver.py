@@ -4,6 +4,8 @@
 import os
 from .symlink import create_symlink
 from .error import RelativeSymlinkError
+from .error import DependencyError
+from .directory import atomic_directory
 from .git_checkout_resolver import GitCheckoutResolver
 
 
@@ -14,7 +16,17 @@ class GitResolver(object):
 
     DEFAULT_BRANCH = "default"
 
-    def __init__(self, git, ctx, dependency, git_url_rewriter, cwd):
+    def __init__(
+        self,
+        git,
+        ctx,
+        dependency,
+        git_url_rewriter,
+        cwd,
+        git_mirror=None,
+        checkout=None,
+        offline=False,
+    ):
         """Construct a new WurfGitResolver instance.
 
         :param git: A Git instance
@@ -23,12 +35,23 @@ class GitResolver(object):
         :param git_url_rewriter: A GitUrlRewriter instance
         :param cwd: Current working directory as a string. This is the place
             where we should create new folders etc.
+        :param git_mirror: A GitMirror instance or None if no mirror store
+            is used.
+        :param checkout: The branch, tag, or sha1 which will be checked out
+            as a string or None if not known e.g. when selecting a semver
+            version. If it is a tag or sha1 which is already available
+            locally we do not need to pull.
+        :param offline: If True the network is not accessed, so the
+            repository must already be available.
         """
         self.git = git
         self.ctx = ctx
         self.dependency = dependency
         self.git_url_rewriter = git_url_rewriter
         self.cwd = cwd
+        self.git_mirror = git_mirror
+        self.checkout = checkout
+        self.offline = offline
 
     def resolve(self):
         """
@@ -40,16 +63,67 @@ class GitResolver(object):
 
         default_repo_path = os.path.join(self.cwd, self.DEFAULT_BRANCH)
         if not os.path.isdir(default_repo_path):
-            self.git.clone(
-                repository=repo_url,
-                directory=default_repo_path,
-                cwd=self.cwd,
-            )
+            if self.offline:
+                self.__offline_miss(
+                    f"Offline: the repository {repo_url} has not been "
+                    f"cloned to {default_repo_path}"
+                )
+
+            # Only clone with --reference when a mirror is used
+            kwargs = {}
+            reference = self.__update_mirror(repo_url)
+
+            if reference is not None:
+                kwargs["reference"] = reference
+
+            # An interrupted clone must not leave a default folder behind,
+            # since it would be used the next time we resolve
+            with atomic_directory(path=default_repo_path) as temp_path:
+                self.git.clone(
+                    repository=repo_url, directory=temp_path, cwd=self.cwd, **kwargs
+                )
+
             self.__create_symlink_to_default_branch(default_repo_path)
+        else:
+            self.__pull(repo_url=repo_url, default_repo_path=default_repo_path)
+
+        # If the dependency contains submodules, we also get those
+        if self.dependency.pull_submodules:
+            if self.offline:
+                self.ctx.to_log("wurf: GitResolver offline, skipping submodules")
+            else:
+                self.git.pull_submodules(cwd=default_repo_path)
+
+        return default_repo_path
+
+    def __pull(self, repo_url, default_repo_path):
+        """Pulls the repository unless the checkout is already available."""
+        is_pinned = self.__is_pinned(default_repo_path)
+
+        if is_pinned and self.git.has_object(
+            cwd=default_repo_path, revision=self.checkout
+        ):
+            # The requested tag or commit cannot change, so there is no
+            # need to contact the remote
+            self.ctx.to_log(
+                f"wurf: GitResolver {self.checkout} available in "
+                f"{default_repo_path}, skipping git pull"
+            )
+        elif self.offline:
+            if is_pinned:
+                self.__offline_miss(
+                    f"Offline: {self.checkout} is not available in "
+                    f"{default_repo_path}"
+                )
+
+            self.ctx.to_log(
+                f"wurf: GitResolver offline, skipping git pull in {default_repo_path}"
+            )
         else:
             # We only want to pull if we haven't just cloned. This avoids
             # having to type in the username and password twice when using
             # https as a git protocol.
+            self.__update_mirror(repo_url)
             try:
                 # git pull will fail if the repository is unavailable
                 # This is not a problem if we have already downloaded
@@ -59,11 +133,38 @@ class GitResolver(object):
                 self.ctx.to_log("Exception when executing git pull:")
                 self.ctx.to_log(e)
 
-        # If the dependency contains submodules, we also get those
-        if self.dependency.pull_submodules:
-            self.git.pull_submodules(cwd=default_repo_path)
+    def __offline_miss(self, msg):
+        """Fails because the dependency is not available offline.
 
-        return default_repo_path
+        The message is stored on the dependency, such that all offline
+        misses can be reported together, see the OfflineResolver.
+        """
+        self.dependency.offline_miss = msg
+        raise DependencyError(msg=msg, dependency=self.dependency)
+
+    def __update_mirror(self, repo_url):
+        """Updates the mirror first, such that the objects are available
+        locally when we clone or pull.
+
+        :return: The path to the mirror or None if no mirror is used.
+        """
+        if self.git_mirror is None:
+            return None
+
+        return self.git_mirror.update(
+            source=self.dependency.source, repository=repo_url
+        )
+
+    def __is_pinned(self, default_repo_path):
+        """Checks whether the checkout is a tag or commit.
+
+        Branches may have moved on the remote, so we always pull those.
+        """
+        if self.checkout is None:
+            return False
+
+        refs = self.git.ref_index(cwd=default_repo_path)
+        return not refs.is_branch(self.checkout)
 
     def __create_symlink_to_default_branch(self, default_repo_path):
         # Create a symlink to the default branch folder, likely master or main
@@ -4,7 +4,7 @@
 import os
 
 from .error import DependencyError
-from .directory import copy_directory
+from .directory import atomic_directory
 from .git_checkout_resolver import GitCheckoutResolver
 
 
@@ -15,7 +15,17 @@ class GitSemverResolver(object):
     Read more about Semantic Versioning here: semver.org
     """
 
-    def __init__(self, git, resolver, ctx, semver_selector, dependency, cwd):
+    def __init__(
+        self,
+        git,
+        resolver,
+        ctx,
+        semver_selector,
+        dependency,
+        cwd,
+        checkout_strategy,
+        offline=False,
+    ):
         """Construct an instance.
 
         :param git: A WurfGit instance
@@ -25,6 +35,10 @@ class GitSemverResolver(object):
         :param dependency: The dependency instance.
         :param cwd: Current working directory as a string. This is the place
             where we should create new folders etc.
+        :param checkout_strategy: A GitCopyCheckout or GitSharedCheckout
+            instance used to create the checkout folder.
+        :param offline: If True the network is not accessed, so submodules
+            are not pulled.
         """
         self.git = git
         self.git_resolver = resolver
@@ -32,6 +46,8 @@ class GitSemverResolver(object):
         self.semver_selector = semver_selector
         self.dependency = dependency
         self.cwd = cwd
+        self.checkout_strategy = checkout_strategy
+        self.offline = offline
 
     def resolve(self):
         """Fetches the dependency if necessary.
@@ -43,7 +59,8 @@ class GitSemverResolver(object):
 
         assert os.path.isdir(path)
 
-        tags = self.git.tags(cwd=path)
+        refs = self.git.ref_index(cwd=path)
+        tags = refs.tags()
         tag = self.semver_selector.select_tag(major=self.dependency.major, tags=tags)
 
         if not tag:
@@ -56,7 +73,7 @@ class GitSemverResolver(object):
             )
 
         # Get commit id of tag
-        commit_id = self.git.checkout_to_commit_id(cwd=path, checkout=tag)
+        commit_id = refs.commit_id(tag)
 
         self.dependency.resolver_info = tag
 
@@ -69,13 +86,15 @@ class GitSemverResolver(object):
         )
 
         # If the folder for the chosen tag does not exist,
-        # then copy the master and checkout the tag
+        # then create it from the master and checkout the tag
         if not os.path.isdir(tag_path):
-            copy_directory(path=path, to_path=tag_path)
-            self.git.checkout(branch=tag, cwd=tag_path)
+            with atomic_directory(path=tag_path) as temp_path:
+                self.checkout_strategy.create(
+                    path=path, checkout_path=temp_path, checkout=tag
+                )
 
             # If the project contains submodules, we also get those
-            if self.dependency.pull_submodules:
+            if self.dependency.pull_submodules and not self.offline:
                 self.git.pull_submodules(cwd=tag_path)
 
         return tag_path
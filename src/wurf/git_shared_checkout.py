@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+
+
+class GitSharedCheckout(object):
+    """Creates a checkout folder using a shared clone of a repository.
+
+    The shared clone uses the object database of the repository, so only the
+    working tree of the checkout takes up additional space. See the
+    description of 'git clone --shared' for details.
+
+    Note, that the checkout depends on the objects in the repository it was
+    cloned from, so that repository must not be removed.
+    """
+
+    def __init__(self, git):
+        """Construct an instance.
+
+        :param git: A Git instance
+        """
+        self.git = git
+
+    def create(self, path, checkout_path, checkout):
+        """Creates the checkout folder.
+
+        :param path: The path to the repository to clone as a string.
+        :param checkout_path: The path to the checkout folder as a string.
+        :param checkout: The branch, tag, or sha1 as a string.
+        """
+        url = self.git.remote_origin_url(cwd=path)
+
+        self.git.clone(
+            repository=path,
+            directory=checkout_path,
+            cwd=os.path.dirname(checkout_path),
+            shared=True,
+            no_checkout=True,
+        )
+
+        # The clone only has the local branches of the repository as its
+        # remote branches. We fetch the remote branches, such that all the
+        # branches of the original remote can be checked out.
+        self.git.fetch(
+            cwd=checkout_path,
+            repository=path,
+            refspec="+refs/remotes/origin/*:refs/remotes/origin/*",
+        )
+
+        # Pulling a branch should use the original remote
+        self.git.set_remote_origin_url(cwd=checkout_path, url=url)
+        self.git.checkout(branch=checkout, cwd=checkout_path)
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
@@ -0,0 +1,171 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import ssl
+import threading
+import contextlib
+import http.client
+from urllib.parse import urlparse, urljoin
+
+from .error import WurfError
+
+
+class HttpConnectionPool(object):
+    """Keeps the connections to the HTTP servers open between requests.
+
+    Opening a new connection for every download means a new TCP and TLS
+    handshake per file. The pool keeps the idle connections per host, such
+    that the next request to the same host can reuse a connection. The pool
+    may be used from multiple threads, each request uses its own connection.
+
+    Example:
+
+        pool = HttpConnectionPool()
+
+        with pool.get(url="https://example.com/file.zip") as response:
+            data = response.read()
+    """
+
+    # The status codes of redirects that we follow
+    REDIRECT_STATUS = (301, 302, 303, 307, 308)
+
+    MAX_REDIRECTS = 10
+
+    def __init__(self, max_idle=4):
+        """Construct an instance.
+
+        :param max_idle: The maximum number of idle connections kept per
+            host.
+        """
+        self.max_idle = max_idle
+
+        # Dict with a list of idle connections per (scheme, host, port)
+        self.idle = {}
+        self.lock = threading.Lock()
+
+        self.ssl_context = ssl.create_default_context()
+
+    @contextlib.contextmanager
+    def get(self, url, headers=None):
+        """Sends a GET request and follows any redirects.
+
+        The connection is returned to the pool when the with block
+        completes, if the response was read completely.
+
+        :param url: The URL as a string.
+        :param headers: Dict with the request headers or None.
+        :return: The http.client.HTTPResponse with a successful status.
+        """
+        headers = headers or {}
+
+        for _ in range(HttpConnectionPool.MAX_REDIRECTS + 1):
+            key, connection, response = self.__request(url=url, headers=headers)
+
+            location = response.getheader("Location")
+
+            if response.status in HttpConnectionPool.REDIRECT_STATUS and location:
+                # Read the body, such that the connection can be reused
+                response.read()
+                self.__release(key=key, connection=connection, response=response)
+
+                url = urljoin(url, location)
+                continue
+
+            if response.status >= 400:
+                connection.close()
+                raise WurfError(
+                    f"HTTP Error {response.status}: {response.reason} ({url})"
+                )
+
+            try:
+                yield response
+            finally:
+                self.__release(key=key, connection=connection, response=response)
+            return
+
+        raise WurfError(f"Too many redirects: {url}")
+
+    def close(self):
+        """Closes the idle connections."""
+        with self.lock:
+            idle, self.idle = self.idle, {}
+
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def __request(self, url, headers):
+        parsed = urlparse(url)
+
+        if parsed.scheme not in ("http", "https"):
+            raise WurfError(f"Unsupported URL scheme: {url}")
+
+        key = (parsed.scheme, parsed.hostname, parsed.port)
+
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+
+        connection = self.__acquire(key=key)
+
+        if connection is not None:
+            try:
+                connection.request("GET", path, headers=headers)
+                return key, connection, connection.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                # The server may have closed the idle connection, we try
+                # again with a new connection
+                connection.close()
+
+        connection = self.__connect(key=key)
+
+        try:
+            connection.request("GET", path, headers=headers)
+            return key, connection, connection.getresponse()
+        except BaseException:
+            connection.close()
+            raise
+
+    def __acquire(self, key):
+        with self.lock:
+            connections = self.idle.get(key, None)
+
+            if connections:
+                return connections.pop()
+
+        return None
+
+    def __release(self, key, connection, response):
+        # Responses not created by http.client are never reused
+        will_close = getattr(response, "will_close", True)
+
+        if will_close or not response.isclosed():
+            # The server will close the connection or the response was not
+            # read completely
+            connection.close()
+            return
+
+        with self.lock:
+            connections = self.idle.setdefault(key, [])
+
+            if len(connections) < self.max_idle:
+                connections.append(connection)
+                return
+
+        connection.close()
+
+    def __connect(self, key):
+        scheme, host, port = key
+
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host=host, port=port, context=self.ssl_context
+            )
+
+        return http.client.HTTPConnection(host=host, port=port)
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, {"max_idle": self.max_idle})
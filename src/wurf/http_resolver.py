@@ -2,7 +2,14 @@
 # encoding: utf-8
 
 import os
+import json
+import hashlib
+from urllib.parse import urlparse
+
 from .error import WurfError
+from .error import DependencyError
+from .directory import atomic_directory, remove_directory
+from .tar_stream_extractor import TarStreamExtractor
 
 
 class HttpResolver(object):
@@ -10,7 +17,17 @@ class HttpResolver(object):
     Http Resolver functionality. Downloads a file.
     """
 
-    def __init__(self, ctx, url_download, dependency, cwd):
+    def __init__(
+        self,
+        ctx,
+        url_download,
+        dependency,
+        cwd,
+        offline=False,
+        download_cache=None,
+        revalidate=False,
+        stream_path=None,
+    ):
         """Construct a new instance.
 
         :param ctx: A Waf Context instance.
@@ -18,11 +35,25 @@ class HttpResolver(object):
         :param dependency: The dependency instance.
         :param cwd: Current working directory as a string. This is the place
             where we should create new folders etc.
+        :param offline: If True the network is not accessed, so the file
+            must already be downloaded.
+        :param download_cache: A DownloadCache instance or None if no
+            download cache is used.
+        :param revalidate: If True a downloaded file is downloaded again if
+            it was modified on the server.
+        :param stream_path: The folder where a tar archive is extracted while
+            it is downloaded as a string or None to not extract it. The
+            ArchiveResolver uses the folder instead of extracting the
+            archive again.
         """
         self.ctx = ctx
         self.url_download = url_download
         self.dependency = dependency
         self.cwd = cwd
+        self.offline = offline
+        self.download_cache = download_cache
+        self.revalidate = revalidate
+        self.stream_path = stream_path
 
     def resolve(self):
         """
@@ -34,18 +65,17 @@ class HttpResolver(object):
         # The folder for storing the file
         folder_path = os.path.join(self.cwd, "download")
 
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
-        files = os.listdir(folder_path)
+        if os.path.isdir(folder_path):
+            files = os.listdir(folder_path)
+        else:
+            files = []
+
         if len(files) > 1:
             raise WurfError(
                 f"Expected {folder_path} to at most contain 1 file but found "
                 f"{len(files)} files"
             )
         elif len(files) == 1:
-            self.ctx.to_log(
-                f"wurf: HttpResolver: {folder_path} is not empty. Skipping download."
-            )
             filename = files[0]
             if self.dependency.filename and filename != self.dependency.filename:
                 raise WurfError(
@@ -54,17 +84,294 @@ class HttpResolver(object):
                 )
 
             file_path = os.path.join(folder_path, filename)
+
+            # A file with a known sha256 cannot change
+            if self.revalidate and not self.offline and not self.dependency.sha256:
+                file_path = self.__revalidate(
+                    folder_path=folder_path, file_path=file_path
+                )
+            else:
+                self.ctx.to_log(
+                    f"wurf: HttpResolver: {folder_path} is not empty. "
+                    "Skipping download."
+                )
+        elif self.offline and not self.__is_cached():
+            msg = (
+                f"Offline: {self.dependency.source} has not been "
+                f"downloaded to {folder_path}"
+            )
+
+            # Stored such that all offline misses can be reported together,
+            # see the OfflineResolver
+            self.dependency.offline_miss = msg
+            raise DependencyError(msg=msg, dependency=self.dependency)
         else:
             if self.dependency.filename:
                 filename = self.dependency.filename
             else:
                 filename = None
 
-            file_path = self.url_download.download(
-                cwd=folder_path, source=self.dependency.source, filename=filename
-            )
+            file_path = self.__download(folder_path=folder_path, filename=filename)
         assert os.path.isfile(file_path), "We should have a valid path here!"
 
         self.dependency.resolver_info = os.path.basename(file_path)
 
         return file_path
+
+    def __download(self, folder_path, filename):
+        """Downloads the file to the folder.
+
+        The file is downloaded to a temporary folder, such that an
+        interrupted download is not used the next time we resolve.
+
+        :return: The path to the downloaded file as a string.
+        """
+        if os.path.isdir(folder_path):
+            # An empty folder may be left behind by an earlier version
+            os.rmdir(folder_path)
+
+        validators = {}
+        extractor = self.__stream_extractor(filename=filename)
+
+        try:
+            with atomic_directory(path=folder_path) as temp_path:
+                os.makedirs(temp_path)
+
+                if self.download_cache is not None:
+                    file_path = self.download_cache.download(
+                        source=self.dependency.source,
+                        cwd=temp_path,
+                        filename=filename,
+                        sha256=self.dependency.sha256,
+                        stream=extractor,
+                    )
+                else:
+                    file_path = self.__download_file(
+                        cwd=temp_path,
+                        filename=filename,
+                        validators=validators,
+                        stream=extractor,
+                    )
+        except BaseException:
+            if extractor is not None:
+                extractor.abort()
+            raise
+
+        if validators:
+            self.__write_validators(validators=validators)
+
+        file_path = os.path.join(folder_path, os.path.basename(file_path))
+
+        if extractor is not None:
+            self.__store_stream(extractor=extractor, file_path=file_path)
+
+        return file_path
+
+    def __stream_extractor(self, filename):
+        """Returns a TarStreamExtractor if the archive should be extracted
+        while it is downloaded, otherwise None.
+        """
+        if self.stream_path is None:
+            return None
+
+        if not filename:
+            # The Content-Disposition header is not known yet, so we can only
+            # use the name from the URL
+            filename = os.path.basename(urlparse(self.dependency.source).path)
+
+        if not TarStreamExtractor.supports(filename):
+            return None
+
+        temp_path = f"{self.stream_path}.{os.getpid()}.tmp"
+
+        if os.path.lexists(temp_path):
+            remove_directory(path=temp_path)
+
+        return TarStreamExtractor(to_path=temp_path)
+
+    def __store_stream(self, extractor, file_path):
+        """Stores the archive extracted while it was downloaded.
+
+        The stream_path is stored together with a stamp of the archive, such
+        that the ArchiveResolver only uses it for this archive.
+        """
+        if extractor.size != os.path.getsize(file_path):
+            # E.g. the file was found in the download cache
+            extractor.abort()
+            return
+
+        try:
+            extractor.close()
+        except WurfError as e:
+            # The ArchiveResolver will extract the archive instead
+            self.ctx.to_log(f"wurf: HttpResolver: {e}")
+            extractor.abort()
+            return
+
+        if os.path.lexists(self.stream_path):
+            remove_directory(path=self.stream_path)
+
+        os.rename(extractor.to_path, self.stream_path)
+
+        stat = os.stat(file_path)
+        stamp = {"path": file_path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        with open(self.stream_path + ".json", "w") as stamp_file:
+            json.dump(stamp, stamp_file)
+
+    def __revalidate(self, folder_path, file_path):
+        """Downloads the file again if it was modified on the server.
+
+        The new file is downloaded to a temporary folder, which replaces the
+        folder when the download completes.
+
+        :return: The path to the file as a string.
+        """
+        temp_path = f"{folder_path}.{os.getpid()}.tmp"
+
+        if os.path.lexists(temp_path):
+            remove_directory(path=temp_path)
+
+        os.makedirs(temp_path)
+
+        try:
+            if self.download_cache is not None:
+                validators = None
+                new_path = self.download_cache.download(
+                    source=self.dependency.source,
+                    cwd=temp_path,
+                    filename=self.dependency.filename,
+                    revalidate=True,
+                )
+
+                if os.path.samefile(new_path, file_path):
+                    new_path = None
+            else:
+                # Without stored validators the file is always downloaded
+                validators = self.__read_validators()
+                new_path = self.__download_file(
+                    cwd=temp_path,
+                    filename=self.dependency.filename,
+                    validators=validators,
+                )
+
+            if new_path is None:
+                self.ctx.to_log(
+                    f"wurf: HttpResolver: {self.dependency.source} was not "
+                    "modified. Skipping download."
+                )
+                return file_path
+
+            stale_path = f"{folder_path}.{os.getpid()}.stale"
+            os.rename(folder_path, stale_path)
+            os.rename(temp_path, folder_path)
+            remove_directory(path=stale_path)
+        finally:
+            if os.path.lexists(temp_path):
+                remove_directory(path=temp_path)
+
+        if validators:
+            self.__write_validators(validators=validators)
+
+        return os.path.join(folder_path, os.path.basename(new_path))
+
+    def __download_file(self, cwd, filename, validators, stream=None):
+        """Downloads the file and checks the sha256 if it is specified.
+
+        An interrupted download is kept in the "partial" folder, such that
+        it can be resumed the next time we resolve.
+
+        :param validators: Dict with the validators of the earlier download,
+            which is updated with the validators of this download.
+        :param stream: A TarStreamExtractor or None.
+        :return: The path to the downloaded file as a string or None if the
+            file was not modified.
+        """
+        part_path = os.path.join(self.cwd, "partial")
+
+        hasher = hashlib.sha256() if self.dependency.sha256 else None
+
+        file_path = self.url_download.download(
+            cwd=cwd,
+            source=self.dependency.source,
+            filename=filename,
+            hasher=hasher,
+            part_path=part_path,
+            validators=validators,
+            stream=stream,
+        )
+
+        if os.path.isdir(part_path) and not os.listdir(part_path):
+            os.rmdir(part_path)
+
+        if hasher is None or file_path is None:
+            return file_path
+
+        if hasher.hexdigest() != self.dependency.sha256.lower():
+            raise DependencyError(
+                msg=(
+                    f"Failed integrity check for {self.dependency.source}: "
+                    f"expected sha256 {self.dependency.sha256} but the "
+                    f"download has sha256 {hasher.hexdigest()}"
+                ),
+                dependency=self.dependency,
+            )
+
+        return file_path
+
+    def __read_validators(self):
+        """Reads the validators stored with the download.
+
+        :return: Dict with the "etag", "last_modified" and "content_length"
+            of the download or an empty dict if they are not stored.
+        """
+        path = self.__validators_path()
+
+        if not os.path.isfile(path):
+            return {}
+
+        try:
+            with open(path, "r") as validators_file:
+                validators = json.load(validators_file)
+        except ValueError:
+            return {}
+
+        if validators.get("source", None) != self.dependency.source:
+            return {}
+
+        del validators["source"]
+        return validators
+
+    def __write_validators(self, validators):
+        """Stores the validators of the download next to the download folder."""
+        path = self.__validators_path()
+
+        with open(path, "w") as validators_file:
+            json.dump(
+                dict(validators, source=self.dependency.source),
+                validators_file,
+                indent=4,
+                sort_keys=True,
+            )
+
+    def __validators_path(self):
+        return os.path.join(self.cwd, "download.json")
+
+    def __is_cached(self):
+        """Checks if the file is available in the download cache."""
+        if self.download_cache is None:
+            return False
+
+        entry = self.download_cache.lookup(
+            source=self.dependency.source,
+            filename=self.dependency.filename,
+            sha256=self.dependency.sha256,
+        )
+
+        return entry is not None
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
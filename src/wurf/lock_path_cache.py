@@ -21,9 +21,28 @@ class LockPathCache(object):
     def check_sha1(self, dependency: Dependency):
         return dependency.sha1 != self.cache[dependency.name]["sha1"]
 
+    def check_resolved(self, dependency: Dependency, path: str):
+        return len(self.entry_changes(name=dependency.name, path=path)) > 0
+
     def check_content(self, **kwargs):
         return False
 
+    def content_changes(self, **kwargs):
+        return []
+
+    def entry_changes(self, name: str, path: str):
+        """Checks that the dependency was resolved to the locked path.
+
+        :return: A list with the change ("modified", ".") if the paths
+            differ, otherwise an empty list.
+        """
+        locked_path = os.path.realpath(self.cache[name]["path"])
+
+        if locked_path != os.path.realpath(path):
+            return [("modified", ".")]
+
+        return []
+
     def resolver_info(self, **kwargs):
         return None
 
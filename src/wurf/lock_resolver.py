@@ -0,0 +1,36 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+from .file_lock import FileLock
+
+
+class LockResolver(object):
+    """Holds a file lock while resolving.
+
+    The lock allows multiple waf processes, e.g. parallel CI jobs, to
+    share the folders of a dependency in a common resolve path. Only one
+    process at a time fetches the dependency and creates its folders.
+    """
+
+    def __init__(self, resolver, lock_path):
+        """Construct an instance.
+
+        :param resolver: A resolver which will do the actual job
+        :param lock_path: The path to the lock file as a string.
+        """
+        self.resolver = resolver
+        self.lock_path = lock_path
+
+    def resolve(self):
+        """Resolve the dependency while holding the lock.
+
+        :return: Path to resolved dependency as a string
+        """
+        with FileLock(path=self.lock_path):
+            return self.resolver.resolve()
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
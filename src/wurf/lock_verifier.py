@@ -0,0 +1,214 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import json
+import concurrent.futures
+
+from .error import WurfError
+from .on_active_store_path_resolver import OnActiveStorePathResolver
+
+
+class LockVerifier(object):
+    """Verifies the resolved dependencies against a lock file.
+
+    The entries of the lock file are verified concurrently: The commit of
+    the git dependencies is checked and the content of the http dependencies
+    is hashed. The resolved path of a dependency is read from the resolve
+    manifest, so the dependencies do not have to be resolved again.
+
+    The result is a report with the status of every dependency:
+
+    - "match": The resolved dependency matches the lock file.
+    - "mismatch": The resolved dependency differs from the lock file.
+    - "missing": The dependency is in the lock file but has not been
+      resolved, or it has been resolved but is not in the lock file.
+    """
+
+    REPORT_FILE = "verify_lock.json"
+
+    VERSION = 1
+
+    # The maximum number of changed files listed by format_result(...)
+    MAX_CHANGES = 20
+
+    def __init__(self, lock_cache, resolve_manifest, resolve_config_path, jobs=None):
+        """Construct an instance.
+
+        :param lock_cache: The LockVersionCache or LockPathCache to verify.
+        :param resolve_manifest: A ResolveManifest instance used to look up
+            the resolved dependencies.
+        :param resolve_config_path: A string containing the path to where the
+            dependencies config json files are stored.
+        :param jobs: The number of dependencies verified in parallel or None
+            to use the default of concurrent.futures.ThreadPoolExecutor.
+        """
+        self.lock_cache = lock_cache
+        self.resolve_manifest = resolve_manifest
+        self.resolve_config_path = resolve_config_path
+        self.jobs = jobs
+
+    def verify(self, names=None):
+        """Verifies the dependencies.
+
+        :param names: The names of the dependencies to verify as a list of
+            strings or None to verify all dependencies in the lock file and
+            report the resolved dependencies which are not in the lock file.
+        :return: The report as a dict with the "status" of the lock file
+            ("match" or "mismatch"), a "summary" with the number of
+            dependencies per status and the "dependencies" by name. Each
+            dependency is a dict with the "status", the "path" which was
+            verified, a "message" and the list of "changes" as dicts with
+            the "change" and the "path" of the changed file.
+        """
+        verify_all = names is None
+
+        if verify_all:
+            names = self.lock_cache.cache
+
+        names = sorted(names)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = pool.map(self.__verify_entry, names)
+            dependencies = dict(zip(names, results))
+
+        # The dependencies which were resolved without being locked
+        for name in self.resolve_manifest.names() if verify_all else []:
+            if name not in dependencies:
+                dependencies[name] = LockVerifier.__result(
+                    status="missing", message="Not found in lock file"
+                )
+
+        summary = {"match": 0, "mismatch": 0, "missing": 0}
+
+        for result in dependencies.values():
+            summary[result["status"]] += 1
+
+        return {
+            "version": LockVerifier.VERSION,
+            "status": "match" if summary["match"] == len(dependencies) else "mismatch",
+            "summary": summary,
+            "dependencies": dependencies,
+        }
+
+    def write(self, report):
+        """Writes the report to the resolve config path.
+
+        :param report: The report returned by verify().
+        :return: The path to the report as a string.
+        """
+        path = os.path.join(self.resolve_config_path, LockVerifier.REPORT_FILE)
+
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=4, sort_keys=True)
+
+        return path
+
+    @staticmethod
+    def format_result(name, result):
+        """Formats the result of a dependency which does not match.
+
+        :param name: The name of the dependency as a string.
+        :param result: The result of the dependency in the report.
+        :return: The message with the changed files as a string.
+        """
+        text = f'Lock verification failed for "{name}": {result["message"]}'
+        changes = result["changes"]
+
+        # Only list the changed files, unless the whole dependency changed
+        if not changes or changes == [{"change": "modified", "path": "."}]:
+            return text
+
+        lines = [f"\n    {c['change']}: {c['path']}" for c in changes]
+
+        if len(lines) > LockVerifier.MAX_CHANGES:
+            skipped = len(lines) - LockVerifier.MAX_CHANGES
+            lines = lines[: LockVerifier.MAX_CHANGES]
+            lines.append(f"\n    ... and {skipped} more")
+
+        return text + "\nChanged files:" + "".join(lines)
+
+    def __verify_entry(self, name):
+        config = self.__read_config(name=name)
+
+        if config is None:
+            return LockVerifier.__result(
+                status="missing", message="Not resolved - re-run configure"
+            )
+
+        if config["is_symlink"]:
+            path = str(config["real_path"])
+        else:
+            path = str(config["path"])
+
+        if not os.path.exists(path):
+            return LockVerifier.__result(
+                status="missing", path=path, message=f'Invalid path: "{path}"'
+            )
+
+        if config["sha1"] != self.lock_cache.cache[name]["sha1"]:
+            return LockVerifier.__result(
+                status="mismatch",
+                path=path,
+                message=(
+                    "Locked dependency inconsistent with the "
+                    "dependency specified in the project."
+                ),
+            )
+
+        try:
+            changes = self.lock_cache.entry_changes(name=name, path=path)
+        except WurfError as e:
+            return LockVerifier.__result(status="mismatch", path=path, message=str(e))
+
+        if changes:
+            return LockVerifier.__result(
+                status="mismatch",
+                path=path,
+                message=(
+                    "The content does not match the data "
+                    "when the dependency was locked."
+                ),
+                changes=changes,
+            )
+
+        return LockVerifier.__result(status="match", path=path)
+
+    def __read_config(self, name):
+        """Reads the config stored by the OnActiveStorePathResolver.
+
+        :return: Dict with the config or None if the dependency has not been
+            resolved.
+        """
+        config = self.resolve_manifest.config(name=name)
+
+        if config is not None:
+            return config
+
+        config_path = os.path.join(self.resolve_config_path, name + ".resolve.json")
+
+        if not os.path.isfile(config_path):
+            return None
+
+        with open(config_path, "r") as config_file:
+            config = json.load(config_file)
+
+        if config.get("version", None) != OnActiveStorePathResolver.VERSION:
+            return None
+
+        return config
+
+    @staticmethod
+    def __result(status, path=None, message=None, changes=()):
+        return {
+            "status": status,
+            "path": path,
+            "message": message,
+            "changes": [{"change": c, "path": p} for c, p in changes],
+        }
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
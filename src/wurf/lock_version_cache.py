@@ -6,6 +6,7 @@ import hashlib
 import os
 
 from .error import WurfError
+from .file_hasher import FileHasher
 
 
 class LockVersionCache(object):
@@ -14,23 +15,29 @@ class LockVersionCache(object):
     LOCK_FILE = "lock_version_resolve.json"
 
     @staticmethod
-    def create_empty(git):
-        return LockVersionCache(git=git, cache={})
+    def create_empty(git, file_hasher=None):
+        return LockVersionCache(git=git, cache={}, file_hasher=file_hasher)
 
     @staticmethod
-    def create_from_file(git, cwd):
+    def create_from_file(git, cwd, file_hasher=None):
         assert os.path.exists(cwd)
         with open(os.path.join(cwd, LockVersionCache.LOCK_FILE), "r") as lock_file:
             cache = json.load(lock_file)
 
-        return LockVersionCache(git=git, cache=cache)
+        return LockVersionCache(git=git, cache=cache, file_hasher=file_hasher)
 
     @staticmethod
     def calculate_file_hash(path):
+        """Computes the "file_hash" used by lock files of earlier versions.
+
+        The content of all files is part of a single SHA1, so it cannot be
+        cached or computed in parallel. New lock files use the
+        "content_hash" computed by the FileHasher instead.
+        """
         assert os.path.exists(path)
         sha1 = hashlib.sha1()
         if os.path.isfile(path):
-            sha1.update(open(path, "rb").read())
+            LockVersionCache.__update_file(sha1=sha1, path=path)
         elif os.path.isdir(path):
             # Calculate the hash of all files in the directory
             for root, paths, files in os.walk(path):
@@ -40,14 +47,31 @@ class LockVersionCache(object):
                 for file in sorted(files):
                     f = os.path.join(root, file)
                     sha1.update(file.encode("utf-8"))
-                    sha1.update(open(f, "rb").read())
+                    LockVersionCache.__update_file(sha1=sha1, path=f)
         else:
             raise WurfError(f"Unknown file type: {path}")
         return sha1.hexdigest()
 
-    def __init__(self, git, cache):
+    @staticmethod
+    def __update_file(sha1, path):
+        with open(path, "rb") as hash_file:
+            for chunk in iter(lambda: hash_file.read(FileHasher.CHUNK_SIZE), b""):
+                sha1.update(chunk)
+
+    def __init__(self, git, cache, file_hasher=None):
+        """Construct an instance.
+
+        :param git: A Git instance
+        :param cache: Dict with the lock entries of the dependencies
+        :param file_hasher: The FileHasher used to compute the content hash
+            of http dependencies or None to use one without a cache file.
+        """
+        if file_hasher is None:
+            file_hasher = FileHasher()
+
         self.git = git
         self.cache = cache
+        self.file_hasher = file_hasher
 
     def commit_id(self, dependency):
         assert dependency.resolver == "git"
@@ -59,6 +83,16 @@ class LockVersionCache(object):
         assert dependency.name in self.cache
         return self.cache[dependency.name]["file_hash"]
 
+    def content_hash(self, dependency):
+        """Returns the content hash of an http dependency.
+
+        :return: The content hash as a hex string or None if the dependency
+            was locked with a "file_hash" by an earlier version.
+        """
+        assert dependency.resolver == "http"
+        assert dependency.name in self.cache
+        return self.cache[dependency.name].get("content_hash", None)
+
     def check_sha1(self, dependency):
         return dependency.sha1 != self.cache[dependency.name]["sha1"]
 
@@ -66,14 +100,72 @@ class LockVersionCache(object):
         assert dependency.name in self.cache
         return self.cache[dependency.name].get("resolver_info", None)
 
+    def check_resolved(self, dependency, path):
+        """Checks the commit of a resolved git dependency.
+
+        The content of http dependencies is not hashed here, since it is
+        expensive. Use content_changes(...) to verify it.
+
+        :param dependency: The Dependency instance
+        :param path: The path to the resolved dependency as a string
+        :return: True if the dependency does not match the lock
+        """
+        if dependency.resolver != "git":
+            return False
+
+        return len(self.entry_changes(name=dependency.name, path=path)) > 0
+
     def check_content(self, dependency, path):
-        if dependency.resolver == "git":
-            return self.commit_id(dependency) != self.git.current_commit(cwd=path)
-        elif dependency.resolver == "http":
+        return len(self.content_changes(dependency=dependency, path=path)) > 0
+
+    def content_changes(self, dependency, path):
+        """Finds the changes since the dependency was locked.
+
+        The files of http dependencies locked with a "content_tree" are
+        reported individually. For lock entries of earlier versions, which
+        only store a single hash, the change is reported for the root ".".
+
+        :param dependency: The Dependency instance
+        :param path: The path to the resolved dependency as a string
+        :return: A list of (change, path) tuples as returned by
+            FileHasher.compare(...). The list is empty if the content
+            matches the lock.
+        """
+        if dependency.resolver == "http":
             assert hasattr(
                 dependency, "real_path"
             ), "Dependency must have a real_path attribute"
-            return self.calculate_file_hash(path) != self.file_hash(dependency)
+
+        return self.entry_changes(name=dependency.name, path=path)
+
+    def entry_changes(self, name, path):
+        """Finds the changes since a lock entry was written.
+
+        :param name: The name of the dependency as a string
+        :param path: The path to the resolved dependency as a string
+        :return: A list of (change, path) tuples, see content_changes(...).
+        """
+        entry = self.cache[name]
+
+        if "commit_id" in entry:
+            if entry["commit_id"] != self.git.current_commit(cwd=path):
+                return [("modified", ".")]
+            return []
+
+        if "content_tree" in entry:
+            return FileHasher.compare(
+                expected=entry["content_tree"],
+                actual=self.file_hasher.content_tree(path),
+            )
+
+        if "content_hash" in entry:
+            changed = self.file_hasher.content_hash(path) != entry["content_hash"]
+        elif "file_hash" in entry:
+            changed = self.calculate_file_hash(path) != entry["file_hash"]
+        else:
+            raise WurfError(f"Unknown lock entry for {name}: {entry}")
+
+        return [("modified", ".")] if changed else []
 
     def add_dependency(self, dependency):
         entry = {"sha1": dependency.sha1}
@@ -87,7 +179,9 @@ class LockVersionCache(object):
             assert hasattr(
                 dependency, "real_path"
             ), "Dependency must have a real_path attribute"
-            entry["file_hash"] = self.calculate_file_hash(dependency.real_path)
+            tree = self.file_hasher.content_tree(dependency.real_path)
+            entry["content_hash"] = tree["digest"]
+            entry["content_tree"] = tree
         else:
             raise WurfError(f"Unknown resolver: {dependency.resolver}")
 
@@ -95,6 +189,15 @@ class LockVersionCache(object):
 
         self.cache[dependency.name] = entry
 
+    def copy_dependency(self, dependency, lock_cache):
+        """Copies the entry of a dependency from another lock cache.
+
+        :param dependency: The Dependency instance
+        :param lock_cache: The LockVersionCache containing the entry
+        """
+        assert dependency.name in lock_cache.cache
+        self.cache[dependency.name] = dict(lock_cache.cache[dependency.name])
+
     def write_to_file(self, cwd):
         assert os.path.exists(cwd)
         with open(os.path.join(cwd, LockVersionCache.LOCK_FILE), "w") as lock_file:
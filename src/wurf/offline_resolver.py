@@ -0,0 +1,47 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+from .error import WurfError
+
+
+class OfflineResolver(object):
+    """Collects the dependencies which are not available offline.
+
+    Instead of failing on the first dependency which is not available, the
+    dependency is skipped, such that the remaining dependencies are
+    resolved. The misses are reported together when all dependencies have
+    been resolved.
+    """
+
+    def __init__(self, resolver, dependency, offline_misses):
+        """Construct an instance.
+
+        :param resolver: The resolver to use
+        :param dependency: The dependency to resolve
+        :param offline_misses: List where the dependencies which are not
+            available offline are added.
+        """
+        self.resolver = resolver
+        self.dependency = dependency
+        self.offline_misses = offline_misses
+
+    def resolve(self):
+        """Resolve the dependency.
+
+        :return: Path to resolved dependency as a string or None if the
+            dependency is not available offline.
+        """
+        try:
+            return self.resolver.resolve()
+        except WurfError:
+            if self.dependency.offline_miss is None:
+                raise
+
+            self.offline_misses.append(self.dependency)
+            return None
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
@@ -8,17 +8,22 @@ import json
 class OnActiveStorePathResolver(object):
     VERSION = 1
 
-    def __init__(self, resolver, dependency, resolve_config_path):
+    def __init__(
+        self, resolver, dependency, resolve_config_path, resolve_manifest=None
+    ):
         """Construct an instance.
 
         :param resolver: A resolver which will do the actual job
         :param dependency: A Dependency instance.
         :param resolve_config_path: A string containing the path to where the
             dependencies config json files should be / is stored.
+        :param resolve_manifest: A ResolveManifest instance where the config
+            is also added or None.
         """
         self.resolver = resolver
         self.dependency = dependency
         self.resolve_config_path = resolve_config_path
+        self.resolve_manifest = resolve_manifest
 
     def resolve(self):
         """Resolve a path to a dependency.
@@ -55,3 +60,6 @@ class OnActiveStorePathResolver(object):
 
         with open(config_path, "w") as config_file:
             json.dump(config, config_file, indent=4, sort_keys=True)
+
+        if self.resolve_manifest is not None:
+            self.resolve_manifest.add(name=self.dependency.name, config=config)
@@ -10,17 +10,22 @@ from .error import DependencyError
 
 
 class OnPassiveLoadPathResolver(object):
-    def __init__(self, git, dependency, resolve_config_path, resolve_path):
+    def __init__(
+        self, git, dependency, resolve_config_path, resolve_path, resolve_manifest=None
+    ):
         """Construct an instance.
 
         :param dependency: A Dependency instance.
         :param resolve_config_path: A string containing the path to where the
             dependencies config json files should be / is stored.
+        :param resolve_manifest: A ResolveManifest instance used to look up
+            the config before reading the dependency config file or None.
         """
         self.git = git
         self.dependency = dependency
         self.resolve_config_path = resolve_config_path
         self.resolve_path = resolve_path
+        self.resolve_manifest = resolve_manifest
 
     def resolve(self):
         """Resolve a path to a dependency.
@@ -53,7 +58,13 @@ class OnPassiveLoadPathResolver(object):
         return path
 
     def __read_config(self):
-        """Read the dependency config from file"""
+        """Read the dependency config from the manifest or file"""
+
+        if self.resolve_manifest is not None:
+            config = self.resolve_manifest.config(name=self.dependency.name)
+
+            if config is not None:
+                return config
 
         config_path = os.path.join(
             self.resolve_config_path, self.dependency.name + ".resolve.json"
@@ -20,11 +20,25 @@ class Options(object):
         self.known_args = {}
         self.unknown_args = []
 
+        # The names of the long options passed in args. Used to check
+        # whether the options added for a dependency were passed, such that
+        # we only have to parse the arguments again if they were.
+        self.option_index = Options.index_options(args)
+
         def non_empty_string(value):
             if not value:
                 raise argparse.ArgumentTypeError("Empty string is not allowed.")
             return value
 
+        def positive_integer(value):
+            try:
+                number = int(value)
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"Invalid integer: {value}")
+            if number < 1:
+                raise argparse.ArgumentTypeError("Value must be at least 1.")
+            return number
+
         self.parser.add_argument(
             "--resolve_path",
             dest="--resolve_path",
@@ -69,6 +83,71 @@ class Options(object):
             "the specific versions of all resolved dependencies.",
         )
 
+        self.parser.add_argument(
+            "--update_lock",
+            dest="--update_lock",
+            default=None,
+            type=non_empty_string,
+            help="Comma separated names of the dependencies to resolve again "
+            "when resolving from the lock_version_resolve.json file. The lock "
+            "file is updated, the entries of the other dependencies are kept.",
+        )
+
+        self.parser.add_argument(
+            "--resolve_jobs",
+            dest="--resolve_jobs",
+            default=1,
+            type=positive_integer,
+            help="The number of dependencies to fetch in parallel. [default: 1]",
+        )
+
+        self.parser.add_argument(
+            "--checkout_strategy",
+            dest="--checkout_strategy",
+            default="copy",
+            choices=["copy", "shared"],
+            help="How the folders for the different versions of a git "
+            "dependency are created. 'copy' copies the entire repository, "
+            "'shared' uses a shared clone which reuses the git objects of the "
+            "repository. [default: 'copy']",
+        )
+
+        self.parser.add_argument(
+            "--force_resolve",
+            dest="--force_resolve",
+            action="store_true",
+            default=False,
+            help="Resolve all dependencies, even if nothing has changed since "
+            "the last resolve.",
+        )
+
+        self.parser.add_argument(
+            "--offline",
+            dest="--offline",
+            action="store_true",
+            default=False,
+            help="Resolve the dependencies without accessing the network. "
+            "Only the existing clones, checkouts and downloaded files are used.",
+        )
+
+        self.parser.add_argument(
+            "--revalidate_http",
+            dest="--revalidate_http",
+            action="store_true",
+            default=False,
+            help="Send a conditional request for the already downloaded http "
+            "dependencies and download them again if they were modified on "
+            "the server.",
+        )
+
+        self.parser.add_argument(
+            "--resolve_trace",
+            dest="--resolve_trace",
+            default=None,
+            help="Write the time spent resolving the dependencies to the "
+            "given file in the Chrome trace event format.",
+        )
+
         self.__parse()
 
     def resolve_path(self):
@@ -86,12 +165,76 @@ class Options(object):
     def lock_versions(self):
         return self.known_args["--lock_versions"]
 
+    def update_lock(self):
+        """Returns the names of the dependencies passed to --update_lock.
+
+        :return: A list of names, which is empty if the option was not passed.
+        """
+        if self.known_args["--update_lock"] is None:
+            return []
+
+        names = self.known_args["--update_lock"].split(",")
+        return [name.strip() for name in names if name.strip()]
+
+    def resolve_jobs(self):
+        return self.known_args["--resolve_jobs"]
+
+    def checkout_strategy(self):
+        return self.known_args["--checkout_strategy"]
+
+    def force_resolve(self):
+        return self.known_args["--force_resolve"]
+
+    def offline(self):
+        return self.known_args["--offline"]
+
+    def revalidate_http(self):
+        return self.known_args["--revalidate_http"]
+
+    def resolve_trace(self):
+        return self.known_args["--resolve_trace"]
+
     def path(self, dependency):
         return self.known_args[f"--{dependency.name}_path"]
 
     def checkout(self, dependency):
         return self.known_args[f"--{dependency.name}_checkout"]
 
+    @staticmethod
+    def index_options(args):
+        """Returns the names of the long options in the arguments.
+
+        :param args: The command-line arguments passed as a list.
+        :return: A set with the option names e.g. "--foo_path" for both
+            "--foo_path /tmp/foo" and "--foo_path=/tmp/foo".
+        """
+        index = set()
+
+        for arg in args:
+            if arg == "--":
+                # The remaining arguments are not options
+                break
+
+            if arg.startswith("--"):
+                index.add(arg.split("=", 1)[0])
+
+        return index
+
+    def __is_passed(self, option):
+        """Checks if an option may have been passed in the arguments.
+
+        argparse also accepts an unambiguous abbreviation of an option, so we
+        look for the option and all its prefixes.
+
+        :param option: The option name as a string e.g. "--foo_path".
+        :return: True if the option or an abbreviation of it was passed.
+        """
+        for end in range(3, len(option) + 1):
+            if option[:end] in self.option_index:
+                return True
+
+        return False
+
     def __parse(self):
         known, unknown = self.parser.parse_known_args(args=self.args)
 
@@ -106,6 +249,12 @@ class Options(object):
         ) and "--skip_internal" in self.args:
             raise WurfError("Incompatible options")
 
+        if self.update_lock() and (self.lock_versions() or self.lock_paths()):
+            raise WurfError("Incompatible options")
+
+        if self.update_lock() and "--skip_internal" in self.args:
+            raise WurfError("Incompatible options")
+
     def __add_path(self, dependency):
         option = f"--{dependency.name}_path"
 
@@ -116,6 +265,8 @@ class Options(object):
             help=f"Manually specify path for {dependency.name}.",
         )
 
+        return option
+
     def __add_checkout(self, dependency):
         option = f"--{dependency.name}_checkout"
 
@@ -126,10 +277,21 @@ class Options(object):
             help=f"Manually specify Git checkout for {dependency.name}.",
         )
 
+        return option
+
     def add_dependency(self, dependency):
-        self.__add_path(dependency)
+        options = [self.__add_path(dependency)]
 
         if dependency.resolver == "git":
-            self.__add_checkout(dependency)
+            options.append(self.__add_checkout(dependency))
 
-        self.__parse()
+        if any(self.__is_passed(option) for option in options):
+            # Parse the arguments again to get the values and errors
+            # exactly as argparse would report them
+            self.__parse()
+            return
+
+        # The options were not passed, so parsing the arguments again
+        # would only add the default values
+        for option in options:
+            self.known_args[option] = None
@@ -9,32 +9,49 @@ import inspect
 import collections
 
 from .archive_resolver import ArchiveResolver
+from .cached_git import CachedGit
 from .check_lock_cache_resolver import CheckLockCacheResolver
 from .config_file import ConfigFile
+from .config_file import LOCAL_CONFIG_FILE
+from .config_file import USER_CONFIG_FILE
 from .configuration import Configuration
 from .context_msg_resolver import ContextMsgResolver
 from .create_symlink_resolver import CreateSymlinkResolver
 from .dependency_manager import DependencyManager
+from .download_cache import DownloadCache
+from .file_hasher import FileHasher
+from .future_resolver import FutureResolver
 from .git_existing_checkout_resolver import GitExistingCheckoutResolver
-from .git import Git
 from .git_checkout_resolver import GitCheckoutResolver
+from .git_copy_checkout import GitCopyCheckout
 from .git_resolver import GitResolver
 from .git_semver_resolver import GitSemverResolver
+from .git_shared_checkout import GitSharedCheckout
+from .git_mirror import GitMirror
 from .git_url_parser import GitUrlParser
 from .git_url_rewriter import GitUrlRewriter
 from .http_resolver import HttpResolver
 from .lock_path_cache import LockPathCache
+from .lock_verifier import LockVerifier
+from .lock_resolver import LockResolver
 from .lock_version_cache import LockVersionCache
 from .mandatory_options import MandatoryOptions
 from .mandatory_resolver import MandatoryResolver
+from .offline_resolver import OfflineResolver
 from .on_active_store_path_resolver import OnActiveStorePathResolver
 from .on_passive_load_path_resolver import OnPassiveLoadPathResolver
 from .options import Options
 from .path_resolver import PathResolver
 from .post_resolve_run import PostResolveRun
+from .registry_profiler import RegistryProfiler
+from .resolve_fingerprint import ResolveFingerprint
+from .resolve_manifest import ResolveManifest
+from .resolve_tracer import ResolveTracer
+from .resolve_json_reader import ResolveJsonReader
 from .semver_selector import SemverSelector
 from .store_lock_path_resolver import StoreLockPathResolver
 from .store_lock_version_resolver import StoreLockVersionResolver
+from .trace_resolver import TraceResolver
 from .try_resolver import TryResolver
 from .url_download import UrlDownload
 
@@ -115,6 +132,10 @@ class Registry(object):
             self.once = once
             self.data = {}
 
+            # The registry generation where the cached value of a cache once
+            # provider was last checked, see Registry.generation
+            self.generation = None
+
     # Dictionary containing the provider functions registered
     # using the @Registry.provide decorator
     providers = {}
@@ -146,6 +167,27 @@ class Registry(object):
         # passed to require(...) to find the right cached response.
         self._cache = {}
 
+        # Dictionary which contains the names of the arguments for the
+        # provider functions. This is the dependency graph of the
+        # providers. The arguments are found when a provider function is
+        # added, so we do not have to inspect the function on every
+        # require(...)
+        self.arguments = {}
+
+        # Counter incremented every time a provider is added or removed.
+        # The values injected into a cache once provider can only change if
+        # the providers change, so while the generation is unchanged the
+        # cached value can be returned without injecting the arguments.
+        self.generation = 0
+
+        # The RegistryProfiler recording how the providers are used, None if
+        # not profiling
+        self.profiler = None
+
+        # The ResolveTracer used to trace the resolvers returned by the
+        # providers, None if not tracing
+        self.tracer = None
+
         # Set which contains the name of features that should be cached
         if use_cache_providers:
             for s in Registry.cache_providers:
@@ -169,7 +211,7 @@ class Registry(object):
         for provider_name in self._cache:
             self._cache[provider_name].data = {}
 
-    def __inject_arguments(self, provider_function):
+    def __inject_arguments(self, provider_name, provider_function):
         """Based on function signature prepare arguments.
 
         This function takes as input a function object, based on the
@@ -177,44 +219,49 @@ class Registry(object):
         to call the function. The arguments values are found in the
         registry.
 
+        :param provider_name: The name of the provider as a string
         :param provider_function: The function object which we would
            like to call
         :return: Dictionary containing the arguments and corresponding values.
         """
 
         inject_arguments = {}
-        require_arguments = inspect.getfullargspec(provider_function)[0]
 
-        for argument in require_arguments:
+        for argument in self.arguments[provider_name]:
             if argument == "registry":
                 inject_arguments[argument] = self
                 continue
 
-            if argument not in self:
+            try:
+                call = self.registry[argument]
+            except KeyError:
                 raise RegistryInjectError(
                     provider_function=provider_function, missing_provider=argument
                 )
 
-            inject_arguments[argument] = self.require(argument)
+            inject_arguments[argument] = self.__call(argument, call)
 
         return inject_arguments
 
-    def __hash_arguments(self, arguments):
+    def __hash_arguments(self, provider_name, arguments):
         """
-        Provides a hash of the arguments to be passed to a provider function.
+        Provides a key for the arguments to be passed to a provider function.
 
-        The hash is used to make sure the registry provides stable cached
-        results.
+        The key is used to make sure the registry provides stable cached
+        results. Objects are compared by their hash, which for the objects
+        built by the registry is based on their identity. Only containers
+        are compared by their content.
         """
 
-        hash_dict = {}
-        for k, v in arguments.items():
-            if isinstance(v, (list, tuple, dict, set)):
-                hash_dict[k] = hash(json.dumps(v, sort_keys=True))
+        key = []
+        for name in self.arguments[provider_name]:
+            value = arguments[name]
+            if isinstance(value, (list, tuple, dict, set)):
+                key.append(json.dumps(value, sort_keys=True))
             else:
-                hash_dict[k] = hash(v)
+                key.append(hash(value))
 
-        return hash(json.dumps(hash_dict, sort_keys=True))
+        return tuple(key)
 
     def provide_function(self, provider_name, provider_function, override=False):
         """
@@ -232,30 +279,60 @@ class Registry(object):
             raise RegistryProviderError(provider_name)
 
         def call():
+            provider = self._cache.get(provider_name, None)
+
+            if provider is None:
+                inject_arguments = self.__inject_arguments(
+                    provider_name=provider_name, provider_function=provider_function
+                )
+                return provider_function(**inject_arguments)
+
+            if (
+                provider.once
+                and provider.data
+                and provider.generation == self.generation
+            ):
+                # The providers have not changed since the cached value was
+                # checked, so the arguments cannot have changed either
+                if self.profiler:
+                    self.profiler.hit(provider_name)
+
+                return next(iter(provider.data.values()))
+
+            generation = self.generation
+
             inject_arguments = self.__inject_arguments(
-                provider_function=provider_function
+                provider_name=provider_name, provider_function=provider_function
             )
 
             # Did we already cache?
-            if provider_name in self._cache:
-                key = self.__hash_arguments(inject_arguments)
+            key = self.__hash_arguments(
+                provider_name=provider_name, arguments=inject_arguments
+            )
 
-                provider = self._cache[provider_name]
+            try:
+                result = provider.data[key]
 
-                try:
-                    return provider.data[key]
-                except KeyError:
-                    if provider.once and len(provider.data) > 0:
-                        raise RegistryCacheOnceError(provider_name, provider_function)
+                if self.profiler:
+                    self.profiler.hit(provider_name)
+            except KeyError:
+                if provider.once and len(provider.data) > 0:
+                    raise RegistryCacheOnceError(provider_name, provider_function)
+
+                if self.profiler:
+                    self.profiler.miss(provider_name)
 
-                    result = provider_function(**inject_arguments)
-                    provider.data[key] = result
-                    return result
-            else:
                 result = provider_function(**inject_arguments)
-                return result
+                provider.data[key] = result
 
+            provider.generation = generation
+            return result
+
+        self.arguments[provider_name] = tuple(
+            inspect.getfullargspec(provider_function)[0]
+        )
         self.registry[provider_name] = call
+        self.generation += 1
 
         if provider_name in self._cache:
             # Clean the cache
@@ -281,19 +358,50 @@ class Registry(object):
         def call():
             return value
 
+        self.arguments[provider_name] = ()
         self.registry[provider_name] = call
+        self.generation += 1
 
     def require(self, provider_name):
         """
         :param provider_name: The name of the provider as a string
         """
-        if inspect.isclass(provider_name):
-            provider_name = provider_name.__name__
-        if inspect.isfunction(provider_name):
+        if not isinstance(provider_name, str):
+            # A class or function may be passed instead of the name
             provider_name = provider_name.__name__
 
         call = self.registry[provider_name]
-        return call()
+        return self.__call(provider_name, call)
+
+    def __call(self, provider_name, call):
+        if self.profiler is None:
+            value = call()
+        else:
+            with self.profiler.require(provider_name):
+                value = call()
+
+        if self.tracer is None:
+            return value
+
+        return self.__trace(value)
+
+    def __trace(self, value):
+        """Traces the resolvers provided while building a dependency's chain.
+
+        Every resolver passes through here, so a new resolver provider is
+        traced without having to wrap it explicitly.
+        """
+        if isinstance(value, TraceResolver):
+            return value
+
+        if not callable(getattr(value, "resolve", None)):
+            return value
+
+        if "dependency" not in self.registry:
+            return value
+
+        dependency = self.registry["dependency"]()
+        return self.tracer.trace(resolver=value, dependency=dependency)
 
     def remove(self, provider_name):
         """
@@ -304,6 +412,8 @@ class Registry(object):
 
         # The provider must exist in the registry
         del self.registry[provider_name]
+        del self.arguments[provider_name]
+        self.generation += 1
 
     def __contains__(self, provider_name):
         """
@@ -412,23 +522,49 @@ def dependency_cache():
 
 @Registry.cache_once
 @Registry.provide
-def lock_cache_from(git, configuration, project_path):
+def lock_cache_from(git, configuration, project_path, file_hasher):
     resolver_chain = configuration.resolver_chain()
     if resolver_chain == Configuration.RESOLVE_FROM_PATH_LOCK:
         return LockPathCache.create_from_file(cwd=project_path)
     elif resolver_chain == Configuration.RESOLVE_FROM_VERSION_LOCK:
-        return LockVersionCache.create_from_file(git=git, cwd=project_path)
+        return LockVersionCache.create_from_file(
+            git=git, cwd=project_path, file_hasher=file_hasher
+        )
     else:
         raise WurfError(f"Lock cache not available for {resolver_chain} chain")
 
 
 @Registry.cache_once
 @Registry.provide
-def lock_cache_to(git, configuration: Configuration):
+def lock_cache_verify(git, project_path, file_hasher):
+    # Same precedence as Configuration.resolver_chain()
+    if os.path.isfile(os.path.join(project_path, LockPathCache.LOCK_FILE)):
+        return LockPathCache.create_from_file(cwd=project_path)
+    elif os.path.isfile(os.path.join(project_path, LockVersionCache.LOCK_FILE)):
+        return LockVersionCache.create_from_file(
+            git=git, cwd=project_path, file_hasher=file_hasher
+        )
+    else:
+        raise WurfError(
+            f"No lock file found in {project_path}, expected "
+            f"{LockPathCache.LOCK_FILE} or {LockVersionCache.LOCK_FILE}"
+        )
+
+
+@Registry.cache_once
+@Registry.provide
+def from_lock_names():
+    """Return the names of the dependencies resolved from the lock file."""
+    return []
+
+
+@Registry.cache_once
+@Registry.provide
+def lock_cache_to(git, configuration: Configuration, file_hasher):
     if configuration.lock_paths():
         return LockPathCache.create_empty()
-    elif configuration.lock_versions():
-        return LockVersionCache.create_empty(git=git)
+    elif configuration.lock_versions() or configuration.update_lock():
+        return LockVersionCache.create_empty(git=git, file_hasher=file_hasher)
     else:
         raise WurfError("Lock cache not available")
 
@@ -517,8 +653,80 @@ def project_git_protocol(git, ctx, git_url_parser):
 @Registry.cache_once
 @Registry.provide
 def git(git_binary, ctx):
-    """The Git object, which is used to run git commands."""
-    return Git(git_binary=git_binary, ctx=ctx)
+    """The Git object, which is used to run git commands.
+
+    The read-only queries are cached per repository to avoid running git
+    repeatedly.
+    """
+    return CachedGit(git_binary=git_binary, ctx=ctx)
+
+
+@Registry.cache_once
+@Registry.provide
+def git_checkout_strategy(git, options):
+    """Return the strategy used to create the checkout folders."""
+    if options.checkout_strategy() == "shared":
+        return GitSharedCheckout(git=git)
+    else:
+        return GitCopyCheckout(git=git)
+
+
+@Registry.provide
+def offline(options):
+    """Return True if the network should not be accessed."""
+    return options.offline()
+
+
+@Registry.cache_once
+@Registry.provide
+def offline_misses():
+    """Return the dependencies which were not available offline."""
+    return []
+
+
+@Registry.cache_once
+@Registry.provide
+def revalidate_http(options):
+    """Return True if downloaded http dependencies should be revalidated."""
+    return options.revalidate_http()
+
+
+@Registry.cache_once
+@Registry.provide
+def resolve_tracer(options):
+    """Return the ResolveTracer provider or None if we do not trace."""
+    path = options.resolve_trace()
+    if not path:
+        return None
+
+    return ResolveTracer(path=path)
+
+
+@Registry.cache_once
+@Registry.provide
+def git_mirror(git, ctx, git_url_parser, config_file):
+    """Return the GitMirror provider or None if no mirror store is used."""
+    if not config_file.mirror_path:
+        return None
+
+    return GitMirror(
+        git=git,
+        ctx=ctx,
+        git_url_parser=git_url_parser,
+        mirror_path=config_file.mirror_path,
+    )
+
+
+@Registry.cache_once
+@Registry.provide
+def download_cache(url_download, config_file):
+    """Return the DownloadCache or None if no download cache is used."""
+    if not config_file.download_cache_path:
+        return None
+
+    return DownloadCache(
+        url_download=url_download, cache_path=config_file.download_cache_path
+    )
 
 
 @Registry.cache_once
@@ -583,23 +791,53 @@ def post_resolve_run(current_resolver, ctx, run_command, dependency_path):
 
 
 @Registry.provide
-def git_resolver(git, ctx, dependency, git_url_rewriter, dependency_path):
+def git_resolver(
+    registry,
+    git,
+    ctx,
+    dependency,
+    git_url_rewriter,
+    dependency_path,
+    git_mirror,
+    offline,
+):
     """Builds a GitResolver instance.
 
     :param registry: A Registry instance.
     """
-    return GitResolver(
+    # Pass the checkout if it is known, such that we can skip pulling
+    # tags and commits which are already available
+    if "checkout" in registry:
+        checkout = registry.require("checkout")
+    elif dependency.method == "checkout":
+        checkout = dependency.checkout
+    else:
+        checkout = None
+
+    resolver = GitResolver(
         git=git,
         ctx=ctx,
         dependency=dependency,
         git_url_rewriter=git_url_rewriter,
         cwd=dependency_path,
+        git_mirror=git_mirror,
+        checkout=checkout,
+        offline=offline,
     )
 
+    return resolver
+
 
 @Registry.provide
 def git_checkout_resolver(
-    registry, git, git_resolver, ctx, dependency, dependency_path
+    registry,
+    git,
+    git_resolver,
+    ctx,
+    dependency,
+    dependency_path,
+    git_checkout_strategy,
+    offline,
 ):
     """Builds a GitResolver instance.
 
@@ -610,19 +848,29 @@ def git_checkout_resolver(
     else:
         checkout = dependency.checkout
 
-    return GitCheckoutResolver(
+    resolver = GitCheckoutResolver(
         git=git,
         resolver=git_resolver,
         ctx=ctx,
         dependency=dependency,
         checkout=checkout,
         cwd=dependency_path,
+        checkout_strategy=git_checkout_strategy,
+        offline=offline,
     )
 
+    return resolver
+
 
 @Registry.provide
 def git_existing_checkout_resolver(
-    registry, ctx, git, dependency, git_checkout_resolver, dependency_path
+    registry,
+    ctx,
+    git,
+    dependency,
+    git_checkout_resolver,
+    dependency_path,
+    offline,
 ):
     """Builds a GitResolver instance.
 
@@ -634,15 +882,18 @@ def git_existing_checkout_resolver(
     else:
         checkout = dependency.checkout
 
-    return GitExistingCheckoutResolver(
+    resolver = GitExistingCheckoutResolver(
         ctx=ctx,
         git=git,
         dependency=dependency,
         resolver=git_checkout_resolver,
         checkout=checkout,
         cwd=dependency_path,
+        offline=offline,
     )
 
+    return resolver
+
 
 @Registry.provide
 def resolve_git_checkout(git_existing_checkout_resolver, dependency):
@@ -701,24 +952,35 @@ def resolve_git_semver(registry, dependency):
 
 @Registry.provide
 def git_semver_resolver(
-    git, git_resolver, ctx, semver_selector, dependency, dependency_path
+    git,
+    git_resolver,
+    ctx,
+    semver_selector,
+    dependency,
+    dependency_path,
+    git_checkout_strategy,
+    offline,
 ):
     """Builds a GitResolver instance.
 
     :param registry: A Registry instance.
     """
-    return GitSemverResolver(
+    resolver = GitSemverResolver(
         ctx=ctx,
         git=git,
         resolver=git_resolver,
         semver_selector=semver_selector,
         dependency=dependency,
         cwd=dependency_path,
+        checkout_strategy=git_checkout_strategy,
+        offline=offline,
     )
 
+    return resolver
+
 
 @Registry.provide
-def resolve_git(registry, options, dependency):
+def resolve_git(registry, options, dependency, dependency_path):
     """Builds git resolvers
 
     :param registry: A Registry instance.
@@ -742,7 +1004,10 @@ def resolve_git(registry, options, dependency):
     if resolver_key is None:
         raise WurfError(f"Unknown git resolver method {method}")
 
-    return registry.require(resolver_key)
+    resolver = registry.require(resolver_key)
+
+    # Other waf processes may resolve the dependency in the same folder
+    return LockResolver(resolver=resolver, lock_path=dependency_path + ".lock")
 
 
 @Registry.cache
@@ -753,14 +1018,26 @@ def resolve_http(
     url_download,
     dependency,
     dependency_path,
+    offline,
+    download_cache,
+    revalidate_http,
 ):
     dependency.resolver_action = "http"
 
+    # A tar archive is extracted while it is downloaded
+    stream_path = None
+    if dependency.extract:
+        stream_path = os.path.join(dependency_path, "streamed")
+
     resolver = HttpResolver(
         ctx,
         url_download=url_download,
         dependency=dependency,
         cwd=dependency_path,
+        offline=offline,
+        download_cache=download_cache,
+        revalidate=revalidate_http,
+        stream_path=stream_path,
     )
 
     if dependency.extract:
@@ -769,9 +1046,11 @@ def resolve_http(
             archive_extractor=archive_extractor,
             resolver=resolver,
             cwd=dependency_path,
+            stream_path=stream_path,
         )
 
-    return resolver
+    # Other waf processes may resolve the dependency in the same folder
+    return LockResolver(resolver=resolver, lock_path=dependency_path + ".lock")
 
 
 @Registry.provide
@@ -795,13 +1074,14 @@ def resolve_locked_path(lock_cache_from: LockPathCache, dependency):
 
 @Registry.provide
 def on_passive_load_path_resolver(
-    ctx, git, resolve_config_path, dependency, resolve_path
+    ctx, git, resolve_config_path, dependency, resolve_path, resolve_manifest
 ):
     resolver = OnPassiveLoadPathResolver(
         git=git,
         dependency=dependency,
         resolve_config_path=resolve_config_path,
         resolve_path=resolve_path,
+        resolve_manifest=resolve_manifest,
     )
 
     return TryResolver(
@@ -860,6 +1140,7 @@ def source_resolver(ctx, registry, dependency):
             resolver = registry.require("post_resolve")
 
     resolver = TryResolver(resolver=resolver, ctx=ctx, dependency=dependency)
+
     return MandatoryResolver(
         resolver=resolver, msg="Dependency failed.", dependency=dependency
     )
@@ -867,13 +1148,19 @@ def source_resolver(ctx, registry, dependency):
 
 @Registry.provide
 def resolve_chain(
-    ctx, options, registry, dependency, resolve_config_path, symlinks_path
+    ctx,
+    options,
+    registry,
+    dependency,
+    resolve_config_path,
+    symlinks_path,
+    resolve_manifest,
 ):
     # Set the resolver chain on the dependency
     dependency.resolver_chain = "Resolve"
 
     if options.path(dependency=dependency):
-        if options.lock_versions():
+        if options.lock_versions() or options.update_lock():
             raise WurfError(
                 f'A user path has been specified for "{dependency.name}". '
                 "Setting a user path is not supported when locking versions."
@@ -892,9 +1179,11 @@ def resolve_chain(
             resolver = registry.require("source_resolver")
 
     if "from_lock" in dependency and dependency.from_lock:
-        lock_cache_from = registry.require("lock_cache_from")
         resolver = CheckLockCacheResolver(
-            resolver=resolver, lock_cache_from=lock_cache_from, dependency=dependency
+            resolver=resolver,
+            lock_cache_from=registry.require("lock_cache_from"),
+            dependency=dependency,
+            from_lock_names=registry.require("from_lock_names"),
         )
 
     resolver = CreateSymlinkResolver(
@@ -905,6 +1194,7 @@ def resolve_chain(
         resolver=resolver,
         dependency=dependency,
         resolve_config_path=resolve_config_path,
+        resolve_manifest=resolve_manifest,
     )
 
     return resolver
@@ -927,8 +1217,61 @@ def store_lock_path_resolver(store_resolver, dependency, project_path, lock_cach
     )
 
 
+@Registry.cache_once
 @Registry.provide
-def resolve_from_version_lock_chain(registry, lock_cache_from, dependency):
+def update_lock_names(registry, configuration, options):
+    """Return the names passed to --update_lock.
+
+    The names are checked against the lock file, such that unknown names are
+    reported before resolving.
+    """
+    if configuration.resolver_chain() != Configuration.RESOLVE_FROM_VERSION_LOCK:
+        raise WurfError(
+            "Updating the lock file requires a lock_version_resolve.json "
+            "file. Use --lock_versions to create it."
+        )
+
+    lock_cache_from = registry.require("lock_cache_from")
+
+    unknown = [n for n in options.update_lock() if n not in lock_cache_from.cache]
+
+    if unknown:
+        raise WurfError(
+            f"Unknown dependencies passed to --update_lock: {', '.join(unknown)}"
+        )
+
+    return options.update_lock()
+
+
+@Registry.provide
+def update_lock_version_resolver(
+    store_resolver, dependency, lock_cache_to, lock_cache_from
+):
+    return StoreLockVersionResolver(
+        resolver=store_resolver,
+        lock_cache_to=lock_cache_to,
+        dependency=dependency,
+        lock_cache_from=lock_cache_from,
+    )
+
+
+@Registry.provide
+def resolve_from_version_lock_chain(
+    registry, lock_cache_from, dependency, configuration, options
+):
+    if configuration.update_lock() and (
+        dependency.name in options.update_lock()
+        or dependency not in lock_cache_from
+        or lock_cache_from.check_sha1(dependency=dependency)
+    ):
+        # The dependency is resolved again, since it was passed to
+        # --update_lock or it was added or changed by an updated dependency.
+        # So we do not use the version from the lock file.
+        dependency.from_lock = False
+        dependency.locked_version = None
+        dependency.resolver_info = None
+        return registry.require("resolve_chain")
+
     dependency.from_lock = True
     with registry.provide_temporary() as temporary:
         if dependency.resolver == "git":
@@ -952,8 +1295,8 @@ def resolve_from_path_lock_chain(registry, lock_cache_from, dependency):
 
 
 @Registry.provide
-def dependency_resolver(registry, ctx, configuration: Configuration, dependency):
-    """Builds a ContextMsgResolver instance."""
+def dependency_chain(registry, configuration: Configuration, dependency):
+    """Builds the resolver chain for the dependency."""
 
     # This is where we "wire" together the resolvers. Which actually do the
     # work of via some method obtaining a path to a dependency.
@@ -989,8 +1332,37 @@ def dependency_resolver(registry, ctx, configuration: Configuration, dependency)
         with registry.provide_temporary() as temporary:
             temporary.provide_value("store_resolver", resolver)
             resolver = registry.require("store_lock_version_resolver")
+    elif configuration.update_lock():
+        registry.require("update_lock_names")
+        with registry.provide_temporary() as temporary:
+            temporary.provide_value("store_resolver", resolver)
+            resolver = registry.require("update_lock_version_resolver")
 
-    return ContextMsgResolver(resolver=resolver, ctx=ctx, dependency=dependency)
+    return resolver
+
+
+@Registry.provide
+def dependency_resolver(registry, ctx, dependency, offline):
+    """Builds a ContextMsgResolver instance."""
+
+    # If the dependency chain was already started ahead of time, we just
+    # wait for the result
+    if "resolve_future" in registry:
+        future = registry.require("resolve_future")
+        resolver = FutureResolver(future=future)
+    else:
+        resolver = registry.require("dependency_chain")
+
+    if offline:
+        resolver = OfflineResolver(
+            resolver=resolver,
+            dependency=dependency,
+            offline_misses=registry.require("offline_misses"),
+        )
+
+    resolver = ContextMsgResolver(resolver=resolver, ctx=ctx, dependency=dependency)
+
+    return resolver
 
 
 @Registry.cache_once
@@ -1004,6 +1376,40 @@ def configuration(options, args, project_path, waf_lock_file):
     )
 
 
+@Registry.cache_once
+@Registry.provide
+def resolve_fingerprint(args, project_path, resolve_config_path):
+    # The files which are inputs to every resolve, the files read while
+    # resolving are added by the resolve context
+    files = [
+        os.path.join(project_path, LockPathCache.LOCK_FILE),
+        os.path.join(project_path, LockVersionCache.LOCK_FILE),
+        LOCAL_CONFIG_FILE,
+        USER_CONFIG_FILE,
+    ]
+
+    return ResolveFingerprint(
+        args=args, files=files, resolve_config_path=resolve_config_path
+    )
+
+
+@Registry.cache_once
+@Registry.provide
+def resolve_manifest(resolve_config_path):
+    return ResolveManifest(resolve_config_path=resolve_config_path)
+
+
+@Registry.provide
+def resolve_json_reader(registry, ctx, git, options, configuration):
+    return ResolveJsonReader(
+        registry=registry,
+        ctx=ctx,
+        git=git,
+        options=options,
+        configuration=configuration,
+    )
+
+
 @Registry.provide
 def dependency_manager(registry):
     # Clean the cache such that we get "fresh" objects
@@ -1014,6 +1420,16 @@ def dependency_manager(registry):
     dependency_cache = registry.require("dependency_cache")
     options = registry.require("options")
     skip_internal = registry.require("skip_internal")
+    configuration = registry.require("configuration")
+
+    # Only the chains fetching dependencies benefit from resolving on
+    # multiple threads
+    if configuration.choose_resolve():
+        resolve_jobs = options.resolve_jobs()
+        resolve_json_reader = registry.require("resolve_json_reader")
+    else:
+        resolve_jobs = 1
+        resolve_json_reader = None
 
     return DependencyManager(
         registry=registry,
@@ -1022,6 +1438,8 @@ def dependency_manager(registry):
         git=git,
         options=options,
         skip_internal=skip_internal,
+        resolve_jobs=resolve_jobs,
+        resolve_json_reader=resolve_json_reader,
     )
 
 
@@ -1034,12 +1452,185 @@ def resolve_lock_action(lock_cache_to, project_path):
 
 
 @Registry.provide
-def post_resolver_actions(registry, configuration: Configuration):
+def update_lock_action(ctx, options, lock_cache_to, project_path):
+    def action():
+        # The names were in the lock file before resolving, see
+        # update_lock_names(...). All resolved dependencies are in the new
+        # lock file, so a name which is not is no longer used.
+        unknown = [n for n in options.update_lock() if n not in lock_cache_to.cache]
+
+        if unknown:
+            ctx.fatal(
+                f"Dependencies passed to --update_lock were not resolved: "
+                f"{', '.join(unknown)}"
+            )
+
+        lock_cache_to.write_to_file(cwd=project_path)
+
+    return action
+
+
+@Registry.cache_once
+@Registry.provide
+def file_hasher(resolve_config_path):
+    """Return the FileHasher used to hash the content of http dependencies."""
+    return FileHasher(
+        cache_path=os.path.join(resolve_config_path, FileHasher.CACHE_FILE)
+    )
+
+
+@Registry.provide
+def file_hasher_action(file_hasher):
+    def action():
+        file_hasher.write()
+
+    return action
+
+
+@Registry.provide
+def git_cache_action(git):
+    def action():
+        # The git provider may be replaced e.g. in the tests
+        if isinstance(git, CachedGit):
+            git.write()
+
+    return action
+
+
+@Registry.provide
+def lock_verifier(lock_cache_verify, resolve_manifest, resolve_config_path):
+    return LockVerifier(
+        lock_cache=lock_cache_verify,
+        resolve_manifest=resolve_manifest,
+        resolve_config_path=resolve_config_path,
+    )
+
+
+@Registry.provide
+def lock_verifier_from(lock_cache_from, resolve_manifest, resolve_config_path):
+    return LockVerifier(
+        lock_cache=lock_cache_from,
+        resolve_manifest=resolve_manifest,
+        resolve_config_path=resolve_config_path,
+    )
+
+
+@Registry.provide
+def check_lock_action(ctx, registry, from_lock_names):
+    def action():
+        if not from_lock_names:
+            return
+
+        verifier = registry.require("lock_verifier_from")
+        report = verifier.verify(names=from_lock_names)
+
+        errors = [
+            LockVerifier.format_result(name=name, result=result)
+            for name, result in sorted(report["dependencies"].items())
+            if result["status"] != "match"
+        ]
+
+        if errors:
+            ctx.fatal("\n".join(errors))
+
+    return action
+
+
+@Registry.provide
+def verify_lock_action(ctx, registry, file_hasher):
+    def action():
+        try:
+            verifier = registry.require("lock_verifier")
+        except WurfError as e:
+            ctx.fatal(str(e))
+
+        report = verifier.verify()
+        path = verifier.write(report=report)
+
+        # Store the digests before failing, such that the files are not read
+        # again the next time we verify
+        file_hasher.write()
+
+        for name, result in sorted(report["dependencies"].items()):
+            if result["status"] == "match":
+                continue
+
+            ctx.msg(f'Verify lock "{name}"', result["status"], color="RED")
+            ctx.to_log(f"wurf: Verify lock {name}: {result}")
+
+        summary = report["summary"]
+        ctx.msg(
+            "Verify lock",
+            f'{summary["match"]} match, {summary["mismatch"]} mismatch, '
+            f'{summary["missing"]} missing',
+            color="GREEN" if report["status"] == "match" else "RED",
+        )
+        ctx.msg("Verify lock report", path)
+
+        if report["status"] != "match":
+            ctx.fatal(f"The dependencies do not match the lock file, see {path}")
+
+    return action
+
+
+@Registry.provide
+def offline_action(ctx, offline_misses):
+    def action():
+        if not offline_misses:
+            return
+
+        lines = [f'\n    "{d.name}": {d.offline_miss}' for d in offline_misses]
+
+        ctx.fatal(
+            f"{len(offline_misses)} dependencies are not available offline, "
+            "resolve them once without --offline:" + "".join(lines)
+        )
+
+    return action
+
+
+@Registry.provide
+def resolve_manifest_action(resolve_manifest):
+    def action():
+        resolve_manifest.write()
+
+    return action
+
+
+@Registry.provide
+def post_resolver_actions(registry, options, configuration: Configuration):
     actions = []
 
+    if options.offline():
+        # Report all dependencies which were not available before storing
+        # anything
+        actions.append(registry.require("offline_action"))
+
+    if configuration.resolver_chain() in [
+        Configuration.RESOLVE_FROM_PATH_LOCK,
+        Configuration.RESOLVE_FROM_VERSION_LOCK,
+    ]:
+        # Verify the dependencies resolved from the lock file before
+        # storing anything
+        actions.append(registry.require("check_lock_action"))
+
+    if configuration.choose_resolve():
+        actions.append(registry.require("resolve_manifest_action"))
+
     if configuration.lock_paths() or configuration.lock_versions():
         actions.append(registry.require("resolve_lock_action"))
 
+    if configuration.update_lock():
+        actions.append(registry.require("update_lock_action"))
+
+    if configuration.choose_resolve():
+        actions.append(registry.require("file_hasher_action"))
+
+    actions.append(registry.require("git_cache_action"))
+
+    if configuration.verify_lock():
+        actions.append(registry.require("verify_lock_action"))
+
     return actions
 
 
@@ -1082,6 +1673,10 @@ def resolve_registry(
     """
     registry = Registry()
 
+    profile_path = os.environ.get(RegistryProfiler.ENVIRONMENT_VARIABLE, None)
+    if profile_path:
+        registry.profiler = RegistryProfiler(path=profile_path)
+
     registry.provide_value("ctx", ctx)
     registry.provide_value("git_binary", git_binary)
     registry.provide_value("default_resolve_path", default_resolve_path)
@@ -0,0 +1,126 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import json
+import time
+import threading
+import contextlib
+
+
+class RegistryProfiler(object):
+    """Records how the providers of a Registry are used.
+
+    For every provider the profiler counts the number of require(...) calls
+    and, for cached providers, the number of cache hits and misses. The
+    cumulative time includes the time spent requiring the arguments of the
+    provider, while the exclusive time only includes the time spent in the
+    provider itself.
+
+    The profiler is enabled by setting the WURF_REGISTRY_PROFILE environment
+    variable to the path of the report e.g.:
+
+        WURF_REGISTRY_PROFILE=profile.json python waf configure
+    """
+
+    ENVIRONMENT_VARIABLE = "WURF_REGISTRY_PROFILE"
+
+    def __init__(self, path):
+        """Construct an instance.
+
+        :param path: The path to the report as a string.
+        """
+        self.path = path
+        self.stats = {}
+
+        # The providers may be required from multiple threads
+        self.lock = threading.Lock()
+
+        # The stack of the time spent in nested requires per thread
+        self.local = threading.local()
+
+    @contextlib.contextmanager
+    def require(self, provider_name):
+        """Records the time spent requiring a provider in the with block.
+
+        :param provider_name: The name of the provider as a string.
+        """
+        stack = self.__stack()
+
+        # The time spent in the requires nested in this one
+        stack.append(0.0)
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            nested = stack.pop()
+
+            if stack:
+                stack[-1] += duration
+
+            with self.lock:
+                entry = self.__entry(provider_name)
+                entry["calls"] += 1
+                entry["time"] += duration
+                entry["exclusive_time"] += duration - nested
+
+    def hit(self, provider_name):
+        """Records that a cached value was returned.
+
+        :param provider_name: The name of the provider as a string.
+        """
+        with self.lock:
+            self.__entry(provider_name)["hits"] += 1
+
+    def miss(self, provider_name):
+        """Records that a cached provider had to create a value.
+
+        :param provider_name: The name of the provider as a string.
+        """
+        with self.lock:
+            self.__entry(provider_name)["misses"] += 1
+
+    def report(self):
+        """Returns the recorded statistics.
+
+        :return: A list of dicts with the "provider" name, the number of
+            "calls", "hits" and "misses" and the cumulative "time" and
+            "exclusive_time" in seconds. The list is sorted by the exclusive
+            time, longest first.
+        """
+        with self.lock:
+            entries = [dict(entry) for entry in self.stats.values()]
+
+        return sorted(entries, key=lambda e: e["exclusive_time"], reverse=True)
+
+    def write(self):
+        """Writes the report to the report file."""
+        with open(self.path, "w") as report_file:
+            json.dump(self.report(), report_file, indent=4)
+
+    def __entry(self, provider_name):
+        try:
+            return self.stats[provider_name]
+        except KeyError:
+            entry = {
+                "provider": provider_name,
+                "calls": 0,
+                "hits": 0,
+                "misses": 0,
+                "time": 0.0,
+                "exclusive_time": 0.0,
+            }
+            self.stats[provider_name] = entry
+            return entry
+
+    def __stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, {"path": self.path})
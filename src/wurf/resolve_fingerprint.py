@@ -0,0 +1,232 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import json
+import hashlib
+import collections
+
+
+class ResolveFingerprint(object):
+    """Fingerprint of the inputs used when resolving the dependencies.
+
+    After a successful resolve we store the fingerprint together with the
+    dependency cache. If the inputs have not changed the next time we
+    resolve, the stored dependency cache can be used directly without
+    running git or accessing the network.
+
+    The fingerprint covers:
+
+    - The command-line arguments, except the ones which do not change the
+      result of the resolve.
+    - The content of the files read during the resolve, i.e. the wscripts and
+      resolve.json files, the lock files and the config files.
+    - The commit currently checked out in each of the resolved dependencies.
+    """
+
+    FINGERPRINT_FILE = "resolve_fingerprint.json"
+
+    VERSION = 1
+
+    # Options that do not change the result of a resolve
+    IGNORED_OPTIONS = [
+        "--resolve_jobs",
+        "--force_resolve",
+        "--resolve_trace",
+        "--revalidate_http",
+    ]
+
+    def __init__(self, args, files, resolve_config_path):
+        """Construct an instance.
+
+        :param args: The command-line arguments passed as a list.
+        :param files: List of paths to files which are always part of the
+            fingerprint, e.g. the lock files. The files do not have to exist.
+        :param resolve_config_path: A string containing the path to where the
+            fingerprint should be / is stored.
+        """
+        self.args = ResolveFingerprint.relevant_args(args)
+        self.files = list(files)
+        self.resolve_config_path = resolve_config_path
+
+    @staticmethod
+    def relevant_args(args):
+        """Returns the arguments that may change the result of a resolve.
+
+        Commands such as "configure" or "build" are not relevant. However,
+        we cannot tell the value of an option apart from a command, so a
+        word following an option is always kept.
+
+        :param args: The command-line arguments passed as a list.
+        :return: The relevant arguments as a list.
+        """
+        relevant = []
+        keep_value = False
+
+        for arg in args:
+            if arg.startswith("-"):
+                name = arg.split("=", 1)[0]
+                keep = name not in ResolveFingerprint.IGNORED_OPTIONS
+
+                if keep:
+                    relevant.append(arg)
+
+                keep_value = keep and "=" not in arg
+
+            elif keep_value:
+                relevant.append(arg)
+                keep_value = False
+
+        return relevant
+
+    def add_file(self, path):
+        """Adds a file read during the resolve to the fingerprint.
+
+        :param path: The path to the file as a string. The file does not
+            have to exist, in which case the fingerprint changes if the
+            file is created.
+        """
+        if path not in self.files:
+            self.files.append(path)
+
+    def load(self):
+        """Loads the result of the previous resolve if it is still valid.
+
+        :return: A tuple with the list of dependencies and the dependency
+            cache from the previous resolve. If there is no stored
+            fingerprint or it does not match the current inputs None is
+            returned.
+        """
+        path = self.__fingerprint_path()
+
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "r") as fingerprint_file:
+                stored = json.load(fingerprint_file)
+        except ValueError:
+            return None
+
+        if stored.get("version", None) != ResolveFingerprint.VERSION:
+            return None
+
+        dependency_cache = collections.OrderedDict(stored["dependency_cache"])
+
+        fingerprint = self.__compute(
+            files=stored["files"], dependency_cache=dependency_cache
+        )
+
+        if fingerprint != stored["fingerprint"]:
+            return None
+
+        return stored["dependencies"], dependency_cache
+
+    def store(self, dependencies, dependency_cache):
+        """Stores the fingerprint after a successful resolve.
+
+        :param dependencies: List of dicts with the "name" and "resolver"
+            of the dependencies added during the resolve.
+        :param dependency_cache: The dependency cache produced by the resolve.
+        """
+        fingerprint = self.__compute(
+            files=self.files, dependency_cache=dependency_cache
+        )
+
+        stored = {
+            "version": ResolveFingerprint.VERSION,
+            "fingerprint": fingerprint,
+            "files": self.files,
+            "dependencies": dependencies,
+            "dependency_cache": list(dependency_cache.items()),
+        }
+
+        with open(self.__fingerprint_path(), "w") as fingerprint_file:
+            json.dump(stored, fingerprint_file, indent=4, sort_keys=True)
+
+    def clear(self):
+        """Removes the stored fingerprint.
+
+        This makes sure an old fingerprint is not used if the resolve fails.
+        """
+        path = self.__fingerprint_path()
+
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def __compute(self, files, dependency_cache):
+        inputs = {
+            "args": self.args,
+            "files": {path: self.__hash_file(path) for path in files},
+            "commits": {
+                name: self.__read_commit(str(entry["path"]))
+                for name, entry in dependency_cache.items()
+            },
+        }
+
+        s = json.dumps(inputs, sort_keys=True)
+        return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+    def __hash_file(self, path):
+        if not os.path.isfile(path):
+            return None
+
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def __read_commit(self, path):
+        """Reads the commit checked out at path without invoking git.
+
+        :param path: The path to the resolved dependency as a string.
+        :return: The commit id or symbolic reference as a string. If path
+            is not a git repository an empty string is returned and if path
+            does not exist None is returned.
+        """
+        if not os.path.exists(path):
+            return None
+
+        git_dir = os.path.join(path, ".git")
+
+        if os.path.isfile(git_dir):
+            # The .git file points to the actual git directory e.g. for
+            # submodules or worktrees
+            with open(git_dir, "r") as f:
+                return f.read().strip()
+
+        head_path = os.path.join(git_dir, "HEAD")
+
+        if not os.path.isfile(head_path):
+            return ""
+
+        with open(head_path, "r") as f:
+            head = f.read().strip()
+
+        if not head.startswith("ref: "):
+            # Detached HEAD, which is the case for tags and commits
+            return head
+
+        ref = head.replace("ref: ", "", 1)
+        ref_path = os.path.join(git_dir, ref)
+
+        if os.path.isfile(ref_path):
+            with open(ref_path, "r") as f:
+                return f"{ref} {f.read().strip()}"
+
+        packed_refs_path = os.path.join(git_dir, "packed-refs")
+
+        if os.path.isfile(packed_refs_path):
+            with open(packed_refs_path, "r") as f:
+                for line in f:
+                    if line.rstrip().endswith(" " + ref):
+                        return f"{ref} {line.split(' ')[0]}"
+
+        return ref
+
+    def __fingerprint_path(self):
+        return os.path.join(self.resolve_config_path, self.FINGERPRINT_FILE)
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
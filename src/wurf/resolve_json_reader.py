@@ -0,0 +1,180 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import re
+import json
+
+from .configuration import Configuration
+from .git_resolver import GitResolver
+
+
+class ResolveJsonReader(object):
+    """Reads the resolve.json file of a dependency while it is being resolved.
+
+    If the dependency is pinned to a specific tag or commit, the file is read
+    directly from the git object store of the already cloned repository. This
+    means that we do not have to wait for the dependency to be checked out.
+    Otherwise we wait for the resolve to finish and read the file from the
+    resolved path.
+    """
+
+    # The files Waf will look for when recursing into a dependency
+    WSCRIPT_FILES = ["wscript", "wscript_resolve"]
+
+    RESOLVE_FILE = "resolve.json"
+
+    def __init__(self, registry, ctx, git, options, configuration):
+        """Construct an instance.
+
+        :param registry: A Registry instance.
+        :param ctx: A Waf Context instance.
+        :param git: A Git instance.
+        :param options: Options instance for collecting / parsing options
+        :param configuration: A Configuration instance.
+        """
+        self.registry = registry
+        self.ctx = ctx
+        self.git = git
+        self.options = options
+        self.configuration = configuration
+
+    def read(self, dependency, future):
+        """Reads the resolve.json of the dependency.
+
+        :param dependency: A Dependency instance.
+        :param future: A concurrent.futures.Future holding the resolved path
+            of the dependency.
+        :return: The list of dependencies in the resolve.json file. If the
+            dependency will not load a resolve.json file an empty list is
+            returned. If the file could not be read None is returned.
+        """
+        resolve_json = self.read_pinned(dependency=dependency)
+
+        if resolve_json is not None:
+            return resolve_json
+
+        try:
+            path = future.result()
+        except Exception:
+            # The error will be reported once the dependency is added
+            return None
+
+        if not path:
+            return []
+
+        return self.__read_from_path(path=path)
+
+    def read_pinned(self, dependency):
+        """Reads the resolve.json of the dependency without resolving it.
+
+        :param dependency: A Dependency instance.
+        :return: The list of dependencies in the resolve.json file. If the
+            dependency will not load a resolve.json file an empty list is
+            returned. If the file cannot be read before the dependency is
+            resolved None is returned.
+        """
+        revision = self.__pinned_revision(dependency=dependency)
+
+        if revision is None:
+            return None
+
+        return self.__read_from_git(dependency=dependency, revision=revision)
+
+    def __read_from_git(self, dependency, revision):
+        with self.registry.provide_temporary() as temporary:
+            temporary.provide_value("dependency", dependency)
+            dependency_path = self.registry.require("dependency_path")
+
+        repo_path = os.path.join(dependency_path, GitResolver.DEFAULT_BRANCH)
+
+        if not os.path.isdir(repo_path):
+            return None
+
+        try:
+            names = self.git.ls_tree(cwd=repo_path, revision=revision)
+
+            if not any(w in names for w in ResolveJsonReader.WSCRIPT_FILES):
+                return []
+
+            if ResolveJsonReader.RESOLVE_FILE not in names:
+                return []
+
+            content = self.git.show(
+                cwd=repo_path, revision=revision, path=ResolveJsonReader.RESOLVE_FILE
+            )
+            return json.loads(content)
+
+        except Exception as e:
+            self.ctx.to_log(
+                f"wurf: ResolveJsonReader could not read {revision} "
+                f"of {dependency.name}: {e}"
+            )
+            return None
+
+    def __read_from_path(self, path):
+        if not any(
+            os.path.isfile(os.path.join(path, w))
+            for w in ResolveJsonReader.WSCRIPT_FILES
+        ):
+            return []
+
+        resolve_json_path = os.path.join(path, ResolveJsonReader.RESOLVE_FILE)
+        if not os.path.isfile(resolve_json_path):
+            return []
+
+        try:
+            with open(resolve_json_path, "r") as resolve_file:
+                return json.load(resolve_file)
+        except ValueError:
+            # The error will be reported once the dependency is recursed
+            return None
+
+    def __pinned_revision(self, dependency):
+        """Returns the revision of the dependency if it cannot change.
+
+        :param dependency: A Dependency instance.
+        :return: The revision as a string or None if the dependency is not
+            pinned to a specific tag or commit.
+        """
+        if dependency.resolver != "git":
+            return None
+
+        if self.options.path(dependency) or self.options.checkout(dependency):
+            return None
+
+        chain = self.configuration.resolver_chain()
+
+        if chain == Configuration.RESOLVE_FROM_VERSION_LOCK:
+            locked_version = dependency.locked_version
+
+            if self.configuration.update_lock() and (
+                locked_version is None
+                or dependency.name in self.options.update_lock()
+                or dependency.sha1 != locked_version.get("sha1", None)
+            ):
+                # The dependency is resolved again when updating the lock
+                # file, so the locked commit may change
+                chain = Configuration.RESOLVE
+
+            elif locked_version is None:
+                return None
+
+            else:
+                return locked_version.get("commit_id", None)
+
+        if chain != Configuration.RESOLVE or dependency.method != "checkout":
+            return None
+
+        if re.match(r"^[0-9a-f]{7,40}$", dependency.checkout):
+            return dependency.checkout
+
+        # A branch may be updated when the repository is pulled, so we only
+        # trust tags
+        return f"refs/tags/{dependency.checkout}"
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
@@ -0,0 +1,135 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import json
+import threading
+
+
+class ResolveManifest(object):
+    """Single file with the resolved configuration of all dependencies.
+
+    When resolving, the OnActiveStorePathResolver stores the configuration
+    of each dependency in a "<name>.resolve.json" file and adds it to the
+    manifest. The manifest is written once the resolve has completed.
+
+    When loading e.g. for "waf build", the OnPassiveLoadPathResolver looks up
+    the dependencies in the manifest, which is read once. So we do not have
+    to open and parse a file per dependency. If the manifest is missing, the
+    "<name>.resolve.json" files are used.
+
+    The manifest is removed before resolving, such that it is not used if
+    the resolve fails.
+    """
+
+    MANIFEST_FILE = "resolve_manifest.json"
+
+    VERSION = 1
+
+    def __init__(self, resolve_config_path):
+        """Construct an instance.
+
+        :param resolve_config_path: A string containing the path to where the
+            manifest should be / is stored.
+        """
+        self.resolve_config_path = resolve_config_path
+
+        # Dict with the configuration of the dependencies, None until the
+        # manifest has been read
+        self.configs = None
+
+        # The dependencies may be resolved from multiple threads
+        self.lock = threading.Lock()
+
+    def add(self, name, config):
+        """Adds the configuration of a resolved dependency.
+
+        :param name: The name of the dependency as a string.
+        :param config: Dict with the configuration of the dependency.
+        """
+        with self.lock:
+            if self.configs is None:
+                self.configs = {}
+
+            self.configs[name] = config
+
+    def config(self, name):
+        """Returns the configuration of a dependency.
+
+        :param name: The name of the dependency as a string.
+        :return: Dict with the configuration of the dependency or None if
+            the dependency is not in the manifest.
+        """
+        with self.lock:
+            if self.configs is None:
+                self.configs = self.__read()
+
+            return self.configs.get(name, None)
+
+    def names(self):
+        """Returns the names of the dependencies in the manifest.
+
+        :return: The names as a sorted list of strings.
+        """
+        with self.lock:
+            if self.configs is None:
+                self.configs = self.__read()
+
+            return sorted(self.configs)
+
+    def write(self):
+        """Writes the manifest to the file-system."""
+        with self.lock:
+            manifest = {
+                "version": ResolveManifest.VERSION,
+                "dependencies": self.configs or {},
+            }
+
+        path = self.__manifest_path()
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        # The manifest is written to a temporary file first, such that a
+        # reader never sees a partially written manifest
+        with open(temp_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, separators=(",", ":"), sort_keys=True)
+
+        os.replace(temp_path, path)
+
+    def clear(self):
+        """Removes the stored manifest."""
+        path = self.__manifest_path()
+
+        if os.path.isfile(path):
+            os.remove(path)
+
+        with self.lock:
+            self.configs = {}
+
+    def __read(self):
+        path = self.__manifest_path()
+
+        if not os.path.isfile(path):
+            return {}
+
+        try:
+            with open(path, "r") as manifest_file:
+                manifest = json.load(manifest_file)
+        except ValueError:
+            return {}
+
+        if manifest.get("version", None) != ResolveManifest.VERSION:
+            return {}
+
+        return manifest["dependencies"]
+
+    def __manifest_path(self):
+        return os.path.join(self.resolve_config_path, ResolveManifest.MANIFEST_FILE)
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (
+            self.__class__.__name__,
+            {"resolve_config_path": self.resolve_config_path},
+        )
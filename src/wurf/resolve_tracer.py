@@ -0,0 +1,190 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import json
+import time
+import threading
+import contextlib
+
+from .trace_resolver import TraceResolver
+
+
+class ResolveTracer(object):
+    """Records the time spent resolving the dependencies.
+
+    The time spent in the resolvers and the commands they run is recorded as
+    spans. The spans can be written as a trace in the Chrome trace event
+    format, which can be opened in e.g. chrome://tracing or
+    https://ui.perfetto.dev. See the format description here:
+
+        https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+
+    Spans are attributed to the dependency of the innermost resolver
+    running on the same thread, such that e.g. the git commands run for a
+    dependency can be summarized.
+    """
+
+    def __init__(self, path):
+        """Construct an instance.
+
+        :param path: The path to the trace file as a string.
+        """
+        self.path = path
+        self.events = []
+        self.start = time.perf_counter()
+
+        # The spans may be recorded from multiple threads
+        self.lock = threading.Lock()
+
+        # The stack of dependency names per thread
+        self.local = threading.local()
+
+    def trace(self, resolver, dependency):
+        """Returns a resolver which records the time spent in resolver.
+
+        :param resolver: The resolver to trace.
+        :param dependency: The Dependency instance being resolved.
+        :return: A TraceResolver instance.
+        """
+        return TraceResolver(resolver=resolver, tracer=self, dependency=dependency)
+
+    @staticmethod
+    def command_name(cmd):
+        """Returns a short name for a command e.g. "git pull".
+
+        :param cmd: The command as a string or a list of arguments.
+        :return: The name as a string.
+        """
+        if isinstance(cmd, str):
+            return cmd
+
+        args = [str(arg) for arg in cmd]
+
+        # Skip the git directory e.g. for "git --git-dir <path> show ..."
+        if len(args) > 3 and args[1] == "--git-dir":
+            args = args[:1] + args[3:]
+
+        return " ".join(args[:2])
+
+    @contextlib.contextmanager
+    def span(self, name, category, dependency=None, args=None):
+        """Records the time spent in the with block as a span.
+
+        :param name: The name of the span as a string.
+        :param category: The category of the span as a string e.g.
+            "resolver" or "command".
+        :param dependency: The name of the dependency being resolved or None
+            to use the dependency of the enclosing span.
+        :param args: Dict with additional information stored with the span.
+        """
+        stack = self.__stack()
+
+        if dependency is None and stack:
+            dependency = stack[-1]
+
+        stack.append(dependency)
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            stop = time.perf_counter()
+            stack.pop()
+
+            event_args = {"dependency": dependency}
+            if args:
+                event_args.update(args)
+
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.start) * 1e6,
+                "dur": (stop - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": event_args,
+            }
+
+            thread_name = threading.current_thread().name
+
+            with self.lock:
+                self.events.append((thread_name, event))
+
+    def summary(self):
+        """Summarizes the time spent per dependency.
+
+        :return: A list of dicts with the "dependency" name, the "resolve"
+            time in seconds, the number of "commands" and the "command_time"
+            in seconds. The list is sorted by the resolve time, longest first.
+        """
+        summary = {}
+
+        with self.lock:
+            events = [event for _, event in self.events]
+
+        for event in events:
+            name = event["args"]["dependency"]
+            if name is None:
+                continue
+
+            entry = summary.setdefault(
+                name,
+                {
+                    "dependency": name,
+                    "resolve": 0.0,
+                    "commands": 0,
+                    "command_time": 0.0,
+                },
+            )
+            duration = event["dur"] / 1e6
+
+            if event["cat"] == "command":
+                entry["commands"] += 1
+                entry["command_time"] += duration
+            else:
+                # The resolvers are nested, so the outermost resolver has
+                # the longest duration
+                entry["resolve"] = max(entry["resolve"], duration)
+
+        return sorted(summary.values(), key=lambda e: e["resolve"], reverse=True)
+
+    def write(self):
+        """Writes the trace to the trace file."""
+        with self.lock:
+            events = list(self.events)
+
+        trace_events = []
+        thread_names = {}
+
+        for thread_name, event in events:
+            thread_names[event["tid"]] = thread_name
+            trace_events.append(event)
+
+        for tid, thread_name in sorted(thread_names.items()):
+            trace_events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+
+        trace = {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+        with open(self.path, "w") as trace_file:
+            json.dump(trace, trace_file, indent=1)
+
+    def __stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, {"path": self.path})
@@ -5,16 +5,26 @@ from .lock_version_cache import LockVersionCache
 
 
 class StoreLockVersionResolver(object):
-    def __init__(self, resolver, lock_cache_to: LockVersionCache, dependency):
+    def __init__(
+        self,
+        resolver,
+        lock_cache_to: LockVersionCache,
+        dependency,
+        lock_cache_from: LockVersionCache = None,
+    ):
         """Construct an instance.
 
         :param resolver: A resolver which will do the actual job
         :param lock_cache_to: The lock cache to store the version information in.
         :param dependency: A Dependency instance.
+        :param lock_cache_from: The lock cache the dependency may have been
+            resolved from or None. If the dependency was resolved from it,
+            the entry is copied instead of hashing the dependency again.
         """
         self.resolver = resolver
         self.lock_cache_to = lock_cache_to
         self.dependency = dependency
+        self.lock_cache_from = lock_cache_from
 
     def resolve(self):
         """Resolve a path to a dependency.
@@ -26,5 +36,14 @@ class StoreLockVersionResolver(object):
         """
 
         path = self.resolver.resolve()
-        self.lock_cache_to.add_dependency(dependency=self.dependency)
+
+        from_lock = "from_lock" in self.dependency and self.dependency.from_lock
+
+        if self.lock_cache_from is not None and from_lock:
+            self.lock_cache_to.copy_dependency(
+                dependency=self.dependency, lock_cache=self.lock_cache_from
+            )
+        else:
+            self.lock_cache_to.add_dependency(dependency=self.dependency)
+
         return path
@@ -0,0 +1,222 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import os
+import queue
+import tarfile
+import threading
+
+from .directory import remove_directory
+from .error import WurfError
+
+
+class TarStreamExtractor(object):
+    """Extracts a tar archive while it is being downloaded.
+
+    The content of the archive is passed to update(...) as it arrives and is
+    decompressed and extracted on a separate thread. So the archive is
+    extracted in the same pass as it is downloaded, instead of reading the
+    downloaded archive again afterwards.
+
+    Example:
+
+        extractor = TarStreamExtractor(to_path="/tmp/foo")
+
+        for chunk in chunks:
+            extractor.update(chunk)
+
+        extractor.close()
+
+    The gzip, bzip2 and xz compressed archives are supported.
+    """
+
+    EXTENSIONS = (
+        ".tar",
+        ".tar.gz",
+        ".tgz",
+        ".tar.bz2",
+        ".tbz2",
+        ".tar.xz",
+        ".txz",
+    )
+
+    # The number of chunks buffered before update(...) blocks
+    MAX_CHUNKS = 16
+
+    def __init__(self, to_path):
+        """Construct an instance.
+
+        :param to_path: The folder where the archive is extracted as a
+            string. The folder is created.
+        """
+        self.to_path = to_path
+
+        # The number of bytes passed to update(...)
+        self.size = 0
+
+        self.chunks = queue.Queue(maxsize=TarStreamExtractor.MAX_CHUNKS)
+
+        # The chunk being read by the extraction and the read offset
+        self.chunk = b""
+        self.offset = 0
+        self.error = None
+
+        os.makedirs(to_path)
+
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def supports(filename):
+        """Checks if the archive can be extracted while it is downloaded.
+
+        :param filename: The name of the archive as a string or None.
+        :return: True if the archive is a tar archive.
+        """
+        if not filename:
+            return False
+
+        return filename.lower().endswith(TarStreamExtractor.EXTENSIONS)
+
+    def update(self, chunk):
+        """Passes the next chunk of the archive to the extraction.
+
+        :param chunk: The content as bytes.
+        """
+        self.size += len(chunk)
+        self.__put(chunk)
+
+    def close(self):
+        """Waits for the extraction to complete.
+
+        :raises WurfError: If the archive could not be extracted.
+        """
+        self.__put(None)
+        self.thread.join()
+
+        if self.error is not None:
+            raise WurfError(
+                f"Failed to extract archive to {self.to_path}\n{self.error}"
+            ) from self.error
+
+    def abort(self):
+        """Stops the extraction and removes the extracted files."""
+        try:
+            self.close()
+        except WurfError:
+            pass
+
+        if os.path.lexists(self.to_path):
+            remove_directory(path=self.to_path)
+
+    def read(self, size=-1):
+        """Returns the next bytes of the archive.
+
+        Called by tarfile on the extraction thread. Blocks until the bytes
+        have been passed to update(...).
+
+        :param size: The maximum number of bytes to return.
+        :return: The bytes, which are empty at the end of the archive.
+        """
+        parts = []
+
+        while size != 0:
+            if self.offset == len(self.chunk):
+                chunk = self.chunks.get()
+
+                if chunk is None:
+                    # Keep the end marker for the next read
+                    self.chunks.put(None)
+                    break
+
+                self.chunk = chunk
+                self.offset = 0
+
+            start = self.offset
+            end = len(self.chunk)
+            if size > 0:
+                end = min(end, start + size)
+                size -= end - start
+
+            parts.append(self.chunk[start:end])
+            self.offset = end
+
+        return b"".join(parts)
+
+    def __put(self, chunk):
+        while self.error is None:
+            try:
+                self.chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                if not self.thread.is_alive():
+                    # The extraction failed, so the chunk is not needed
+                    return
+
+    def __run(self):
+        try:
+            self.__extract()
+        except Exception as e:
+            self.error = e
+            return
+
+        # Consume any padding after the end of the archive
+        while self.read(1024 * 1024):
+            pass
+
+    def __extract(self):
+        # Use the "tar" filter if available, it rejects members which would be
+        # extracted outside to_path
+        extraction_filter = getattr(tarfile, "tar_filter", None)
+        arguments = {"filter": "fully_trusted"} if extraction_filter else {}
+
+        directories = []
+
+        with tarfile.open(fileobj=self, mode="r|*") as tar:
+            for member in tar:
+                if extraction_filter is not None:
+                    member = extraction_filter(member, self.to_path)
+                else:
+                    self.__check_member(member)
+
+                if member.isdir():
+                    # The attributes of the directories are set last, such
+                    # that e.g. a read-only directory can be filled
+                    directories.append(member)
+                    tar.extract(member, self.to_path, set_attrs=False, **arguments)
+                else:
+                    tar.extract(member, self.to_path, **arguments)
+
+            for member in reversed(directories):
+                path = os.path.join(self.to_path, member.name)
+                tar.chmod(member, path)
+                tar.utime(member, path)
+
+    def __check_member(self, member):
+        target_path = os.path.realpath(self.to_path)
+
+        paths = [os.path.join(self.to_path, member.name)]
+
+        if member.issym():
+            paths.append(
+                os.path.join(
+                    self.to_path, os.path.dirname(member.name), member.linkname
+                )
+            )
+        elif member.islnk():
+            paths.append(os.path.join(self.to_path, member.linkname))
+
+        for path in paths:
+            path = os.path.realpath(path)
+
+            if path != target_path and not path.startswith(target_path + os.sep):
+                raise WurfError(
+                    f"Archive member destination is outside the target "
+                    f"directory. member: {member.name}"
+                )
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, {"to_path": self.to_path})
@@ -0,0 +1,35 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+
+class TraceResolver(object):
+    """Records the time spent in a resolver using a ResolveTracer."""
+
+    def __init__(self, resolver, tracer, dependency):
+        """Construct an instance.
+
+        :param resolver: The resolver to trace.
+        :param tracer: A ResolveTracer instance.
+        :param dependency: A Dependency instance.
+        """
+        self.resolver = resolver
+        self.tracer = tracer
+        self.dependency = dependency
+
+    def resolve(self):
+        """Resolve the dependency.
+
+        :return: Path to resolved dependency as a string
+        """
+        with self.tracer.span(
+            name=type(self.resolver).__name__,
+            category="resolver",
+            dependency=self.dependency.name,
+        ):
+            return self.resolver.resolve()
+
+    def __repr__(self):
+        """
+        :return: Representation of this object as a string
+        """
+        return "%s(%r)" % (self.__class__.__name__, self.__dict__)
@@ -2,17 +2,80 @@
 # encoding: utf-8
 
 import os
-import shutil
+import json
+import hashlib
+import contextlib
 from urllib.parse import urlparse
-from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+from urllib.request import urlopen, Request, getproxies, proxy_bypass
 
 from .error import WurfError
+from .http_connection_pool import HttpConnectionPool
 
 
 class UrlDownload(object):
-    def download(self, source, cwd, filename=None):
+    # The size of the chunks written to the file
+    CHUNK_SIZE = 1024 * 1024
+
+    HEADERS = {"User-Agent": "Mozilla"}
+
+    def __init__(self, connection_pool=None):
+        """Construct an instance.
+
+        :param connection_pool: The HttpConnectionPool used to reuse the
+            connections between downloads or None to create one.
+        """
+        if connection_pool is None:
+            connection_pool = HttpConnectionPool()
+
+        self.connection_pool = connection_pool
+
+    def download(
+        self,
+        source,
+        cwd,
+        filename=None,
+        hasher=None,
+        part_path=None,
+        validators=None,
+        stream=None,
+    ):
+        """Downloads a file.
+
+        If a part_path is given, the file is first written to a
+        "<sha1 of the url>.part" file in that folder together with a
+        ".part.json" file containing the expected length and the ETag or
+        Last-Modified header of the download. If the download is
+        interrupted, the next download of the same URL continues from the
+        end of the ".part" file using a Range request. The file is moved to
+        cwd once it has the expected length.
+
+        If validators are given, i.e. the "etag" and "last_modified" of an
+        earlier download of the URL, the request is conditional. If the file
+        has not been modified on the server, nothing is downloaded.
+
+        :param source: The URL of the file as a string.
+        :param cwd: The folder where the file is stored as a string.
+        :param filename: The name of the file as a string or None to use the
+            name from the URL or the Content-Disposition header.
+        :param hasher: A hashlib object which is updated with the content of
+            the file while it is written or None.
+        :param part_path: The folder where incomplete downloads are kept as a
+            string or None if an interrupted download should not be resumed.
+        :param validators: Dict with the validators of an earlier download or
+            None. The dict is updated with the "etag", "last_modified" and
+            "content_length" of the download.
+        :param stream: An object with an update(chunk) method, e.g. a
+            TarStreamExtractor, which is given the content of the file while
+            it is written or None.
+        :return: The path to the downloaded file as a string or None if the
+            file was not modified since the download with the validators.
+        """
         assert os.path.exists(cwd)
 
+        # The objects updated with the content of the file
+        consumers = [c for c in (hasher, stream) if c is not None]
+
         # If filename is not provided, try to extract it from the URL
         if not filename:
             parsed_url = urlparse(source)
@@ -22,20 +85,274 @@ class UrlDownload(object):
             if extension:
                 filename = basename
 
+        if part_path is not None:
+            return self.__resume(
+                source=source,
+                cwd=cwd,
+                filename=filename,
+                consumers=consumers,
+                part_path=part_path,
+                validators=validators,
+            )
+
+        headers = UrlDownload.__conditional_headers(validators=validators)
+
         try:
-            response = urlopen(Request(source, headers={"User-Agent": "Mozilla"}))
+            with self.__open(source=source, headers=headers) as response:
+                if response.status == 304:
+                    return None
+
+                # If filename is still not available, try to extract it from
+                # the Content-Disposition header
+                if not filename:
+                    filename = response.info().get_filename()
+
+                # Check that a filename was found
+                assert filename
+
+                path = os.path.join(cwd, filename)
+
+                with open(path, "wb") as out_file:
+                    self.__write(
+                        response=response, out_file=out_file, consumers=consumers
+                    )
+
+                if validators is not None:
+                    validators.update(UrlDownload.__validators(response.info()))
+        except (WurfError, AssertionError):
+            raise
         except Exception as e:
             raise WurfError(f"Failed to download: {source}\n{str(e)}") from e
-        # If filename is still not available, try to extract it from the
-        # Content-Disposition header
-        if not filename:
-            filename = response.info().get_filename()
 
-        # Check that a filename was found
+        return path
+
+    def __resume(self, source, cwd, filename, consumers, part_path, validators):
+        os.makedirs(part_path, exist_ok=True)
+
+        digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        part_file = os.path.join(part_path, digest + ".part")
+        info_file = part_file + ".json"
+
+        info = UrlDownload.__read_info(info_file=info_file, source=source)
+
+        if info is None or not os.path.isfile(part_file):
+            info = None
+            offset = 0
+        else:
+            offset = os.path.getsize(part_file)
+
+        if info is not None and offset == info["length"]:
+            # The transfer completed, but the file was not moved to cwd
+            UrlDownload.__read_file(path=part_file, consumers=consumers)
+        else:
+            if info is not None and (offset == 0 or not UrlDownload.__if_range(info)):
+                # Without a validator we cannot know if the file changed
+                info = None
+
+            info = self.__fetch(
+                source=source,
+                part_file=part_file,
+                info_file=info_file,
+                info=info,
+                consumers=consumers,
+                validators=validators,
+            )
+
+            if info is None:
+                # The file was not modified
+                return None
+
+        size = os.path.getsize(part_file)
+
+        if info["length"] is not None and size != info["length"]:
+            raise WurfError(
+                f"Failed to download: {source}\nReceived {size} of "
+                f"{info['length']} bytes, the download is resumed next time"
+            )
+
+        filename = filename or info["filename"]
         assert filename
 
-        # Send an HTTP GET request to the URL and save the file
         path = os.path.join(cwd, filename)
-        with open(path, "wb") as out_file:
-            shutil.copyfileobj(response, out_file)
+        os.replace(part_file, path)
+        os.remove(info_file)
+
+        if validators is not None:
+            validators.update(
+                etag=info["etag"],
+                last_modified=info["last_modified"],
+                content_length=info["length"],
+            )
+
         return path
+
+    def __fetch(self, source, part_file, info_file, info, consumers, validators):
+        """Downloads the file to the part_file.
+
+        If info is not None, the download continues from the end of the
+        part_file. Otherwise the request is conditional on the validators.
+
+        :return: Dict with the "source", "filename", "length", "etag" and
+            "last_modified" of the download or None if the file was not
+            modified.
+        """
+        if info is not None:
+            offset = os.path.getsize(part_file)
+            headers = dict(UrlDownload.HEADERS)
+            headers["Range"] = f"bytes={offset}-"
+            # If the file changed on the server, we get all of it
+            headers["If-Range"] = UrlDownload.__if_range(info)
+        else:
+            headers = UrlDownload.__conditional_headers(validators=validators)
+
+        try:
+            with contextlib.ExitStack() as stack:
+                try:
+                    response = stack.enter_context(
+                        self.__open(source=source, headers=headers)
+                    )
+                except WurfError:
+                    if info is None:
+                        raise
+
+                    # E.g. the range could not be satisfied, so we start over
+                    return self.__fetch(
+                        source=source,
+                        part_file=part_file,
+                        info_file=info_file,
+                        info=None,
+                        consumers=consumers,
+                        validators=validators,
+                    )
+
+                if response.status == 304:
+                    return None
+
+                message = response.info()
+
+                if info is not None and response.status == 206:
+                    content_range = message.get("Content-Range", "")
+
+                    if not content_range.startswith(f"bytes {offset}-"):
+                        raise WurfError(
+                            f"Failed to download: {source}\nUnexpected "
+                            f"Content-Range: {content_range}"
+                        )
+
+                    mode = "ab"
+
+                    UrlDownload.__read_file(path=part_file, consumers=consumers)
+                else:
+                    mode = "wb"
+                    response_validators = UrlDownload.__validators(message)
+
+                    info = {
+                        "source": source,
+                        "filename": message.get_filename(),
+                        "length": response_validators["content_length"],
+                        "etag": response_validators["etag"],
+                        "last_modified": response_validators["last_modified"],
+                    }
+
+                    with open(info_file, "w") as json_file:
+                        json.dump(info, json_file)
+
+                with open(part_file, mode) as out_file:
+                    self.__write(
+                        response=response, out_file=out_file, consumers=consumers
+                    )
+        except WurfError:
+            raise
+        except Exception as e:
+            raise WurfError(f"Failed to download: {source}\n{str(e)}") from e
+
+        return info
+
+    def __open(self, source, headers):
+        parsed_url = urlparse(source)
+        proxies = getproxies()
+
+        if parsed_url.scheme in proxies and not proxy_bypass(parsed_url.hostname):
+            # The connection pool connects directly to the host, so we let
+            # urllib handle the proxy
+            try:
+                response = urlopen(Request(source, headers=headers))
+            except HTTPError as e:
+                if e.code != 304:
+                    raise
+                # urllib reports "304 Not Modified" as an error
+                response = e
+
+            return contextlib.closing(response)
+
+        return self.connection_pool.get(url=source, headers=headers)
+
+    @staticmethod
+    def __read_info(info_file, source):
+        if not os.path.isfile(info_file):
+            return None
+
+        try:
+            with open(info_file, "r") as json_file:
+                info = json.load(json_file)
+        except ValueError:
+            return None
+
+        if info.get("source", None) != source:
+            return None
+
+        for key in ["filename", "length", "etag", "last_modified"]:
+            info.setdefault(key, None)
+
+        return info
+
+    @staticmethod
+    def __if_range(info):
+        return info["etag"] or info["last_modified"]
+
+    @staticmethod
+    def __conditional_headers(validators):
+        headers = dict(UrlDownload.HEADERS)
+
+        if not validators:
+            return headers
+
+        if validators.get("etag", None):
+            headers["If-None-Match"] = validators["etag"]
+
+        if validators.get("last_modified", None):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        return headers
+
+    @staticmethod
+    def __validators(message):
+        length = message.get("Content-Length", None)
+
+        return {
+            "etag": message.get("ETag", None),
+            "last_modified": message.get("Last-Modified", None),
+            "content_length": int(length) if length is not None else None,
+        }
+
+    @staticmethod
+    def __read_file(path, consumers):
+        if not consumers:
+            return
+
+        with open(path, "rb") as in_file:
+            for chunk in iter(lambda: in_file.read(UrlDownload.CHUNK_SIZE), b""):
+                for consumer in consumers:
+                    consumer.update(chunk)
+
+    @staticmethod
+    def __write(response, out_file, consumers):
+        while True:
+            chunk = response.read(UrlDownload.CHUNK_SIZE)
+            if not chunk:
+                break
+
+            for consumer in consumers:
+                consumer.update(chunk)
+
+            out_file.write(chunk)
@@ -14,6 +14,7 @@ from waflib.Errors import WafError
 from . import registry
 from .error import CmdAndLogError
 from .error import WurfError
+from .dependency import Dependency
 from .dependency_manager import DependencyManager
 
 from waflib.extras import semver
@@ -50,12 +51,27 @@ class WafResolveContext(Context.Context):
         self.resolve = resolve
         self.skip_internal = skip_internal
 
+        # The fingerprint of the resolve, None if it is not used
+        self.fingerprint = None
+
+        # The ResolveTracer recording the time spent, None if not tracing
+        self.tracer = None
+
+        self.registry = None
+
     def execute(self):
         if not self.resolve:
             # Skip out if we are should not execute - see __init__ for
             # explanation
             return
 
+        try:
+            self.__execute()
+        finally:
+            if self.registry is not None and self.registry.profiler is not None:
+                self.__write_registry_profile()
+
+    def __execute(self):
         # Check whether the main wscript has a resolve function defined,
         # if not we create one. This is also done for other functions such
         # as options by waf itself. See:
@@ -110,11 +126,63 @@ class WafResolveContext(Context.Context):
         version = self.project_version()
         self.end_msg(version or "unknown", color="GREEN" if version else "YELLOW")
 
+        # The fingerprint allows us to skip the resolve if nothing has changed
+        # since the last time we resolved
+        self.fingerprint = None
+        if configuration.choose_fingerprint():
+            self.fingerprint = self.registry.require("resolve_fingerprint")
+
+        options = self.registry.require("options")
+
+        # Revalidating the http dependencies requires a resolve
+        skip_allowed = not options.force_resolve() and not options.revalidate_http()
+
+        stored = None
+        if self.fingerprint is not None and skip_allowed:
+            stored = self.fingerprint.load()
+
+        global dependency_cache
+
+        if stored is not None:
+            dependencies, dependency_cache = stored
+
+            # Register the options of the dependencies, such that e.g.
+            # the --{name}_path options are still recognized
+            for dependency in dependencies:
+                options.add_dependency(Dependency(**dependency))
+
+            self.msg(
+                "Resolve dependencies",
+                "up to date (use --force_resolve to resolve again)",
+            )
+            self.logger.debug(f"wurf: dependency_cache {dependency_cache}")
+            return
+
+        if self.fingerprint is not None:
+            self.fingerprint.clear()
+
         self.dependency_manager: DependencyManager = self.registry.require(
             "dependency_manager"
         )
 
+        # The tracer must be required after the dependency manager, since
+        # creating the dependency manager purges the registry cache
+        self.tracer = self.registry.require("resolve_tracer")
+
+        # The registry traces the resolvers built by the providers
+        self.registry.tracer = self.tracer
+
+        # Remove the manifest of the previous resolve, such that it is not
+        # used if this resolve fails
+        if configuration.choose_resolve():
+            self.registry.require("resolve_manifest").clear()
+
         try:
+            # Check the names passed to --update_lock before resolving, such
+            # that an unknown name does not cost a full resolve
+            if configuration.update_lock():
+                self.registry.require("update_lock_names")
+
             # Calling the context execute will call the resolve(...) functions
             # in the wscripts.
             super(WafResolveContext, self).execute()
@@ -124,9 +192,13 @@ class WafResolveContext(Context.Context):
             self.fatal(str(e))
         except Exception:
             raise
+        finally:
+            self.dependency_manager.shutdown()
+
+            if self.tracer is not None:
+                self.__write_trace()
 
         # Get the cache with the resolved dependencies
-        global dependency_cache
         dependency_cache = self.registry.require("dependency_cache")
 
         self.logger.debug(f"wurf: dependency_cache {dependency_cache}")
@@ -138,6 +210,45 @@ class WafResolveContext(Context.Context):
         for action in post_resolver_actions:
             action()
 
+        # The fingerprint is only stored once the actions have succeeded,
+        # otherwise a failed action would be skipped by the next resolve
+        if self.fingerprint is not None:
+            dependencies = [
+                {"name": d.name, "resolver": d.resolver}
+                for d in self.dependency_manager.seen_dependencies.values()
+            ]
+            self.fingerprint.store(
+                dependencies=dependencies, dependency_cache=dependency_cache
+            )
+
+    def __write_trace(self):
+        """Writes the trace and prints the time spent per dependency."""
+        self.tracer.write()
+
+        for entry in self.tracer.summary():
+            self.msg(
+                f'Resolve time "{entry["dependency"]}"',
+                f'{entry["resolve"]:.3f}s ({entry["commands"]} commands '
+                f'took {entry["command_time"]:.3f}s)',
+            )
+
+        self.msg("Resolve trace", os.path.abspath(self.tracer.path))
+
+    def __write_registry_profile(self):
+        """Writes the registry profile and logs the slowest providers."""
+        profiler = self.registry.profiler
+        profiler.write()
+
+        for entry in profiler.report()[:10]:
+            self.to_log(
+                f'wurf: Registry provider "{entry["provider"]}" '
+                f'{entry["exclusive_time"]:.6f}s exclusive, '
+                f'{entry["time"]:.6f}s cumulative, {entry["calls"]} calls, '
+                f'{entry["hits"]} hits, {entry["misses"]} misses'
+            )
+
+        self.msg("Registry profile", os.path.abspath(profiler.path))
+
     def post_recurse(self, node):
         # As the last step in recurse, try to load the dependencies from the
         # 'resolve.json' file if it is present next to the wscript.
@@ -145,6 +256,12 @@ class WafResolveContext(Context.Context):
         # resolve() function, since we always want to allow the user to
         # run custom code before the actual resolving starts.
 
+        if self.fingerprint is not None:
+            self.fingerprint.add_file(node.abspath())
+            self.fingerprint.add_file(
+                os.path.join(self.path.abspath(), DependencyManager.RESOLVE_FILE)
+            )
+
         try:
             self.dependency_manager.load_dependencies(self.path.abspath())
         except ValueError as e:
@@ -178,16 +295,23 @@ class WafResolveContext(Context.Context):
         self.dependency_manager.enable_dependency(name)
 
     def cmd_and_log(self, cmd, **kwargs):
-        # Seems the new waf needs the cwd to be a Node object. We do this
-        # adaption here to avoid introducing additional Waf dependencies in the
-        # other parts of the code.
+        # Dependencies may be resolved on multiple threads, so we pass the
+        # cwd to waf as a plain string. Looking up a Node would modify the
+        # Node tree, which is not thread-safe.
         if "cwd" in kwargs:
-            cwd = kwargs["cwd"]
-            kwargs["cwd"] = self.root.find_dir(str(cwd))
-            assert kwargs["cwd"]
+            kwargs["cwd"] = str(kwargs["cwd"])
+            assert os.path.isdir(kwargs["cwd"])
 
         try:
-            return super(WafResolveContext, self).cmd_and_log(cmd=cmd, **kwargs)
+            if self.tracer is None:
+                return super(WafResolveContext, self).cmd_and_log(cmd=cmd, **kwargs)
+
+            with self.tracer.span(
+                name=self.tracer.command_name(cmd),
+                category="command",
+                args={"cmd": str(cmd), "cwd": str(kwargs.get("cwd", ""))},
+            ):
+                return super(WafResolveContext, self).cmd_and_log(cmd=cmd, **kwargs)
         except WafError as e:
             # @todo Do we need to include the traceback to the original
             # exception here? See: http://bit.ly/2njVD5V
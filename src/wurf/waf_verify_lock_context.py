@@ -0,0 +1,17 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+from waflib import Context
+
+
+class WafVerifyLockContext(Context.Context):
+    """verifies the resolved dependencies against the lock file"""
+
+    cmd = "verify_lock"
+
+    def execute(self):
+        # The verification runs as the last step of the resolve, which the
+        # options context executes before any command, see the
+        # verify_lock_action in the registry. This context only registers
+        # the command with waf.
+        pass
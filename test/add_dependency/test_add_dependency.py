@@ -6,7 +6,6 @@ import json
 import pytest
 from pytest_testdirectory.runresulterror import RunResultError
 
-
 """ Integration testing of adding a dependency.
 
 This test is a bit involved so lets try to explain what it does:
@@ -642,6 +641,50 @@ def test_lock_versions_and_then_paths(testdirectory):
 
     assert r.stdout.match('Resolve "baz" (lock/git checkout)*: 3.3.1*')
 
+    # Unknown names passed to --update_lock are reported before resolving
+    with pytest.raises(RunResultError) as e:
+        app_dir.run(
+            [
+                "python",
+                "waf",
+                "configure",
+                "--update_lock",
+                "unknown",
+                "--resolve_path",
+                "resolved_dependencies",
+            ]
+        )
+
+    assert e.value.runresult.stderr.match(
+        "*Unknown dependencies passed to --update_lock: unknown*"
+    )
+    assert not e.value.runresult.stdout.match('*Resolve "baz"*')
+
+    # Updating baz in the lock file resolves it without the locked version
+    app_dir.join("resolved_dependencies").rmdir()
+
+    r = app_dir.run(
+        [
+            "python",
+            "waf",
+            "configure",
+            "--update_lock",
+            "baz",
+            "--resolve_path",
+            "resolved_dependencies",
+        ]
+    )
+
+    assert r.stdout.match('*Resolve "baz" (git semver)*: 3.3.2*')
+    assert r.stdout.match('*Resolve "foo" (lock/git checkout)*')
+
+    with open(
+        os.path.join(app_dir.path(), "lock_version_resolve.json"), "r"
+    ) as json_file:
+        lock = json.load(json_file)
+        assert lock["baz"]["resolver_info"] == "3.3.2"
+        assert lock["foo"]["resolver_info"] == "1.3.3.7"
+
     # Check that if we remove the lock file, we get the new version
     app_dir.rmfile("lock_version_resolve.json")
 
@@ -690,6 +733,110 @@ def test_lock_versions_and_then_paths(testdirectory):
     assert app_dir.contains_file("lock_path_resolve.json")
 
 
+def test_verify_lock(testdirectory):
+    app_dir = mkdir_app(directory=testdirectory)
+
+    git_dir = testdirectory.mkdir(directory="git_dir")
+
+    qux_dir = mkdir_libqux(directory=git_dir)
+    foo_dir = mkdir_libfoo(directory=git_dir)
+    bar_dir = mkdir_libbar(directory=git_dir)
+    baz_dir = mkdir_libbaz(directory=git_dir, qux_dir=qux_dir)
+    extra_dir = mkdir_libextra(directory=git_dir)
+
+    # Instead of doing an actual Git clone - we fake it and use the paths in
+    # this mapping
+    clone_path = {
+        "acme-corp/foo.git": foo_dir.path(),
+        "acme-corp/bar.git": bar_dir.path(),
+        "acme/baz.git": baz_dir.path(),
+        "acme-corp/extra.git": extra_dir.path(),
+    }
+
+    with open(os.path.join(app_dir.path(), "clone_path.json"), "w") as json_file:
+        json.dump(clone_path, json_file)
+
+    # Verifying requires a lock file
+    with pytest.raises(RunResultError) as e:
+        app_dir.run(["python", "waf", "verify_lock"])
+
+    assert e.value.runresult.stderr.match("*No lock file found*")
+
+    app_dir.run(
+        [
+            "python",
+            "waf",
+            "configure",
+            "--lock_versions",
+            "--resolve_path",
+            "resolved_dependencies",
+        ]
+    )
+
+    # Resolving from the lock file verifies the dependencies
+    app_dir.run(
+        [
+            "python",
+            "waf",
+            "configure",
+            "--resolve_path",
+            "resolved_dependencies",
+        ]
+    )
+
+    r = app_dir.run(["python", "waf", "verify_lock"])
+    assert r.stdout.match("*Verify lock*: 4 match, 0 mismatch, 0 missing*")
+
+    report_path = os.path.join(app_dir.path(), "build", "verify_lock.json")
+
+    with open(report_path, "r") as json_file:
+        report = json.load(json_file)
+
+    assert report["status"] == "match"
+    assert sorted(report["dependencies"]) == ["bar", "baz", "extra", "foo"]
+
+    # Change the commit of the resolved foo dependency
+    foo_path = report["dependencies"]["foo"]["path"]
+    json_path = os.path.join(foo_path, "git_info.json")
+
+    with open(json_path, "r") as json_file:
+        git_info = json.load(json_file)
+        git_info["checkout"] = "v1.2.3"
+    with open(json_path, "w") as json_file:
+        json.dump(git_info, json_file)
+
+    with pytest.raises(RunResultError) as e:
+        app_dir.run(["python", "waf", "verify_lock"])
+
+    assert e.value.runresult.stdout.match(
+        "*Verify lock*: 3 match, 1 mismatch, 0 missing*"
+    )
+
+    with open(report_path, "r") as json_file:
+        report = json.load(json_file)
+
+    assert report["status"] == "mismatch"
+    assert report["dependencies"]["foo"]["status"] == "mismatch"
+
+    # The commit is checked while resolving from the lock file, so the
+    # resolve fails right away
+    with pytest.raises(RunResultError) as e:
+        app_dir.run(
+            [
+                "python",
+                "waf",
+                "configure",
+                "--resolve_path",
+                "resolved_dependencies",
+            ]
+        )
+
+    assert e.value.runresult.stderr.match(
+        "*The content does not match the data when the dependency was locked*"
+    )
+    assert e.value.runresult.stderr.match('*"foo" dependency*')
+
+
 def test_optional(testdirectory):
     app_dir = mkdir_app(directory=testdirectory)
 
@@ -1,6 +1,13 @@
 #!/usr/bin/env python
 # encoding: utf-8
 
+import glob
+import os
+
+import pytest
+
+from pytest_testdirectory.runresulterror import RunResultError
+
 
 def test_dependency_node(testdirectory):
     testdirectory.copy_file("test/dependency_node/fake_url_download.py")
@@ -9,3 +16,28 @@ def test_dependency_node(testdirectory):
     testdirectory.copy_file("build/waf")
 
     testdirectory.run("python waf configure")
+
+
+def test_dependency_node_lock(testdirectory):
+    testdirectory.copy_file("test/dependency_node/fake_url_download.py")
+    testdirectory.copy_file("test/dependency_node/wscript")
+    testdirectory.copy_file("test/dependency_node/resolve.json")
+    testdirectory.copy_file("build/waf")
+
+    testdirectory.run("python waf configure --lock_versions")
+    testdirectory.run("python waf configure")
+
+    # Changing the content of the locked http dependency must be detected
+    # by the next resolve from the lock file
+    (lib,) = glob.glob(
+        os.path.join(
+            testdirectory.path(), "resolved_dependencies", "baz-*", "*", "lib.cpp"
+        )
+    )
+    with open(lib, "w") as lib_file:
+        lib_file.write("Goodbye\n")
+
+    with pytest.raises(RunResultError) as excinfo:
+        testdirectory.run("python waf configure")
+
+    excinfo.value.runresult.stderr.match('*Lock verification failed for "baz"*')
@@ -5,6 +5,7 @@ import hashlib
 import schema
 
 from waflib.extras.wurf.error import WurfError
+from waflib.extras.wurf.git_ref_index import GitRefIndex
 
 
 def check_git_info(git_info):
@@ -135,6 +136,17 @@ class FakeGit:
         git_info = read_git_info(cwd=cwd)
         return self._to_sha1(data=checkout + git_info["remote_origin_url"])
 
+    def has_object(self, cwd, revision):
+        """Fake whether a tag, branch or commit is available locally"""
+
+        git_info = read_git_info(cwd=cwd)
+
+        for checkout in git_info["tags"] + git_info["branches"]:
+            if revision in (checkout, self.checkout_to_commit_id(cwd, checkout)):
+                return True
+
+        return revision in git_info["commits"]
+
     def tags(self, cwd):
         """Fake what tags are in a repository"""
 
@@ -147,6 +159,26 @@ class FakeGit:
         git_info = read_git_info(cwd=cwd)
         return git_info["branches"]
 
+    def for_each_ref(self, cwd):
+        """Fake the refs of a repository in the GitRefIndex.FORMAT"""
+
+        git_info = read_git_info(cwd=cwd)
+
+        lines = []
+        for branch in git_info["branches"]:
+            commit_id = self.checkout_to_commit_id(cwd, branch)
+            lines.append(f"refs/heads/{branch} {commit_id}  ")
+
+        for tag in git_info["tags"]:
+            commit_id = self.checkout_to_commit_id(cwd, tag)
+            lines.append(f"refs/tags/{tag} {commit_id}  ")
+
+        return lines
+
+    def ref_index(self, cwd):
+        """Fake the GitRefIndex of a repository"""
+        return GitRefIndex(lines=self.for_each_ref(cwd=cwd))
+
     def current_branch(self, cwd):
         """ " Fake the current branch of a repository"""
 
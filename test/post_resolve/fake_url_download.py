@@ -5,7 +5,16 @@ class FakeUrlDownload(object):
     def __init__(self):
         pass
 
-    def download(self, cwd, source, filename):
+    def download(
+        self,
+        cwd,
+        source,
+        filename,
+        hasher=None,
+        part_path=None,
+        validators=None,
+        stream=None,
+    ):
 
         if not filename:
             filename = "somefile.txt"
@@ -1,7 +1,10 @@
+import io
 import mock
 import os
+import tarfile
 
 from wurf.archive_resolver import ArchiveResolver
+from wurf.http_resolver import HttpResolver
 
 
 def test_archive_resolver(testdirectory):
@@ -14,6 +17,7 @@ def test_archive_resolver(testdirectory):
     parent_resolver.resolve = mock.Mock(return_value=resolve_file)
 
     archive_extractor = mock.Mock()
+    archive_extractor.side_effect = lambda path, to_path: os.makedirs(to_path)
 
     resolver = ArchiveResolver(
         ctx=ctx,
@@ -24,4 +28,94 @@ def test_archive_resolver(testdirectory):
 
     path = resolver.resolve()
 
-    archive_extractor.assert_called_once_with(path=resolve_file, to_path=path)
+    # The archive is extracted to a temporary folder, which is renamed
+    archive_extractor.assert_called_once_with(
+        path=resolve_file, to_path=f"{path}.{os.getpid()}.tmp"
+    )
+    assert os.path.isdir(path)
+
+
+def test_archive_resolver_changed(testdirectory):
+    resolve_path = testdirectory.mkdir("resolved")
+    resolve_path.write_binary("ok.zip", b"foobarbaz")
+    resolve_file = os.path.join(resolve_path.path(), "ok.zip")
+
+    parent_resolver = mock.Mock()
+    parent_resolver.resolve = mock.Mock(return_value=resolve_file)
+
+    def extract(path, to_path):
+        os.makedirs(to_path)
+        with open(os.path.join(to_path, "content"), "wb") as f:
+            f.write(open(path, "rb").read())
+
+    archive_extractor = mock.Mock()
+    archive_extractor.side_effect = extract
+
+    resolver = ArchiveResolver(
+        ctx=mock.Mock(),
+        archive_extractor=archive_extractor,
+        resolver=parent_resolver,
+        cwd=testdirectory.path(),
+    )
+
+    path = resolver.resolve()
+    assert path == resolver.resolve()
+    assert archive_extractor.call_count == 1
+
+    # The archive was downloaded again, so it is extracted again
+    resolve_path.write_binary("ok.zip", b"foobarbazqux")
+
+    assert path == resolver.resolve()
+    assert archive_extractor.call_count == 2
+
+    with open(os.path.join(path, "content"), "rb") as f:
+        assert f.read() == b"foobarbazqux"
+
+
+def test_archive_resolver_stream(testdirectory):
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w:gz") as tar:
+        info = tarfile.TarInfo(name="pkg/a.txt")
+        info.size = 5
+        tar.addfile(info, io.BytesIO(b"hello"))
+    archive = archive.getvalue()
+
+    dependency = mock.Mock()
+    dependency.filename = None
+    dependency.sha256 = None
+    dependency.source = "http://example.com/pkg.tar.gz"
+
+    def download(cwd, source, filename, hasher, part_path, validators, stream):
+        stream.update(archive)
+        testdirectory.from_path(cwd).write_binary("pkg.tar.gz", archive)
+        return os.path.join(cwd, "pkg.tar.gz")
+
+    url_download = mock.Mock()
+    url_download.download.side_effect = download
+
+    stream_path = os.path.join(testdirectory.path(), "streamed")
+
+    http_resolver = HttpResolver(
+        ctx=mock.Mock(),
+        url_download=url_download,
+        dependency=dependency,
+        cwd=testdirectory.path(),
+        stream_path=stream_path,
+    )
+
+    archive_extractor = mock.Mock()
+
+    resolver = ArchiveResolver(
+        ctx=mock.Mock(),
+        archive_extractor=archive_extractor,
+        resolver=http_resolver,
+        cwd=testdirectory.path(),
+        stream_path=stream_path,
+    )
+
+    path = resolver.resolve()
+
+    # The archive was extracted while it was downloaded
+    assert archive_extractor.called is False
+    assert testdirectory.from_path(path).contains_file("pkg/a.txt")
+    assert not os.path.exists(stream_path)
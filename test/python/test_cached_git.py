@@ -0,0 +1,140 @@
+import os
+import mock
+
+from wurf.cached_git import CachedGit
+
+
+def test_cached_git(testdirectory):
+    repo = testdirectory.mkdir("repo")
+    git_dir = repo.mkdir(".git")
+    git_dir.write_text("HEAD", "ref: refs/heads/master\n", encoding="utf-8")
+    git_dir.mkdir("refs").mkdir("heads")
+    git_dir.write_text("refs/heads/master", "1" * 40 + "\n", encoding="utf-8")
+
+    ctx = mock.Mock()
+    ctx.cmd_and_log.return_value = "1" * 40
+
+    git = CachedGit("/bin/git_binary", ctx)
+
+    assert git.current_commit(cwd=repo.path()) == "1" * 40
+    assert git.current_commit(cwd=repo.path()) == "1" * 40
+    assert ctx.cmd_and_log.call_count == 1
+
+    # The cache is only written when asked to
+    cache_path = os.path.join(git_dir.path(), CachedGit.CACHE_FILE)
+    assert not os.path.isfile(cache_path)
+
+    git.write()
+    assert os.path.isfile(cache_path)
+
+    # The cache is persisted, so a new instance does not need to run git
+    git = CachedGit("/bin/git_binary", ctx)
+    assert git.current_commit(cwd=repo.path()) == "1" * 40
+    assert ctx.cmd_and_log.call_count == 1
+
+    # Git updates refs by renaming a new file on top of the old one
+    new_ref = os.path.join(git_dir.path(), "refs", "heads", "master.lock")
+    with open(new_ref, "w") as f:
+        f.write("2" * 40 + "\n")
+    os.replace(new_ref, os.path.join(git_dir.path(), "refs", "heads", "master"))
+
+    # The stamp is only computed the first time a repository is queried, so
+    # changes made outside this instance are not seen during a resolve
+    ctx.cmd_and_log.return_value = "2" * 40
+    assert git.current_commit(cwd=repo.path()) == "1" * 40
+    assert ctx.cmd_and_log.call_count == 1
+
+    # The next resolve computes a new stamp
+    git = CachedGit("/bin/git_binary", ctx)
+    assert git.current_commit(cwd=repo.path()) == "2" * 40
+    assert ctx.cmd_and_log.call_count == 2
+
+    # Pulling invalidates the cache
+    git.pull(cwd=repo.path())
+    assert ctx.cmd_and_log.call_count == 3
+
+    ctx.cmd_and_log.return_value = "3" * 40
+    assert git.current_commit(cwd=repo.path()) == "3" * 40
+    assert ctx.cmd_and_log.call_count == 4
+
+
+def test_cached_git_stamp(testdirectory):
+    repo = testdirectory.mkdir("repo")
+    git_dir = repo.mkdir(".git")
+    git_dir.write_text("HEAD", "ref: refs/heads/master\n", encoding="utf-8")
+    git_dir.mkdir("refs").mkdir("heads")
+
+    ctx = mock.Mock()
+    ctx.cmd_and_log.return_value = "1" * 40
+
+    git = CachedGit("/bin/git_binary", ctx)
+
+    with mock.patch("os.walk", wraps=os.walk) as walk:
+        git.current_commit(cwd=repo.path())
+        git.remote_origin_url(cwd=repo.path())
+        git.for_each_ref(cwd=repo.path())
+
+        # The refs are only walked for the first query
+        assert walk.call_count == 1
+
+        git.checkout(branch="main", cwd=repo.path())
+        git.current_commit(cwd=repo.path())
+
+        # The checkout changed the repository, so a new stamp is computed
+        assert walk.call_count == 2
+
+
+def test_cached_git_branch(testdirectory):
+    repo = testdirectory.mkdir("repo")
+    repo.mkdir(".git").write_text("HEAD", "ref: refs/heads/main\n", encoding="utf-8")
+
+    ctx = mock.Mock()
+    ctx.cmd_and_log.side_effect = [
+        "1" * 40 + "\nrefs/heads/main\n",
+        "refs/heads/main " + "1" * 40 + "  \n"
+        "refs/remotes/origin/feature " + "2" * 40 + "  \n"
+        "refs/tags/1.0.0 " + "1" * 40 + "  \n",
+    ]
+
+    git = CachedGit("/bin/git_binary", ctx)
+
+    assert git.branch(cwd=repo.path()) == ("main", ["feature"])
+
+    # The helpers reading HEAD and the refs are served from the cache
+    assert git.current_branch(cwd=repo.path()) == "main"
+    assert git.is_detached_head(cwd=repo.path()) is False
+    assert git.branches(cwd=repo.path()) == ["main", "feature"]
+    assert git.current_tag(cwd=repo.path()) == "1.0.0"
+    assert git.branch(cwd=repo.path()) == ("main", ["feature"])
+
+    assert ctx.cmd_and_log.call_count == 2
+
+
+def test_cached_git_not_repository(testdirectory):
+    ctx = mock.Mock()
+    ctx.cmd_and_log.return_value = "1.0.0\n"
+
+    git = CachedGit("/bin/git_binary", ctx)
+
+    # Queries outside the root of a repository are not cached
+    assert git.tags(cwd=testdirectory.path()) == ["1.0.0"]
+    assert git.tags(cwd=testdirectory.path()) == ["1.0.0"]
+    assert ctx.cmd_and_log.call_count == 2
+
+
+def test_cached_git_ref_index(testdirectory):
+    repo = testdirectory.mkdir("repo")
+    repo.mkdir(".git").write_text("HEAD", "ref: refs/heads/main\n", encoding="utf-8")
+
+    ctx = mock.Mock()
+    ctx.cmd_and_log.return_value = (
+        "refs/heads/main " + "1" * 40 + "  \nrefs/tags/1.0.0 " + "2" * 40 + "  \n"
+    )
+
+    git = CachedGit("/bin/git_binary", ctx)
+
+    assert git.ref_index(cwd=repo.path()).tags() == ["1.0.0"]
+    assert git.ref_index(cwd=repo.path()).commit_id("1.0.0") == "2" * 40
+
+    # All lookups are served from a single 'git for-each-ref'
+    assert ctx.cmd_and_log.call_count == 1
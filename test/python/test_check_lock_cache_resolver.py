@@ -0,0 +1,84 @@
+import mock
+import pytest
+
+from wurf.check_lock_cache_resolver import CheckLockCacheResolver
+from wurf.dependency import Dependency
+from wurf.error import DependencyError
+
+
+def test_check_lock_cache_resolver():
+    resolver = mock.Mock()
+    resolver.resolve.return_value = "/tmp/foo"
+
+    lock_cache = mock.Mock()
+    lock_cache.__contains__ = mock.Mock(return_value=True)
+    lock_cache.check_sha1.return_value = False
+    lock_cache.check_resolved.return_value = False
+
+    dependency = mock.Mock()
+    dependency.name = "foo"
+    dependency.resolver = "http"
+
+    from_lock_names = []
+
+    check_resolver = CheckLockCacheResolver(
+        resolver=resolver,
+        lock_cache_from=lock_cache,
+        dependency=dependency,
+        from_lock_names=from_lock_names,
+    )
+
+    assert check_resolver.resolve() == "/tmp/foo"
+
+    # The content is verified after the resolve
+    assert from_lock_names == ["foo"]
+
+    # The dependency changed since it was locked
+    lock_cache.check_sha1.return_value = True
+
+    with pytest.raises(DependencyError):
+        check_resolver.resolve()
+
+    assert from_lock_names == ["foo"]
+
+
+def test_check_lock_cache_resolver_git():
+    resolver = mock.Mock()
+    resolver.resolve.return_value = "/tmp/foo"
+
+    lock_cache = mock.Mock()
+    lock_cache.__contains__ = mock.Mock(return_value=True)
+    lock_cache.check_sha1.return_value = False
+    lock_cache.check_resolved.return_value = False
+
+    dependency = Dependency(
+        name="foo",
+        resolver="git",
+        method="checkout",
+        checkout="1.0.0",
+        source="foo.git",
+    )
+
+    from_lock_names = []
+
+    check_resolver = CheckLockCacheResolver(
+        resolver=resolver,
+        lock_cache_from=lock_cache,
+        dependency=dependency,
+        from_lock_names=from_lock_names,
+    )
+
+    # The commit is checked right away, so there is nothing to verify after
+    # the resolve
+    assert check_resolver.resolve() == "/tmp/foo"
+    assert from_lock_names == []
+
+    lock_cache.check_resolved.assert_called_once_with(
+        dependency=dependency, path="/tmp/foo"
+    )
+
+    # A different commit was checked out
+    lock_cache.check_resolved.return_value = True
+
+    with pytest.raises(DependencyError):
+        check_resolver.resolve()
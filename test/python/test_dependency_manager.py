@@ -1,8 +1,14 @@
+import os
+import json
+import threading
 from collections import OrderedDict
 
 import mock
+import pytest
 
 from wurf.dependency_manager import DependencyManager
+from wurf.error import WurfError
+from wurf.registry import Registry
 
 
 def test_dependency_manager():
@@ -22,3 +28,201 @@ def test_dependency_manager():
     )
 
     # @todo add tests
+
+
+def test_dependency_manager_resolve_jobs(testdirectory):
+    # The dependency graph is app -> foo -> baz and app -> bar -> baz.
+    # Resolving on a thread pool must produce the same dependency cache
+    # as resolving serially.
+    resolve_json = {
+        "app": ["foo", "bar"],
+        "foo": ["baz"],
+        "bar": ["baz"],
+        "baz": [],
+    }
+
+    for name, children in resolve_json.items():
+        folder = testdirectory.mkdir(name)
+        dependencies = [
+            {"name": child, "resolver": "http", "source": f"{child}.zip"}
+            for child in children
+        ]
+        folder.write_text("resolve.json", json.dumps(dependencies), encoding="utf-8")
+
+    def resolve(resolve_jobs):
+        registry = Registry()
+        dependency_cache = OrderedDict()
+        threads = set()
+
+        def dependency_chain(dependency):
+            resolver = mock.Mock()
+
+            def resolve():
+                threads.add(threading.get_ident())
+                return os.path.join(testdirectory.path(), dependency.name)
+
+            resolver.resolve.side_effect = resolve
+            return resolver
+
+        registry.provide_function("dependency_chain", dependency_chain, override=True)
+        registry.provide_value("ctx", mock.Mock())
+        registry.provide_value("offline", False, override=True)
+
+        ctx = registry.require("ctx")
+        ctx.is_toplevel.return_value = True
+        ctx.path.abspath.return_value = "app"
+
+        manager = DependencyManager(
+            registry=registry,
+            dependency_cache=dependency_cache,
+            ctx=ctx,
+            git=mock.Mock(),
+            options=mock.Mock(),
+            skip_internal=False,
+            resolve_jobs=resolve_jobs,
+        )
+
+        def recurse(paths, mandatory):
+            manager.load_dependencies(paths[0])
+
+        ctx.recurse.side_effect = recurse
+
+        manager.load_dependencies(os.path.join(testdirectory.path(), "app"))
+        manager.shutdown()
+
+        return list(dependency_cache.keys()), threads
+
+    serial_order, serial_threads = resolve(resolve_jobs=1)
+    parallel_order, parallel_threads = resolve(resolve_jobs=4)
+
+    # Children are added before their parents
+    assert serial_order == ["baz", "foo", "bar"]
+    assert parallel_order == serial_order
+
+    assert serial_threads == {threading.get_ident()}
+    assert threading.get_ident() not in parallel_threads
+
+
+def test_dependency_manager_plan_sha1_mismatch(testdirectory):
+    # The dependency graph is app -> foo -> baz and app -> bar -> baz, but
+    # foo and bar specify baz differently. The mismatch must be found while
+    # planning, i.e. before recursing any of the dependencies.
+    resolve_json = {
+        "app": [("foo", "foo.zip"), ("bar", "bar.zip")],
+        "foo": [("baz", "baz.zip")],
+        "bar": [("baz", "other.zip")],
+    }
+
+    dependencies = {}
+    for name, children in resolve_json.items():
+        dependencies[name] = [
+            {"name": child, "resolver": "http", "source": source}
+            for child, source in children
+        ]
+
+    app = testdirectory.mkdir("app")
+    app.write_text("resolve.json", json.dumps(dependencies["app"]), encoding="utf-8")
+
+    registry = Registry()
+
+    def dependency_chain(dependency):
+        resolver = mock.Mock()
+        resolver.resolve.return_value = dependency.name
+        return resolver
+
+    registry.provide_function("dependency_chain", dependency_chain, override=True)
+    registry.provide_value("offline", False, override=True)
+
+    resolve_json_reader = mock.Mock()
+    resolve_json_reader.read_pinned.return_value = None
+    resolve_json_reader.read.side_effect = lambda dependency, future: dependencies[
+        future.result()
+    ]
+
+    ctx = mock.Mock()
+    ctx.is_toplevel.return_value = True
+
+    manager = DependencyManager(
+        registry=registry,
+        dependency_cache=OrderedDict(),
+        ctx=ctx,
+        git=mock.Mock(),
+        options=mock.Mock(),
+        skip_internal=False,
+        resolve_jobs=4,
+        resolve_json_reader=resolve_json_reader,
+    )
+
+    with pytest.raises(WurfError, match="SHA1 mismatch") as excinfo:
+        manager.load_dependencies(app.path())
+
+    manager.shutdown()
+
+    assert ctx.recurse.called is False
+
+    # The projects are reported by path as when recursing the dependencies
+    assert "Adding baz in bar:" in str(excinfo.value)
+    assert "First added by foo:" in str(excinfo.value)
+
+
+def test_dependency_manager_plan_pinned_sha1_mismatch(testdirectory):
+    # As above, but the resolve.json files can be read without resolving
+    # foo and bar. The mismatch must be found before any dependency is
+    # resolved ahead of time.
+    resolve_json = {
+        "app": [("foo", "foo.zip"), ("bar", "bar.zip")],
+        "foo": [("baz", "baz.zip")],
+        "bar": [("baz", "other.zip")],
+    }
+
+    dependencies = {}
+    for name, children in resolve_json.items():
+        dependencies[name] = [
+            {"name": child, "resolver": "http", "source": source}
+            for child, source in children
+        ]
+
+    app = testdirectory.mkdir("app")
+    app.write_text("resolve.json", json.dumps(dependencies["app"]), encoding="utf-8")
+
+    registry = Registry()
+
+    def dependency_chain(dependency):
+        resolver = mock.Mock()
+        resolver.resolve.return_value = os.path.join("resolved", dependency.name)
+        return resolver
+
+    registry.provide_function("dependency_chain", dependency_chain, override=True)
+    registry.provide_value("offline", False, override=True)
+
+    resolve_json_reader = mock.Mock()
+    resolve_json_reader.read_pinned.side_effect = lambda dependency: dependencies.get(
+        dependency.name, []
+    )
+
+    ctx = mock.Mock()
+    ctx.is_toplevel.return_value = True
+
+    manager = DependencyManager(
+        registry=registry,
+        dependency_cache=OrderedDict(),
+        ctx=ctx,
+        git=mock.Mock(),
+        options=mock.Mock(),
+        skip_internal=False,
+        resolve_jobs=4,
+        resolve_json_reader=resolve_json_reader,
+    )
+
+    with pytest.raises(WurfError, match="SHA1 mismatch") as excinfo:
+        manager.load_dependencies(app.path())
+
+    manager.shutdown()
+
+    assert manager.prefetched == {}
+    assert resolve_json_reader.read.called is False
+
+    bar = os.path.join("resolved", "bar")
+    foo = os.path.join("resolved", "foo")
+    assert f"Adding baz in {bar}:" in str(excinfo.value)
+    assert f"First added by {foo}:" in str(excinfo.value)
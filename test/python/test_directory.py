@@ -2,7 +2,9 @@
 # encoding: utf-8
 
 import os
+import pytest
 
+from wurf.directory import atomic_directory
 from wurf.directory import copy_directory
 from wurf.directory import remove_directory
 
@@ -51,3 +53,32 @@ def testdirectory_unicode(testdirectory):
 
     assert not testdirectory.contains_dir(foo_dir.path())
     assert not testdirectory.contains_dir(bar_dir.path())
+
+
+def test_atomic_directory(testdirectory):
+    path = os.path.join(testdirectory.path(), "foo")
+
+    with atomic_directory(path=path) as temp_path:
+        assert not os.path.exists(temp_path)
+
+        os.makedirs(temp_path)
+        testdirectory.from_path(temp_path).write_text(
+            "test.txt", data="ok", encoding="utf-8"
+        )
+
+        # The directory is not visible until the with block completes
+        assert not os.path.exists(path)
+
+    assert testdirectory.join("foo").contains_file("test.txt")
+    assert not os.path.exists(temp_path)
+
+    # A failed operation does not leave a directory behind
+    path = os.path.join(testdirectory.path(), "bar")
+
+    with pytest.raises(RuntimeError):
+        with atomic_directory(path=path) as temp_path:
+            os.makedirs(temp_path)
+            raise RuntimeError("Interrupted")
+
+    assert not os.path.exists(path)
+    assert not os.path.exists(temp_path)
@@ -0,0 +1,124 @@
+import os
+import mock
+import hashlib
+import pytest
+
+from wurf.download_cache import DownloadCache
+from wurf.error import WurfError
+
+
+def test_download_cache(testdirectory):
+    cache_path = os.path.join(testdirectory.path(), "cache")
+    content = b"hello_world"
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    def download(source, cwd, filename, hasher, part_path, validators, stream):
+        hasher.update(content)
+        testdirectory.from_path(cwd).write_binary("file.zip", content)
+        return os.path.join(cwd, "file.zip")
+
+    url_download = mock.Mock()
+    url_download.download.side_effect = download
+
+    cache = DownloadCache(url_download=url_download, cache_path=cache_path)
+
+    source = "http://example.com/file.zip"
+    foo = testdirectory.mkdir("foo")
+    bar = testdirectory.mkdir("bar")
+    baz = testdirectory.mkdir("baz")
+
+    assert cache.lookup(source=source) is None
+
+    path = cache.download(source=source, cwd=foo.path())
+    assert path == os.path.join(foo.path(), "file.zip")
+    assert foo.contains_file("file.zip")
+
+    assert cache.lookup(source=source) == {"sha256": sha256, "filename": "file.zip"}
+
+    # The second download uses the cache
+    path = cache.download(source=source, cwd=bar.path(), filename="bar.zip")
+    assert path == os.path.join(bar.path(), "bar.zip")
+    assert url_download.download.call_count == 1
+
+    # The files are shared
+    assert os.path.samefile(
+        os.path.join(foo.path(), "file.zip"), os.path.join(bar.path(), "bar.zip")
+    )
+
+    # The same content from another url is found by its sha256
+    path = cache.download(
+        source="http://mirror.example.com/file.zip", cwd=baz.path(), sha256=sha256
+    )
+    assert os.path.isfile(path)
+    assert url_download.download.call_count == 1
+
+
+def test_download_cache_sha256(testdirectory):
+    cache_path = os.path.join(testdirectory.path(), "cache")
+
+    def download(source, cwd, filename, hasher, part_path, validators, stream):
+        hasher.update(b"hello_world")
+        testdirectory.from_path(cwd).write_binary("file.zip", b"hello_world")
+        return os.path.join(cwd, "file.zip")
+
+    url_download = mock.Mock()
+    url_download.download.side_effect = download
+
+    cache = DownloadCache(url_download=url_download, cache_path=cache_path)
+
+    with pytest.raises(WurfError) as e:
+        cache.download(
+            source="http://example.com/file.zip",
+            cwd=testdirectory.path(),
+            sha256="0" * 64,
+        )
+
+    assert "Failed integrity check" in str(e.value)
+
+    # Nothing is stored
+    assert cache.lookup(source="http://example.com/file.zip") is None
+    assert not os.path.isdir(os.path.join(cache_path, "files"))
+
+
+def test_download_cache_revalidate(testdirectory):
+    cache_path = os.path.join(testdirectory.path(), "cache")
+    content = {"data": b"hello_world", "etag": '"v1"'}
+
+    def download(source, cwd, filename, hasher, part_path, validators, stream):
+        if validators.get("etag", None) == content["etag"]:
+            return None
+
+        hasher.update(content["data"])
+        testdirectory.from_path(cwd).write_binary("file.zip", content["data"])
+        validators.update(etag=content["etag"], last_modified=None)
+        return os.path.join(cwd, "file.zip")
+
+    url_download = mock.Mock()
+    url_download.download.side_effect = download
+
+    cache = DownloadCache(url_download=url_download, cache_path=cache_path)
+
+    source = "http://example.com/file.zip"
+    foo = testdirectory.mkdir("foo")
+    bar = testdirectory.mkdir("bar")
+    baz = testdirectory.mkdir("baz")
+
+    foo_path = cache.download(source=source, cwd=foo.path())
+
+    # Not modified, so the stored file is used
+    bar_path = cache.download(source=source, cwd=bar.path(), revalidate=True)
+    assert url_download.download.call_count == 2
+    assert os.path.samefile(foo_path, bar_path)
+
+    # Modified, so the new file is stored
+    content.update(data=b"hello_world_2", etag='"v2"')
+
+    baz_path = cache.download(source=source, cwd=baz.path(), revalidate=True)
+    assert url_download.download.call_count == 3
+
+    with open(baz_path, "rb") as baz_file:
+        assert baz_file.read() == b"hello_world_2"
+
+    assert cache.lookup(source=source)["sha256"] == (
+        hashlib.sha256(b"hello_world_2").hexdigest()
+    )
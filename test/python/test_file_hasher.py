@@ -0,0 +1,114 @@
+import os
+import hashlib
+
+import mock
+import pytest
+
+from wurf.error import WurfError
+from wurf.file_hasher import FileHasher
+
+
+def test_file_hasher(testdirectory):
+    one = testdirectory.mkdir("one")
+    two = testdirectory.mkdir("two")
+
+    for directory in [one, two]:
+        directory.write_text("file1.txt", "hello_world1")
+        directory.mkdir("nested").write_binary("file2.bin", b"\x00\x01\x02")
+
+    hasher = FileHasher()
+
+    assert hasher.content_hash(one.path()) == hasher.content_hash(two.path())
+
+    # The content of a file
+    path = os.path.join(one.path(), "file1.txt")
+    assert hasher.content_hash(path) == hashlib.sha1(b"hello_world1").hexdigest()
+
+    # The names are included
+    two.write_text("file3.txt", "")
+    one.write_text("file4.txt", "")
+    assert hasher.content_hash(one.path()) != hasher.content_hash(two.path())
+
+    # Empty directories are included
+    os.remove(os.path.join(two.path(), "file3.txt"))
+    os.remove(os.path.join(one.path(), "file4.txt"))
+    assert hasher.content_hash(one.path()) == hasher.content_hash(two.path())
+
+    one.mkdir("empty")
+    assert hasher.content_hash(one.path()) != hasher.content_hash(two.path())
+
+    with pytest.raises(WurfError):
+        hasher.content_hash(os.path.join(one.path(), "missing"))
+
+
+def test_file_hasher_cache(testdirectory):
+    testdirectory.write_text("file1.txt", "hello_world1")
+    nested = testdirectory.mkdir("nested")
+    nested.write_text("file2.txt", "hello_world2")
+
+    # Make the files older than the racy period
+    old = 1000000000
+    for path in ["file1.txt", "nested/file2.txt"]:
+        os.utime(os.path.join(testdirectory.path(), path), (old, old))
+
+    cache_path = os.path.join(testdirectory.path(), "cache.json")
+    content_path = nested.path()
+
+    hasher = FileHasher(cache_path=cache_path)
+    digest = hasher.content_hash(content_path)
+    hasher.write()
+
+    assert os.path.isfile(cache_path)
+
+    # The digests are read from the cache, so the file is not opened
+    hasher = FileHasher(cache_path=cache_path)
+    hasher.file_hash(os.path.join(testdirectory.path(), "file1.txt"))
+
+    with mock.patch("wurf.file_hasher.open", create=True) as mock_open:
+        mock_open.side_effect = AssertionError("File should not be read")
+        hasher.file_hash(os.path.join(nested.path(), "file2.txt"))
+
+    assert hasher.content_hash(content_path) == digest
+
+    # A changed file is read again
+    nested.write_text("file2.txt", "hello_world3")
+    assert hasher.content_hash(content_path) != digest
+
+
+def test_file_hasher_compare(testdirectory):
+    testdirectory.write_text("file1.txt", "hello_world1")
+    nested = testdirectory.mkdir("nested")
+    nested.write_text("file2.txt", "hello_world2")
+    nested.write_text("file3.txt", "hello_world3")
+
+    hasher = FileHasher()
+    expected = hasher.content_tree(testdirectory.path())
+
+    assert FileHasher.compare(expected=expected, actual=expected) == []
+
+    nested.write_text("file2.txt", "changed")
+    os.remove(os.path.join(nested.path(), "file3.txt"))
+    testdirectory.write_text("file4.txt", "hello_world4")
+
+    actual = hasher.content_tree(testdirectory.path())
+
+    assert FileHasher.compare(expected=expected, actual=actual) == [
+        ("added", "file4.txt"),
+        ("modified", "nested/file2.txt"),
+        ("removed", "nested/file3.txt"),
+    ]
+
+    # A file replaced by a directory
+    os.remove(os.path.join(testdirectory.path(), "file1.txt"))
+    testdirectory.mkdir("file1.txt")
+
+    actual = hasher.content_tree(testdirectory.path())
+    assert ("modified", "file1.txt") in FileHasher.compare(
+        expected=expected, actual=actual
+    )
+
+    # The hash tree of a file
+    path = os.path.join(nested.path(), "file2.txt")
+    tree = hasher.content_tree(path)
+    assert tree == {"kind": "file", "digest": hasher.file_hash(path)}
+    assert FileHasher.compare(expected=tree, actual=expected) == [("modified", ".")]
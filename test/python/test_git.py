@@ -1,3 +1,4 @@
+import os
 import mock
 
 from wurf.git import Git
@@ -29,29 +30,60 @@ def test_git_current_commit():
     )
 
 
+def test_git_head():
+    ctx = mock.Mock()
+    ctx.cmd_and_log.return_value = "1" * 40 + "\nrefs/heads/main\n"
+
+    git = Git("/bin/git_binary", ctx)
+
+    assert git.head(cwd="/tmp") == ("1" * 40, "refs/heads/main")
+    ctx.cmd_and_log.assert_called_once_with(
+        ["/bin/git_binary", "rev-parse", "HEAD", "--symbolic-full-name", "HEAD"],
+        cwd="/tmp",
+    )
+
+    # In detached HEAD state
+    ctx.cmd_and_log.return_value = "1" * 40 + "\nHEAD\n"
+
+    assert git.head(cwd="/tmp") == ("1" * 40, None)
+    assert git.is_detached_head(cwd="/tmp") is True
+
+
 def test_git_current_tag(testdirectory):
     ctx = mock.Mock()
-    ctx.cmd_and_log.side_effect = ["044d59505f3b63645c7fb7dec145154b8e518086", "2.0.0"]
+    ctx.cmd_and_log.side_effect = [
+        "044d59505f3b63645c7fb7dec145154b8e518086\nHEAD",
+        "refs/tags/1.0.0 " + "1" * 40 + "  \n"
+        "refs/tags/2.0.0 044d59505f3b63645c7fb7dec145154b8e518086  \n",
+    ]
 
     git = Git("/bin/git_binary", ctx)
 
     assert git.current_tag(cwd="/tmp") == "2.0.0"
+    assert ctx.cmd_and_log.call_count == 2
 
-    ctx.cmd_and_log.assert_has_calls(
-        [
-            mock.call(["/bin/git_binary", "rev-parse", "HEAD"], cwd="/tmp"),
-            mock.call(
-                [
-                    "/bin/git_binary",
-                    "tag",
-                    "--points-at",
-                    "044d59505f3b63645c7fb7dec145154b8e518086",
-                ],
-                cwd="/tmp",
-            ),
-        ]
+
+def test_git_branch():
+    ctx = mock.Mock()
+
+    git = Git("/bin/git_binary", ctx)
+
+    refs = (
+        "refs/heads/main " + "1" * 40 + "  \n"
+        "refs/remotes/origin/HEAD " + "1" * 40 + "  refs/remotes/origin/main\n"
+        "refs/remotes/origin/main " + "1" * 40 + "  \n"
+        "refs/remotes/origin/feature " + "2" * 40 + "  \n"
     )
 
+    ctx.cmd_and_log.side_effect = ["1" * 40 + "\nrefs/heads/main", refs]
+    assert git.branch(cwd="/tmp") == ("main", ["feature"])
+
+    ctx.cmd_and_log.side_effect = ["1" * 40 + "\nHEAD", refs]
+    assert git.branch(cwd="/tmp") == ("(HEAD detached at 1111111)", ["main", "feature"])
+
+    ctx.cmd_and_log.side_effect = [refs]
+    assert git.branches(cwd="/tmp") == ["main", "feature"]
+
 
 def test_git_clone():
     ctx = mock.Mock()
@@ -132,3 +164,119 @@ def test_git_pull_submodules(testdirectory):
     ctx.cmd_and_log.side_effect = check_command
 
     git.pull_submodules(cwd=cwd)
+
+
+def test_git_ls_tree():
+    ctx = mock.Mock()
+    ctx.cmd_and_log.return_value = "resolve.json\nsrc\nwscript\n"
+
+    git = Git("/bin/git_binary", ctx)
+
+    names = git.ls_tree(cwd="/tmp", revision="refs/tags/1.0.0")
+    assert names == ["resolve.json", "src", "wscript"]
+
+    ctx.cmd_and_log.assert_called_once_with(
+        [
+            "/bin/git_binary",
+            "--git-dir",
+            os.path.join("/tmp", ".git"),
+            "ls-tree",
+            "--name-only",
+            "refs/tags/1.0.0",
+        ],
+        cwd="/tmp",
+    )
+
+
+def test_git_show():
+    ctx = mock.Mock()
+    ctx.cmd_and_log.return_value = "[]"
+
+    git = Git("/bin/git_binary", ctx)
+
+    assert git.show(cwd="/tmp", revision="1.0.0", path="resolve.json") == "[]"
+
+    ctx.cmd_and_log.assert_called_once_with(
+        [
+            "/bin/git_binary",
+            "--git-dir",
+            os.path.join("/tmp", ".git"),
+            "show",
+            "1.0.0:resolve.json",
+        ],
+        cwd="/tmp",
+    )
+
+
+def test_git_clone_shared():
+    ctx = mock.Mock()
+    git = Git("/bin/git_binary", ctx)
+
+    git.clone(
+        repository="/tmp/default",
+        directory="/tmp/1234567890",
+        cwd="/tmp",
+        shared=True,
+        no_checkout=True,
+    )
+
+    ctx.cmd_and_log.assert_called_once_with(
+        [
+            "/bin/git_binary",
+            "clone",
+            "/tmp/default",
+            "/tmp/1234567890",
+            "--shared",
+            "--no-checkout",
+        ],
+        cwd="/tmp",
+    )
+
+
+def test_git_clone_reference():
+    ctx = mock.Mock()
+    git = Git("/bin/git_binary", ctx)
+
+    git.clone(
+        repository="https://github.com/foo/bar.git",
+        directory="/tmp/default",
+        cwd="/tmp",
+        reference="/mirrors/github.com/foo/bar.git",
+    )
+
+    ctx.cmd_and_log.assert_called_once_with(
+        [
+            "/bin/git_binary",
+            "clone",
+            "https://github.com/foo/bar.git",
+            "/tmp/default",
+            "--reference",
+            "/mirrors/github.com/foo/bar.git",
+        ],
+        cwd="/tmp",
+    )
+
+
+def test_git_remote_update():
+    ctx = mock.Mock()
+    git = Git("/bin/git_binary", ctx)
+
+    git.remote_update(cwd="/tmp")
+
+    ctx.cmd_and_log.assert_called_once_with(
+        ["/bin/git_binary", "remote", "update"], cwd="/tmp"
+    )
+
+
+def test_git_has_object():
+    ctx = mock.Mock()
+    git = Git("/bin/git_binary", ctx)
+
+    assert git.has_object(cwd="/tmp", revision="1.0.0") is True
+
+    ctx.cmd_and_log.assert_called_once_with(
+        ["/bin/git_binary", "cat-file", "-e", "1.0.0^{commit}"], cwd="/tmp"
+    )
+
+    ctx.cmd_and_log.side_effect = Exception("fatal: Not a valid object name")
+    assert git.has_object(cwd="/tmp", revision="1.2.0") is False
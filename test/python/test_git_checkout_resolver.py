@@ -2,6 +2,8 @@ import os
 import mock
 
 from wurf.git_checkout_resolver import GitCheckoutResolver
+from wurf.git_copy_checkout import GitCopyCheckout
+from wurf.git_ref_index import GitRefIndex
 
 
 def test_git_checkout_resolver(testdirectory):
@@ -21,7 +23,12 @@ def test_git_checkout_resolver(testdirectory):
     dependency.name = "links"
     checkout = "my-branch"
 
-    git.branches = mock.Mock(return_value=["master", checkout])
+    git.ref_index.return_value = GitRefIndex(
+        lines=[
+            "refs/heads/master " + "1" * 40 + "  ",
+            f"refs/remotes/origin/{checkout} " + "2" * 40 + "  ",
+        ]
+    )
 
     resolver = GitCheckoutResolver(
         git=git,
@@ -29,6 +36,7 @@ def test_git_checkout_resolver(testdirectory):
         ctx=ctx,
         dependency=dependency,
         cwd=cwd,
+        checkout_strategy=GitCopyCheckout(git=git),
         checkout=checkout,
     )
 
@@ -37,7 +45,10 @@ def test_git_checkout_resolver(testdirectory):
     # The checkout path should now exist
     assert os.path.isdir(path)
 
-    git.checkout.assert_called_once_with(branch=checkout, cwd=path)
+    # The checkout is created in a temporary folder, which is renamed
+    git.checkout.assert_called_once_with(
+        branch=checkout, cwd=f"{path}.{os.getpid()}.tmp"
+    )
     git.pull_submodules.assert_called_once_with(cwd=path)
 
     # Reset the git mock
@@ -0,0 +1,85 @@
+import os
+import mock
+
+from wurf.file_lock import FileLock
+from wurf.git_mirror import GitMirror
+from wurf.git_url_parser import GitUrlParser
+
+
+def test_git_mirror(testdirectory):
+    mirror_path = os.path.join(testdirectory.path(), "mirrors")
+    url = "https://github.com/steinwurf/links.git"
+
+    git = mock.Mock()
+
+    def fake_git_clone(repository, directory, cwd, mirror):
+        os.makedirs(os.path.join(cwd, directory))
+
+    git.clone = mock.Mock(side_effect=fake_git_clone)
+
+    mirror = GitMirror(
+        git=git,
+        ctx=mock.Mock(),
+        git_url_parser=GitUrlParser(),
+        mirror_path=mirror_path,
+    )
+
+    source = "github.com/steinwurf/links.git"
+    path = os.path.join(mirror_path, "github.com", "steinwurf", "links.git")
+    assert mirror.path(source=source) == path
+
+    # The mirror is always inside the store
+    assert mirror.path(source="file:///tmp/links.git").startswith(mirror_path)
+
+    assert mirror.update(source=source, repository=url) == path
+    assert os.path.isdir(path)
+    assert os.path.isfile(path + ".lock")
+    assert git.clone.call_count == 1
+    assert git.clone.call_args[1]["mirror"] is True
+
+    # The mirror is only updated once
+    assert mirror.update(source=source, repository=url) == path
+    assert git.clone.call_count == 1
+    assert git.remote_update.called is False
+
+    # The same repository using a different protocol in a new resolve
+    mirror = GitMirror(
+        git=git,
+        ctx=mock.Mock(),
+        git_url_parser=GitUrlParser(),
+        mirror_path=mirror_path,
+    )
+
+    source = "git@github.com:steinwurf/links.git"
+    assert mirror.update(source=source, repository=source) == path
+    assert git.clone.call_count == 1
+    git.remote_update.assert_called_once_with(cwd=path)
+
+
+def test_git_mirror_failed_clone(testdirectory):
+    git = mock.Mock()
+    git.clone.side_effect = Exception("network down")
+
+    mirror = GitMirror(
+        git=git,
+        ctx=mock.Mock(),
+        git_url_parser=GitUrlParser(),
+        mirror_path=testdirectory.path(),
+    )
+
+    url = "https://github.com/steinwurf/links.git"
+    assert mirror.update(source=url, repository=url) is None
+
+
+def test_file_lock(testdirectory):
+    path = os.path.join(testdirectory.path(), "test.lock")
+
+    with FileLock(path=path) as lock:
+        assert lock.lock_file is not None
+
+    assert os.path.isfile(path)
+    assert lock.lock_file is None
+
+    # The lock can be acquired again
+    lock.acquire()
+    lock.release()
@@ -0,0 +1,61 @@
+import mock
+
+from wurf.git import Git
+from wurf.git_ref_index import GitRefIndex
+
+
+def test_git_ref_index():
+    lines = [
+        "refs/heads/main " + "1" * 40 + "  ",
+        "refs/heads/feature/foo " + "2" * 40 + "  ",
+        "refs/remotes/origin/HEAD " + "1" * 40 + "  refs/remotes/origin/main",
+        "refs/remotes/origin/main " + "1" * 40 + "  ",
+        "refs/remotes/origin/release/1.x " + "3" * 40 + "  ",
+        # A lightweight and an annotated tag
+        "refs/tags/1.0.0 " + "4" * 40 + "  ",
+        "refs/tags/2.0.0 " + "5" * 40 + " " + "6" * 40 + " ",
+    ]
+
+    refs = GitRefIndex(lines=lines)
+
+    assert refs.tags() == ["1.0.0", "2.0.0"]
+    assert refs.local_branches() == ["feature/foo", "main"]
+    assert refs.remote_branches() == ["main", "release/1.x"]
+    assert refs.default_branch() == "main"
+
+    assert refs.tags_at("4" * 40) == ["1.0.0"]
+    assert refs.tags_at("6" * 40) == ["2.0.0"]
+    assert refs.tags_at("1" * 40) == []
+
+    assert refs.is_branch("main")
+    assert refs.is_branch("release/1.x")
+    assert not refs.is_branch("1.0.0")
+
+    assert refs.commit_id("1.0.0") == "4" * 40
+    assert refs.commit_id("2.0.0") == "6" * 40
+    assert refs.commit_id("feature/foo") == "2" * 40
+    assert refs.commit_id("origin/release/1.x") == "3" * 40
+    assert refs.commit_id("origin") == "1" * 40
+    assert refs.commit_id("refs/tags/1.0.0") == "4" * 40
+
+    # Commit ids are not refs
+    assert refs.commit_id("7" * 40) is None
+
+    assert GitRefIndex(lines=[]).default_branch() is None
+
+
+def test_git_for_each_ref():
+    ctx = mock.Mock()
+    ctx.cmd_and_log.return_value = "refs/tags/1.0.0 " + "4" * 40 + "  \n"
+
+    git = Git("/bin/git_binary", ctx)
+
+    assert git.ref_index(cwd="/tmp").tags() == ["1.0.0"]
+    ctx.cmd_and_log.assert_called_once_with(
+        [
+            "/bin/git_binary",
+            "for-each-ref",
+            "--format=%(refname) %(objectname) %(*objectname) %(symref)",
+        ],
+        cwd="/tmp",
+    )
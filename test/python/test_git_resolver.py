@@ -1,6 +1,10 @@
 import os
 import mock
+import pytest
 
+from wurf.error import DependencyError
+
+from wurf.git_ref_index import GitRefIndex
 from wurf.git_resolver import GitResolver
 
 
@@ -16,7 +20,7 @@ def test_git_resolver(testdirectory):
 
     # GitResolver checks that the directory is created during git.clone,
     # so we create it within the testdirectory as a side effect
-    def fake_git_clone(repository, directory, cwd):
+    def fake_git_clone(repository, directory, cwd, **kwargs):
         os.makedirs(os.path.join(cwd, directory))
 
     git.clone = mock.Mock(side_effect=fake_git_clone)
@@ -74,3 +78,133 @@ def test_git_resolver(testdirectory):
     assert git.clone.called is False
     git.pull.assert_called_once_with(cwd=path)
     assert not git.pull_submodules.called
+
+
+def test_git_resolver_mirror(testdirectory):
+    url = "https://gitlab.com/steinwurf/links.git"
+
+    git_url_rewriter = mock.Mock()
+    git_url_rewriter.rewrite_url.return_value = url
+
+    git = mock.Mock()
+    git.default_branch.return_value = "master"
+    git.clone.side_effect = lambda directory, **kwargs: os.makedirs(directory)
+
+    git_mirror = mock.Mock()
+    git_mirror.update.return_value = "/mirrors/gitlab.com/steinwurf/links.git"
+
+    dependency = mock.Mock()
+    dependency.name = "links"
+    dependency.source = "gitlab.com/steinwurf/links.git"
+    dependency.pull_submodules = False
+
+    resolver = GitResolver(
+        git=git,
+        ctx=mock.Mock(),
+        dependency=dependency,
+        git_url_rewriter=git_url_rewriter,
+        cwd=testdirectory.path(),
+        git_mirror=git_mirror,
+    )
+
+    resolver.resolve()
+
+    git_mirror.update.assert_called_once_with(
+        source="gitlab.com/steinwurf/links.git", repository=url
+    )
+    git.clone.assert_called_once_with(
+        repository=url,
+        directory=mock.ANY,
+        cwd=testdirectory.path(),
+        reference="/mirrors/gitlab.com/steinwurf/links.git",
+    )
+
+
+def test_git_resolver_checkout(testdirectory):
+    url = "https://gitlab.com/steinwurf/links.git"
+
+    git_url_rewriter = mock.Mock()
+    git_url_rewriter.rewrite_url.return_value = url
+
+    git = mock.Mock()
+    git.ref_index.return_value = GitRefIndex(lines=["refs/heads/master " + "1" * 40])
+    git.has_object.return_value = True
+
+    dependency = mock.Mock()
+    dependency.name = "links"
+    dependency.pull_submodules = False
+
+    default = testdirectory.mkdir(GitResolver.DEFAULT_BRANCH)
+
+    def create_resolver(checkout):
+        return GitResolver(
+            git=git,
+            ctx=mock.Mock(),
+            dependency=dependency,
+            git_url_rewriter=git_url_rewriter,
+            cwd=testdirectory.path(),
+            checkout=checkout,
+        )
+
+    # The tag is available locally, so we do not pull
+    assert create_resolver(checkout="1.0.0").resolve() == default.path()
+    git.has_object.assert_called_once_with(cwd=default.path(), revision="1.0.0")
+    assert git.pull.called is False
+
+    # The tag is missing
+    git.has_object.return_value = False
+    create_resolver(checkout="2.0.0").resolve()
+    git.pull.assert_called_once_with(cwd=default.path())
+
+    # A branch may have moved, so we always pull
+    git.reset_mock()
+    git.has_object.return_value = True
+    create_resolver(checkout="master").resolve()
+    assert git.has_object.called is False
+    git.pull.assert_called_once_with(cwd=default.path())
+
+
+def test_git_resolver_offline(testdirectory):
+    git_url_rewriter = mock.Mock()
+    git_url_rewriter.rewrite_url.return_value = "https://gitlab.com/links.git"
+
+    git = mock.Mock()
+    git.ref_index.return_value = GitRefIndex(lines=["refs/heads/master " + "1" * 40])
+
+    dependency = mock.Mock()
+    dependency.name = "links"
+    dependency.pull_submodules = True
+
+    def create_resolver(checkout):
+        return GitResolver(
+            git=git,
+            ctx=mock.Mock(),
+            dependency=dependency,
+            git_url_rewriter=git_url_rewriter,
+            cwd=testdirectory.path(),
+            checkout=checkout,
+            offline=True,
+        )
+
+    # The repository has not been cloned
+    with pytest.raises(DependencyError) as e:
+        create_resolver(checkout="1.0.0").resolve()
+    assert "has not been cloned" in str(e.value)
+    assert "has not been cloned" in dependency.offline_miss
+
+    default = testdirectory.mkdir(GitResolver.DEFAULT_BRANCH)
+
+    # The tag is missing
+    git.has_object.return_value = False
+    with pytest.raises(DependencyError) as e:
+        create_resolver(checkout="1.0.0").resolve()
+    assert "1.0.0 is not available" in str(e.value)
+    assert "1.0.0 is not available" in dependency.offline_miss
+
+    # A branch or semver dependency uses what is available
+    assert create_resolver(checkout="master").resolve() == default.path()
+    assert create_resolver(checkout=None).resolve() == default.path()
+
+    assert git.clone.called is False
+    assert git.pull.called is False
+    assert git.pull_submodules.called is False
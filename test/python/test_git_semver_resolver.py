@@ -2,6 +2,8 @@ import os
 import mock
 
 from wurf.git_semver_resolver import GitSemverResolver
+from wurf.git_copy_checkout import GitCopyCheckout
+from wurf.git_ref_index import GitRefIndex
 
 
 def test_git_semver_resolver(testdirectory):
@@ -26,8 +28,13 @@ def test_git_semver_resolver(testdirectory):
     semver_selector = mock.Mock()
     semver_selector.select_tag.return_value = selected_tag
 
-    # Set the return value to a random git sha1
-    git.checkout_to_commit_id = mock.Mock(return_value="8z3f8z3f8z3f8z3f8z3f")
+    # The tag is annotated, so the commit is the peeled object
+    git.ref_index.return_value = GitRefIndex(
+        lines=[
+            "refs/heads/master " + "1" * 40 + "  ",
+            "refs/tags/5.1.0 " + "2" * 40 + " 8z3f8z3f8z3f8z3f8z3f ",
+        ]
+    )
 
     resolver = GitSemverResolver(
         git=git,
@@ -36,6 +43,7 @@ def test_git_semver_resolver(testdirectory):
         semver_selector=semver_selector,
         dependency=dependency,
         cwd=cwd,
+        checkout_strategy=GitCopyCheckout(git=git),
     )
 
     path = resolver.resolve()
@@ -43,6 +51,11 @@ def test_git_semver_resolver(testdirectory):
     # The checkout path should now exist
     assert os.path.isdir(path)
 
-    git.tags.assert_called_once_with(cwd=master_folder.path())
-    git.checkout.assert_called_once_with(branch=selected_tag, cwd=path)
+    git.ref_index.assert_called_once_with(cwd=master_folder.path())
+    semver_selector.select_tag.assert_called_once_with(major=5, tags=["5.1.0"])
+    assert os.path.basename(path) == "8z3f8z3f8z"
+    # The checkout is created in a temporary folder, which is renamed
+    git.checkout.assert_called_once_with(
+        branch=selected_tag, cwd=f"{path}.{os.getpid()}.tmp"
+    )
     git.pull_submodules.assert_called_once_with(cwd=path)
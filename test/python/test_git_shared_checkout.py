@@ -0,0 +1,32 @@
+import os
+import mock
+
+from wurf.git_shared_checkout import GitSharedCheckout
+
+
+def test_git_shared_checkout(testdirectory):
+    git = mock.Mock()
+    git.remote_origin_url.return_value = "https://github.com/acme/foo.git"
+
+    path = os.path.join(testdirectory.path(), "default")
+    checkout_path = os.path.join(testdirectory.path(), "1234567890")
+
+    strategy = GitSharedCheckout(git=git)
+    strategy.create(path=path, checkout_path=checkout_path, checkout="1.0.0")
+
+    git.clone.assert_called_once_with(
+        repository=path,
+        directory=checkout_path,
+        cwd=testdirectory.path(),
+        shared=True,
+        no_checkout=True,
+    )
+    git.fetch.assert_called_once_with(
+        cwd=checkout_path,
+        repository=path,
+        refspec="+refs/remotes/origin/*:refs/remotes/origin/*",
+    )
+    git.set_remote_origin_url.assert_called_once_with(
+        cwd=checkout_path, url="https://github.com/acme/foo.git"
+    )
+    git.checkout.assert_called_once_with(branch="1.0.0", cwd=checkout_path)
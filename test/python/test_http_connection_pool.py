@@ -0,0 +1,95 @@
+import http.server
+import threading
+
+import pytest
+
+from wurf.error import WurfError
+from wurf.http_connection_pool import HttpConnectionPool
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    # Keep-alive requires HTTP/1.1
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/file.txt")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+
+        body = b"hello world"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    connections = []
+
+    class CountingServer(http.server.ThreadingHTTPServer):
+        def process_request(self, request, client_address):
+            connections.append(client_address)
+            super().process_request(request, client_address)
+
+    httpd = CountingServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.connections = connections
+
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield httpd
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_http_connection_pool(server):
+    url = "http://127.0.0.1:{}".format(server.server_address[1])
+
+    pool = HttpConnectionPool()
+
+    for _ in range(3):
+        with pool.get(url=url + "/file.txt") as response:
+            assert response.read() == b"hello world"
+
+    # The redirect is followed on the same connection
+    with pool.get(url=url + "/redirect") as response:
+        assert response.read() == b"hello world"
+
+    assert len(server.connections) == 1
+
+    with pytest.raises(WurfError):
+        with pool.get(url=url + "/missing"):
+            pass
+
+    pool.close()
+    assert pool.idle == {}
+
+
+def test_http_connection_pool_not_read(server):
+    url = "http://127.0.0.1:{}".format(server.server_address[1])
+
+    pool = HttpConnectionPool()
+
+    # A connection with a partially read response is not reused
+    with pool.get(url=url + "/file.txt") as response:
+        assert response.read(5) == b"hello"
+
+    with pool.get(url=url + "/file.txt") as response:
+        assert response.read() == b"hello world"
+
+    assert len(server.connections) == 2
+
+    pool.close()
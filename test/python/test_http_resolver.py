@@ -1,6 +1,8 @@
 import mock
 import os
+import pytest
 
+from wurf.error import DependencyError
 from wurf.http_resolver import HttpResolver
 
 
@@ -9,11 +11,14 @@ def test_http_resolver(testdirectory):
     dependency = mock.Mock()
     ctx = mock.Mock()
     dependency.filename = None
+    dependency.sha256 = None
     dependency.source = "http://example.com/file.zip"
     cwd = testdirectory.path()
 
-    def create_file(cwd, source, filename):
+    def create_file(cwd, source, filename, hasher, part_path, validators, stream):
         assert dependency.source == source
+        assert hasher is None
+        assert part_path == os.path.join(testdirectory.path(), "partial")
         assert filename is None
 
         httpdir = testdirectory.from_path(cwd)
@@ -38,12 +43,15 @@ def test_http_resolver_filename(testdirectory):
     dependency = mock.Mock()
     ctx = mock.Mock()
     dependency.filename = "foo.zip"
+    dependency.sha256 = None
 
     dependency.source = "http://example.com/file.zip"
     cwd = testdirectory.path()
 
-    def create_file(cwd, source, filename):
+    def create_file(cwd, source, filename, hasher, part_path, validators, stream):
         assert dependency.source == source
+        assert hasher is None
+        assert part_path == os.path.join(testdirectory.path(), "partial")
         assert filename == "foo.zip"
 
         httpdir = testdirectory.from_path(cwd)
@@ -61,3 +69,143 @@ def test_http_resolver_filename(testdirectory):
     assert os.path.isfile(path)
 
     assert testdirectory.contains_file("download/foo.zip")
+
+
+def test_http_resolver_offline(testdirectory):
+    url_download = mock.Mock()
+    dependency = mock.Mock()
+    dependency.filename = None
+    dependency.source = "http://example.com/file.zip"
+
+    resolver = HttpResolver(
+        ctx=mock.Mock(),
+        url_download=url_download,
+        dependency=dependency,
+        cwd=testdirectory.path(),
+        offline=True,
+    )
+
+    with pytest.raises(DependencyError) as e:
+        resolver.resolve()
+
+    assert "has not been downloaded" in str(e.value)
+    assert "has not been downloaded" in dependency.offline_miss
+    assert url_download.download.called is False
+
+    # An existing download is used
+    testdirectory.mkdir("download").write_binary("file.zip", b"hello_world")
+
+    path = resolver.resolve()
+    assert os.path.isfile(path)
+
+
+def test_http_resolver_sha256(testdirectory):
+    url_download = mock.Mock()
+    dependency = mock.Mock()
+    dependency.filename = None
+    dependency.sha256 = "0" * 64
+    dependency.source = "http://example.com/file.zip"
+
+    def create_file(cwd, source, filename, hasher, part_path, validators, stream):
+        hasher.update(b"hello_world")
+
+        httpdir = testdirectory.from_path(cwd)
+        httpdir.write_binary("file.zip", b"hello_world")
+
+        return os.path.join(httpdir.path(), "file.zip")
+
+    url_download.download.side_effect = create_file
+
+    resolver = HttpResolver(
+        ctx=mock.Mock(),
+        url_download=url_download,
+        dependency=dependency,
+        cwd=testdirectory.path(),
+    )
+
+    with pytest.raises(DependencyError) as e:
+        resolver.resolve()
+
+    assert "Failed integrity check" in str(e.value)
+
+    # The download is not kept
+    assert not testdirectory.contains_dir("download")
+
+
+def test_http_resolver_download_cache(testdirectory):
+    dependency = mock.Mock()
+    dependency.filename = None
+    dependency.sha256 = None
+    dependency.source = "http://example.com/file.zip"
+
+    download_cache = mock.Mock()
+    download_cache.lookup.return_value = {"sha256": "1234", "filename": "file.zip"}
+
+    def link_file(source, cwd, filename, sha256, stream):
+        testdirectory.from_path(cwd).write_binary("file.zip", b"hello_world")
+        return os.path.join(cwd, "file.zip")
+
+    download_cache.download.side_effect = link_file
+
+    resolver = HttpResolver(
+        ctx=mock.Mock(),
+        url_download=mock.Mock(),
+        dependency=dependency,
+        cwd=testdirectory.path(),
+        offline=True,
+        download_cache=download_cache,
+    )
+
+    # The file is in the cache, so it can be used offline
+    path = resolver.resolve()
+
+    assert path == os.path.join(testdirectory.path(), "download", "file.zip")
+    assert os.path.isfile(path)
+
+
+def test_http_resolver_revalidate(testdirectory):
+    url_download = mock.Mock()
+    dependency = mock.Mock()
+    dependency.filename = None
+    dependency.sha256 = None
+    dependency.source = "http://example.com/file.zip"
+
+    modified = False
+
+    def create_file(cwd, source, filename, hasher, part_path, validators, stream):
+        if validators.get("etag", None) == '"v1"' and not modified:
+            return None
+
+        testdirectory.from_path(cwd).write_binary("file.zip", b"hello_world")
+        validators.update(etag='"v1"', last_modified=None, content_length=11)
+
+        return os.path.join(cwd, "file.zip")
+
+    url_download.download.side_effect = create_file
+
+    resolver = HttpResolver(
+        ctx=mock.Mock(),
+        url_download=url_download,
+        dependency=dependency,
+        cwd=testdirectory.path(),
+        revalidate=True,
+    )
+
+    path = resolver.resolve()
+    assert os.path.isfile(path)
+
+    # The validators are stored next to the download
+    assert testdirectory.contains_file("download.json")
+
+    # The file was not modified, so the existing download is used
+    stat = os.stat(path)
+    assert path == resolver.resolve()
+    assert os.stat(path).st_ino == stat.st_ino
+    assert url_download.download.call_count == 2
+
+    # The file was modified, so the download is replaced
+    modified = True
+    assert path == resolver.resolve()
+    assert os.stat(path).st_ino != stat.st_ino
+
+    assert sorted(os.listdir(testdirectory.path())) == ["download", "download.json"]
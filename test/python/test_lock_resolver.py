@@ -0,0 +1,25 @@
+import os
+import mock
+
+from wurf.file_lock import FileLock
+from wurf.lock_resolver import LockResolver
+
+
+def test_lock_resolver(testdirectory):
+    lock_path = os.path.join(testdirectory.path(), "foo-123456.lock")
+
+    def resolve():
+        # The lock is held while resolving
+        assert os.path.isfile(lock_path)
+        return "/tmp/foo"
+
+    resolver = mock.Mock()
+    resolver.resolve.side_effect = resolve
+
+    lock_resolver = LockResolver(resolver=resolver, lock_path=lock_path)
+
+    assert lock_resolver.resolve() == "/tmp/foo"
+
+    # The lock is released again
+    with FileLock(path=lock_path):
+        pass
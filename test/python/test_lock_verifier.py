@@ -0,0 +1,95 @@
+import json
+import mock
+
+from wurf.lock_verifier import LockVerifier
+from wurf.lock_version_cache import LockVersionCache
+from wurf.resolve_manifest import ResolveManifest
+
+
+def test_lock_verifier(testdirectory):
+    foo = testdirectory.mkdir("foo")
+    foo.write_text("file1.txt", "hello_world1")
+    bar = testdirectory.mkdir("bar")
+    bar.write_text("file2.txt", "hello_world2")
+
+    git = mock.Mock()
+    git.current_commit.return_value = "abcd"
+
+    http_dependency = mock.Mock()
+    http_dependency.name = "foo"
+    http_dependency.sha1 = "1111"
+    http_dependency.source = "http://example.com/foo.zip"
+    http_dependency.resolver = "http"
+    http_dependency.resolver_info = None
+    http_dependency.real_path = foo.path()
+
+    git_dependency = mock.Mock()
+    git_dependency.name = "baz"
+    git_dependency.sha1 = "2222"
+    git_dependency.source = "github.com/acme/baz.git"
+    git_dependency.resolver = "git"
+    git_dependency.resolver_info = None
+    git_dependency.real_path = bar.path()
+
+    lock_cache = LockVersionCache.create_empty(git=git)
+    lock_cache.add_dependency(http_dependency)
+    lock_cache.add_dependency(git_dependency)
+
+    # The "qux" dependency has not been resolved
+    lock_cache.cache["qux"] = {"sha1": "3333", "commit_id": "abcd"}
+
+    manifest = ResolveManifest(resolve_config_path=testdirectory.path())
+
+    for name, sha1, path in [
+        ("foo", "1111", foo.path()),
+        ("baz", "2222", bar.path()),
+        ("unlocked", "4444", bar.path()),
+    ]:
+        config = {"sha1": sha1, "path": path, "is_symlink": False, "real_path": None}
+        manifest.add(name=name, config=config)
+
+    verifier = LockVerifier(
+        lock_cache=lock_cache,
+        resolve_manifest=manifest,
+        resolve_config_path=testdirectory.path(),
+    )
+
+    report = verifier.verify()
+
+    assert report["status"] == "mismatch"
+    assert report["summary"] == {"match": 2, "mismatch": 0, "missing": 2}
+    assert report["dependencies"]["foo"]["status"] == "match"
+    assert report["dependencies"]["baz"]["status"] == "match"
+    assert report["dependencies"]["qux"]["status"] == "missing"
+    assert report["dependencies"]["unlocked"]["status"] == "missing"
+
+    # Change the content of the dependencies
+    foo.write_text("file1.txt", "changed")
+    git.current_commit.return_value = "efgh"
+
+    report = verifier.verify()
+
+    assert report["summary"] == {"match": 0, "mismatch": 2, "missing": 2}
+    assert report["dependencies"]["foo"]["changes"] == [
+        {"change": "modified", "path": "file1.txt"}
+    ]
+    assert report["dependencies"]["baz"]["changes"] == [
+        {"change": "modified", "path": "."}
+    ]
+
+    # Only the given dependencies are verified
+    report = verifier.verify(names=["foo"])
+
+    assert report["summary"] == {"match": 0, "mismatch": 1, "missing": 0}
+
+    message = LockVerifier.format_result(
+        name="foo", result=report["dependencies"]["foo"]
+    )
+    assert 'Lock verification failed for "foo"' in message
+    assert "modified: file1.txt" in message
+
+    report = verifier.verify()
+    path = verifier.write(report=report)
+
+    with open(path, "r") as report_file:
+        assert json.load(report_file) == report
@@ -1,4 +1,7 @@
+import mock
+
 from wurf.lock_version_cache import LockVersionCache
+from wurf.store_lock_version_resolver import StoreLockVersionResolver
 
 
 def test_calculate_file_hash(testdirectory):
@@ -71,3 +74,104 @@ def test_file_hash_persistency(testdirectory):
     hash = LockVersionCache.calculate_file_hash(testdirectory.path())
 
     assert hash == "f2a6105558ea3baad7aed7a10fd55cacd7b65e1c", "Hash should match"
+
+
+def test_check_content(testdirectory):
+    testdirectory.write_text("file1.txt", "hello_world1")
+
+    dependency = mock.Mock()
+    dependency.name = "foo"
+    dependency.resolver = "http"
+    dependency.resolver_info = None
+    dependency.real_path = testdirectory.path()
+
+    lock_cache = LockVersionCache.create_empty(git=mock.Mock())
+    lock_cache.add_dependency(dependency)
+
+    assert "content_hash" in lock_cache.cache["foo"]
+    assert "content_tree" in lock_cache.cache["foo"]
+    assert "file_hash" not in lock_cache.cache["foo"]
+    assert not lock_cache.check_content(dependency, testdirectory.path())
+
+    testdirectory.write_text("file2.txt", "hello_world2")
+    assert lock_cache.check_content(dependency, testdirectory.path())
+
+    # The changed files are reported
+    changes = lock_cache.content_changes(dependency, testdirectory.path())
+    assert changes == [("added", "file2.txt")]
+
+    # Lock files written without the content_tree
+    del lock_cache.cache["foo"]["content_tree"]
+    changes = lock_cache.content_changes(dependency, testdirectory.path())
+    assert changes == [("modified", ".")]
+
+    # Lock files of earlier versions contain a file_hash
+    lock_cache.cache["foo"] = {
+        "file_hash": LockVersionCache.calculate_file_hash(testdirectory.path())
+    }
+    assert not lock_cache.check_content(dependency, testdirectory.path())
+
+
+def test_check_resolved(testdirectory):
+    git = mock.Mock()
+    git.current_commit.return_value = "abc1234"
+
+    lock_cache = LockVersionCache(
+        git=git,
+        cache={"foo": {"commit_id": "abc1234"}, "bar": {"content_hash": "123"}},
+    )
+
+    foo = mock.Mock()
+    foo.name = "foo"
+    foo.resolver = "git"
+
+    assert not lock_cache.check_resolved(foo, testdirectory.path())
+
+    git.current_commit.return_value = "def5678"
+    assert lock_cache.check_resolved(foo, testdirectory.path())
+
+    # The content of http dependencies is verified after the resolve
+    bar = mock.Mock()
+    bar.name = "bar"
+    bar.resolver = "http"
+
+    assert not lock_cache.check_resolved(bar, testdirectory.path())
+
+
+def test_store_lock_version_resolver(testdirectory):
+    testdirectory.write_text("file1.txt", "hello_world1")
+
+    lock_cache_from = LockVersionCache.create_empty(git=mock.Mock())
+    lock_cache_from.cache["foo"] = {"sha1": "1111", "content_hash": "abcd"}
+
+    lock_cache_to = LockVersionCache.create_empty(git=mock.Mock())
+
+    resolver = mock.Mock()
+    resolver.resolve.return_value = testdirectory.path()
+
+    dependency = mock.Mock()
+    dependency.name = "foo"
+    dependency.sha1 = "2222"
+    dependency.source = "http://example.com/foo.zip"
+    dependency.resolver = "http"
+    dependency.resolver_info = None
+    dependency.real_path = testdirectory.path()
+    dependency.__contains__ = mock.Mock(return_value=True)
+
+    store_resolver = StoreLockVersionResolver(
+        resolver=resolver,
+        lock_cache_to=lock_cache_to,
+        dependency=dependency,
+        lock_cache_from=lock_cache_from,
+    )
+
+    # The entry of a dependency resolved from the lock is kept
+    dependency.from_lock = True
+    store_resolver.resolve()
+    assert lock_cache_to.cache["foo"] == {"sha1": "1111", "content_hash": "abcd"}
+
+    # An updated dependency is hashed
+    dependency.from_lock = False
+    store_resolver.resolve()
+    assert lock_cache_to.cache["foo"]["sha1"] == "2222"
+    assert "content_tree" in lock_cache_to.cache["foo"]
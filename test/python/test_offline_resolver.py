@@ -0,0 +1,35 @@
+import mock
+import pytest
+
+from wurf.offline_resolver import OfflineResolver
+from wurf.error import WurfError
+
+
+def test_offline_resolver():
+    resolver = mock.Mock()
+    resolver.resolve.return_value = "/tmp/foo"
+
+    dependency = mock.Mock()
+    dependency.offline_miss = None
+
+    offline_misses = []
+
+    offline_resolver = OfflineResolver(
+        resolver=resolver, dependency=dependency, offline_misses=offline_misses
+    )
+
+    assert offline_resolver.resolve() == "/tmp/foo"
+
+    # Other errors are not collected
+    resolver.resolve.side_effect = WurfError("failed")
+
+    with pytest.raises(WurfError):
+        offline_resolver.resolve()
+
+    assert offline_misses == []
+
+    # The dependency is not available offline, so it is skipped
+    dependency.offline_miss = "Offline: not available"
+
+    assert offline_resolver.resolve() is None
+    assert offline_misses == [dependency]
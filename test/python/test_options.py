@@ -130,6 +130,46 @@ def test_user_path_to_dependency():
     assert options.path(dependency=dependency) == "/home/stw/code1"
 
 
+def test_add_dependency_parse_once():
+    parser = argparse.ArgumentParser()
+    args = ["build", "--bar_che=1.0.0", "--baz_path", "/tmp/baz", "-v"]
+
+    options = Options(
+        args=args,
+        parser=parser,
+        default_resolve_path="resolve_path",
+        default_symlinks_path="symlinks_path",
+        supported_git_protocols="",
+    )
+
+    with mock.patch.object(
+        parser, "parse_known_args", wraps=parser.parse_known_args
+    ) as parse_known_args:
+        dependencies = []
+
+        for name in ["foo", "bar", "baz"]:
+            dependency = mock.Mock()
+            dependency.name = name
+            dependency.resolver = "git"
+            dependencies.append(dependency)
+
+            options.add_dependency(dependency)
+
+        # The arguments are only parsed again for the options passed, here
+        # using an abbreviation for --bar_checkout
+        assert parse_known_args.call_count == 2
+
+    foo, bar, baz = dependencies
+
+    assert options.path(dependency=foo) is None
+    assert options.checkout(dependency=foo) is None
+    assert options.path(dependency=bar) is None
+    assert options.checkout(dependency=bar) == "1.0.0"
+    assert options.path(dependency=baz) == "/tmp/baz"
+    assert options.checkout(dependency=baz) is None
+    assert options.unknown_args == ["build", "-v"]
+
+
 def test_git_protocol():
     parser = argparse.ArgumentParser()
     args = ["--foo", "-b"]
@@ -204,3 +244,41 @@ def test_exclusive_lock_options():
             default_symlinks_path="symlinks_path",
             supported_git_protocols="",
         )
+
+
+def test_update_lock():
+    parser = argparse.ArgumentParser()
+
+    options = Options(
+        args=[],
+        parser=parser,
+        default_resolve_path="resolve_path",
+        default_symlinks_path="symlinks_path",
+        supported_git_protocols="",
+    )
+
+    assert options.update_lock() == []
+
+    parser = argparse.ArgumentParser()
+
+    options = Options(
+        args=["--update_lock", "foo, bar"],
+        parser=parser,
+        default_resolve_path="resolve_path",
+        default_symlinks_path="symlinks_path",
+        supported_git_protocols="",
+    )
+
+    assert options.update_lock() == ["foo", "bar"]
+
+    # The lock file is updated, so it cannot be written at the same time
+    parser = argparse.ArgumentParser()
+
+    with pytest.raises(WurfError):
+        Options(
+            args=["--update_lock=foo", "--lock_versions"],
+            parser=parser,
+            default_resolve_path="resolve_path",
+            default_symlinks_path="symlinks_path",
+            supported_git_protocols="",
+        )
@@ -1,7 +1,9 @@
+import mock
 import pytest
 
 from wurf.registry import Registry
 from wurf.registry import RegistryCacheOnceError
+from wurf.trace_resolver import TraceResolver
 
 
 class Point(object):
@@ -209,3 +211,88 @@ def test_registry_cache():
         b = registry.require("bar")
         assert b.seen is False
         b.seen = True
+
+
+def test_registry_cache_once_generation():
+    registry = Registry(use_providers=False, use_cache_providers=False)
+
+    calls = []
+
+    def build_value():
+        calls.append("value")
+        return "hello"
+
+    def build_foo(value):
+        calls.append("foo")
+        return object()
+
+    registry.provide_function("value", build_value)
+    registry.provide_function("foo", build_foo)
+    registry.cache_provider(provider_name="foo", once=True)
+
+    foo = registry.require("foo")
+    assert calls == ["value", "foo"]
+
+    # The providers did not change, so the arguments are not injected again
+    assert registry.require("foo") is foo
+    assert calls == ["value", "foo"]
+
+    # Adding a provider makes the registry check the arguments again
+    registry.provide_value("other", 1)
+    assert registry.require("foo") is foo
+    assert calls == ["value", "foo", "value"]
+
+    registry.provide_value("value", "world", override=True)
+
+    with pytest.raises(RegistryCacheOnceError):
+        registry.require("foo")
+
+    # Purging the cache creates a new object
+    registry.purge_cache()
+    assert registry.require("foo") is not foo
+
+
+def test_registry_tracer():
+    registry = Registry(use_providers=False, use_cache_providers=False)
+
+    class Resolver(object):
+        def __init__(self, resolver=None):
+            self.resolver = resolver
+
+        def resolve(self):
+            return "/tmp/foo"
+
+    def build_inner():
+        return Resolver()
+
+    def build_outer(inner):
+        return Resolver(resolver=inner)
+
+    registry.provide_function("inner", build_inner)
+    registry.provide_function("outer", build_outer)
+    registry.provide_value("value", "hello")
+
+    registry.tracer = mock.Mock()
+    registry.tracer.trace.side_effect = lambda resolver, dependency: TraceResolver(
+        resolver=resolver, tracer=registry.tracer, dependency=dependency
+    )
+
+    # Resolvers are only traced while a dependency is provided
+    assert isinstance(registry.require("outer"), Resolver)
+
+    with registry.provide_temporary() as temporary:
+        temporary.provide_value("dependency", "foo")
+
+        outer = registry.require("outer")
+
+        # Both the injected and the required resolver are traced
+        assert isinstance(outer, TraceResolver)
+        assert isinstance(outer.resolver.resolver, TraceResolver)
+        assert outer.dependency == "foo"
+
+        # Values which are not resolvers are not traced
+        assert registry.require("value") == "hello"
+
+        # A traced resolver is not traced again
+        registry.provide_value("traced", outer)
+        assert registry.require("traced") is outer
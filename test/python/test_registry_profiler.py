@@ -0,0 +1,48 @@
+import os
+import json
+
+from wurf.registry import Registry
+from wurf.registry_profiler import RegistryProfiler
+
+
+def test_registry_profiler(testdirectory):
+    path = os.path.join(testdirectory.path(), "profile.json")
+
+    registry = Registry(use_providers=False, use_cache_providers=False)
+    registry.profiler = RegistryProfiler(path=path)
+
+    def build_foo(value):
+        return object()
+
+    def build_bar(foo):
+        return object()
+
+    registry.provide_value("value", 2)
+    registry.provide_function("foo", build_foo)
+    registry.provide_function("bar", build_bar)
+    registry.cache_provider(provider_name="foo", once=True)
+
+    registry.require("bar")
+    registry.require("bar")
+
+    report = {entry["provider"]: entry for entry in registry.profiler.report()}
+
+    assert report["bar"]["calls"] == 2
+    assert report["bar"]["hits"] == 0
+    assert report["bar"]["misses"] == 0
+
+    assert report["foo"]["calls"] == 2
+    assert report["foo"]["hits"] == 1
+    assert report["foo"]["misses"] == 1
+
+    # Only foo requires the value, since its object is cached afterwards
+    assert report["value"]["calls"] == 1
+
+    # The time spent requiring foo is included in the time of bar
+    assert report["bar"]["time"] >= report["foo"]["time"]
+    assert report["bar"]["exclusive_time"] <= report["bar"]["time"]
+
+    registry.profiler.write()
+
+    with open(path, "r") as report_file:
+        assert len(json.load(report_file)) == 3
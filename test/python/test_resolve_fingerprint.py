@@ -0,0 +1,84 @@
+import os
+import collections
+
+from wurf.resolve_fingerprint import ResolveFingerprint
+
+
+def test_resolve_fingerprint_relevant_args():
+    args = [
+        "configure",
+        "--resolve_path",
+        "/tmp/deps",
+        "build",
+        "--resolve_jobs",
+        "4",
+        "--force_resolve",
+        "--skip_internal",
+        "--foo_checkout=1.0.0",
+    ]
+
+    assert ResolveFingerprint.relevant_args(args) == [
+        "--resolve_path",
+        "/tmp/deps",
+        "--skip_internal",
+        "--foo_checkout=1.0.0",
+    ]
+
+
+def test_resolve_fingerprint(testdirectory):
+    build = testdirectory.mkdir("build")
+    app = testdirectory.mkdir("app")
+    app.write_text("resolve.json", "[]", encoding="utf-8")
+
+    foo = testdirectory.mkdir("foo")
+    foo.mkdir(".git").write_text("HEAD", "044d59505f3b63645c7f\n", encoding="utf-8")
+
+    lock_path = os.path.join(app.path(), "lock_version_resolve.json")
+
+    def create_fingerprint(args):
+        return ResolveFingerprint(
+            args=args, files=[lock_path], resolve_config_path=build.path()
+        )
+
+    dependencies = [{"name": "foo", "resolver": "git"}]
+    dependency_cache = collections.OrderedDict(
+        [("foo", {"path": foo.path(), "recurse": True, "added_by": app.path()})]
+    )
+
+    fingerprint = create_fingerprint(args=["configure"])
+    assert fingerprint.load() is None
+
+    fingerprint.add_file(os.path.join(app.path(), "resolve.json"))
+    fingerprint.store(dependencies=dependencies, dependency_cache=dependency_cache)
+
+    # Nothing changed, the commands are not relevant
+    fingerprint = create_fingerprint(args=["configure", "build"])
+    assert fingerprint.load() == (dependencies, dependency_cache)
+
+    # Changed arguments
+    fingerprint = create_fingerprint(args=["configure", "--foo_path=/tmp"])
+    assert fingerprint.load() is None
+
+    # Changed resolve.json
+    app.write_text("resolve.json", "[ ]", encoding="utf-8")
+    fingerprint = create_fingerprint(args=["configure"])
+    assert fingerprint.load() is None
+
+    fingerprint.store(dependencies=dependencies, dependency_cache=dependency_cache)
+    assert fingerprint.load() is not None
+
+    # A lock file was created
+    app.write_text("lock_version_resolve.json", "{}", encoding="utf-8")
+    assert fingerprint.load() is None
+    os.remove(lock_path)
+    assert fingerprint.load() is not None
+
+    # A different commit is checked out
+    foo.write_text(".git/HEAD", "ref: refs/heads/master\n", encoding="utf-8")
+    assert fingerprint.load() is None
+
+    fingerprint.store(dependencies=dependencies, dependency_cache=dependency_cache)
+    assert fingerprint.load() is not None
+
+    fingerprint.clear()
+    assert fingerprint.load() is None
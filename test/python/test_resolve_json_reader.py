@@ -0,0 +1,128 @@
+import os
+import json
+import mock
+
+from wurf.configuration import Configuration
+from wurf.dependency import Dependency
+from wurf.registry import Registry
+from wurf.resolve_json_reader import ResolveJsonReader
+
+
+def create_reader(testdirectory, git, chain=Configuration.RESOLVE, update_lock=()):
+    registry = Registry(use_providers=False)
+    registry.provide_value("dependency_path", testdirectory.path())
+
+    options = mock.Mock()
+    options.path.return_value = None
+    options.checkout.return_value = None
+    options.update_lock.return_value = update_lock
+
+    configuration = mock.Mock()
+    configuration.resolver_chain.return_value = chain
+    configuration.update_lock.return_value = len(update_lock) > 0
+
+    return ResolveJsonReader(
+        registry=registry,
+        ctx=mock.Mock(),
+        git=git,
+        options=options,
+        configuration=configuration,
+    )
+
+
+def test_resolve_json_reader_git(testdirectory):
+    testdirectory.mkdir("default")
+
+    resolve_json = [{"name": "bar", "resolver": "git", "source": "bar.git"}]
+
+    git = mock.Mock()
+    git.ls_tree.return_value = ["resolve.json", "wscript"]
+    git.show.return_value = json.dumps(resolve_json)
+
+    reader = create_reader(testdirectory=testdirectory, git=git)
+
+    dependency = Dependency(
+        name="foo",
+        resolver="git",
+        method="checkout",
+        checkout="1.0.0",
+        source="foo.git",
+    )
+    future = mock.Mock()
+
+    assert reader.read(dependency=dependency, future=future) == resolve_json
+
+    # The file is read from the object store without waiting for the resolve
+    assert future.result.called is False
+
+    repo_path = os.path.join(testdirectory.path(), "default")
+    git.show.assert_called_once_with(
+        cwd=repo_path, revision="refs/tags/1.0.0", path="resolve.json"
+    )
+
+
+def test_resolve_json_reader_lock(testdirectory):
+    testdirectory.mkdir("default")
+
+    git = mock.Mock()
+    git.ls_tree.return_value = ["resolve.json", "wscript"]
+    git.show.return_value = "[]"
+
+    dependency = Dependency(
+        name="foo",
+        resolver="git",
+        method="checkout",
+        checkout="1.0.0",
+        source="foo.git",
+    )
+    dependency.locked_version = {"commit_id": "abc1234", "sha1": dependency.sha1}
+
+    reader = create_reader(
+        testdirectory=testdirectory,
+        git=git,
+        chain=Configuration.RESOLVE_FROM_VERSION_LOCK,
+    )
+
+    assert reader.read_pinned(dependency=dependency) == []
+    assert git.show.call_args[1]["revision"] == "abc1234"
+
+    # When updating the lock file the locked commit may change
+    reader = create_reader(
+        testdirectory=testdirectory,
+        git=git,
+        chain=Configuration.RESOLVE_FROM_VERSION_LOCK,
+        update_lock=["foo"],
+    )
+
+    assert reader.read_pinned(dependency=dependency) == []
+    assert git.show.call_args[1]["revision"] == "refs/tags/1.0.0"
+
+
+def test_resolve_json_reader_path(testdirectory):
+    resolve_json = [{"name": "bar", "resolver": "git", "source": "bar.git"}]
+
+    foo = testdirectory.mkdir("foo")
+    foo.write_text("wscript", "", encoding="utf-8")
+    foo.write_text("resolve.json", json.dumps(resolve_json), encoding="utf-8")
+
+    git = mock.Mock()
+    reader = create_reader(testdirectory=testdirectory, git=git)
+
+    # A semver dependency may resolve to a new tag, so we have to wait for
+    # the resolve to finish
+    dependency = Dependency(
+        name="foo", resolver="git", method="semver", major=1, source="foo.git"
+    )
+    future = mock.Mock()
+    future.result.return_value = foo.path()
+
+    assert reader.read(dependency=dependency, future=future) == resolve_json
+    assert git.show.called is False
+
+    # Without a wscript the resolve.json will not be loaded
+    os.remove(os.path.join(foo.path(), "wscript"))
+    assert reader.read(dependency=dependency, future=future) == []
+
+    # A failed resolve is reported when the dependency is added
+    future.result.side_effect = Exception("failed")
+    assert reader.read(dependency=dependency, future=future) is None
@@ -0,0 +1,90 @@
+import os
+import mock
+
+from wurf.resolve_manifest import ResolveManifest
+from wurf.on_active_store_path_resolver import OnActiveStorePathResolver
+from wurf.on_passive_load_path_resolver import OnPassiveLoadPathResolver
+
+
+def test_resolve_manifest(testdirectory):
+    manifest = ResolveManifest(resolve_config_path=testdirectory.path())
+
+    # No manifest has been written
+    assert manifest.config(name="foo") is None
+
+    manifest.clear()
+    manifest.add(name="foo", config={"sha1": "1234", "path": "/tmp/foo"})
+    manifest.write()
+
+    assert testdirectory.contains_file(ResolveManifest.MANIFEST_FILE)
+
+    manifest = ResolveManifest(resolve_config_path=testdirectory.path())
+    assert manifest.config(name="foo") == {"sha1": "1234", "path": "/tmp/foo"}
+    assert manifest.config(name="bar") is None
+
+    manifest.clear()
+    assert not testdirectory.contains_file(ResolveManifest.MANIFEST_FILE)
+
+
+def test_resolve_manifest_version(testdirectory):
+    testdirectory.write_text(
+        ResolveManifest.MANIFEST_FILE,
+        '{"version": 0, "dependencies": {"foo": {}}}',
+        encoding="utf-8",
+    )
+
+    manifest = ResolveManifest(resolve_config_path=testdirectory.path())
+    assert manifest.config(name="foo") is None
+
+
+def test_resolve_manifest_store_load(testdirectory):
+    foo = testdirectory.mkdir("foo")
+    build = testdirectory.mkdir("build")
+
+    dependency = mock.Mock()
+    dependency.name = "foo"
+    dependency.sha1 = "1234"
+    dependency.is_symlink = False
+    dependency.real_path = None
+
+    resolver = mock.Mock()
+    resolver.resolve.return_value = foo.path()
+
+    manifest = ResolveManifest(resolve_config_path=build.path())
+
+    store = OnActiveStorePathResolver(
+        resolver=resolver,
+        dependency=dependency,
+        resolve_config_path=build.path(),
+        resolve_manifest=manifest,
+    )
+
+    assert store.resolve() == foo.path()
+    assert build.contains_file("foo.resolve.json")
+
+    manifest.write()
+
+    # The dependency config file is not read when the manifest is used
+    os.remove(os.path.join(build.path(), "foo.resolve.json"))
+
+    load = OnPassiveLoadPathResolver(
+        git=mock.Mock(),
+        dependency=dependency,
+        resolve_config_path=build.path(),
+        resolve_path=testdirectory.path(),
+        resolve_manifest=ResolveManifest(resolve_config_path=build.path()),
+    )
+
+    assert load.resolve() == foo.path()
+
+
+def test_resolve_manifest_names(testdirectory):
+    manifest = ResolveManifest(resolve_config_path=testdirectory.path())
+    assert manifest.names() == []
+
+    manifest.add(name="foo", config={"sha1": "1234", "path": "/tmp/foo"})
+    manifest.add(name="bar", config={"sha1": "5678", "path": "/tmp/bar"})
+    manifest.write()
+
+    manifest = ResolveManifest(resolve_config_path=testdirectory.path())
+    assert manifest.names() == ["bar", "foo"]
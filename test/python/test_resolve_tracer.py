@@ -0,0 +1,64 @@
+import os
+import json
+import mock
+
+from wurf.resolve_tracer import ResolveTracer
+
+
+def test_resolve_tracer(testdirectory):
+    path = os.path.join(testdirectory.path(), "trace.json")
+    tracer = ResolveTracer(path=path)
+
+    dependency = mock.Mock()
+    dependency.name = "foo"
+
+    def run_command():
+        with tracer.span(name="git pull", category="command"):
+            return "/tmp/foo"
+
+    resolver = mock.Mock()
+    resolver.resolve.side_effect = run_command
+
+    # The resolvers are nested, the commands are attributed to the dependency
+    # of the enclosing resolver
+    inner = tracer.trace(resolver=resolver, dependency=dependency)
+    outer = tracer.trace(resolver=inner, dependency=dependency)
+
+    assert outer.resolve() == "/tmp/foo"
+
+    # Commands outside a resolver are not attributed to a dependency
+    with tracer.span(name="git config", category="command"):
+        pass
+
+    summary = tracer.summary()
+    assert len(summary) == 1
+    assert summary[0]["dependency"] == "foo"
+    assert summary[0]["commands"] == 1
+    assert summary[0]["resolve"] >= summary[0]["command_time"]
+
+    tracer.write()
+
+    with open(path, "r") as trace_file:
+        trace = json.load(trace_file)
+
+    events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in events] == [
+        "git pull",
+        "Mock",
+        "TraceResolver",
+        "git config",
+    ]
+    assert events[0]["args"]["dependency"] == "foo"
+    assert events[3]["args"]["dependency"] is None
+
+    metadata = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert metadata[0]["name"] == "thread_name"
+
+
+def test_resolve_tracer_command_name():
+    assert ResolveTracer.command_name(["git", "pull"]) == "git pull"
+    assert ResolveTracer.command_name("git pull --rebase") == "git pull --rebase"
+    assert (
+        ResolveTracer.command_name(["git", "--git-dir", "/tmp/.git", "show", "a:b"])
+        == "git show"
+    )
@@ -0,0 +1,89 @@
+import io
+import os
+import tarfile
+
+import pytest
+
+from wurf.error import WurfError
+from wurf.tar_stream_extractor import TarStreamExtractor
+
+
+def create_archive(members, mode="w:gz"):
+    data = io.BytesIO()
+
+    with tarfile.open(fileobj=data, mode=mode) as tar:
+        for name, content in members:
+            info = tarfile.TarInfo(name=name)
+
+            if content is None:
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                tar.addfile(info)
+            else:
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+
+    return data.getvalue()
+
+
+def extract(archive, to_path, chunk_size=7):
+    extractor = TarStreamExtractor(to_path=to_path)
+
+    for offset in range(0, len(archive), chunk_size):
+        end = offset + chunk_size
+        extractor.update(archive[offset:end])
+
+    extractor.close()
+
+    assert extractor.size == len(archive)
+
+
+@pytest.mark.parametrize("mode", ["w", "w:gz", "w:bz2", "w:xz"])
+def test_tar_stream_extractor(testdirectory, mode):
+    archive = create_archive(
+        [("pkg", None), ("pkg/a.txt", b"hello"), ("pkg/sub/b.txt", b"world" * 1000)],
+        mode=mode,
+    )
+
+    to_path = os.path.join(testdirectory.path(), "extract")
+    extract(archive=archive, to_path=to_path)
+
+    extracted = testdirectory.from_path(to_path)
+    assert extracted.contains_file("pkg/a.txt")
+    assert extracted.contains_file("pkg/sub/b.txt")
+
+    with open(os.path.join(to_path, "pkg", "sub", "b.txt"), "rb") as f:
+        assert f.read() == b"world" * 1000
+
+
+def test_tar_stream_extractor_unsafe(testdirectory):
+    archive = create_archive([("../evil.txt", b"evil")])
+
+    to_path = os.path.join(testdirectory.path(), "extract")
+
+    with pytest.raises(WurfError):
+        extract(archive=archive, to_path=to_path)
+
+    assert not testdirectory.contains_file("evil.txt")
+
+
+def test_tar_stream_extractor_invalid(testdirectory):
+    to_path = os.path.join(testdirectory.path(), "extract")
+
+    extractor = TarStreamExtractor(to_path=to_path)
+
+    # More data than is buffered, the extraction fails on the first chunk
+    for _ in range(TarStreamExtractor.MAX_CHUNKS * 2):
+        extractor.update(b"not a tar archive" * 100)
+
+    extractor.abort()
+
+    assert not os.path.exists(to_path)
+
+
+def test_tar_stream_extractor_supports():
+    assert TarStreamExtractor.supports("foo.tar.gz")
+    assert TarStreamExtractor.supports("FOO.TGZ")
+    assert TarStreamExtractor.supports("foo.tar.xz")
+    assert not TarStreamExtractor.supports("foo.zip")
+    assert not TarStreamExtractor.supports(None)
@@ -1,6 +1,12 @@
 import vcr
 import os
+import hashlib
+import http.server
+import threading
 
+import pytest
+
+from wurf.error import WurfError
 from wurf.url_download import UrlDownload
 
 
@@ -58,3 +64,162 @@ def test_url_download_stub(testdirectory):
     path = download.download(cwd=cwd, source=source)
 
     assert os.path.join(cwd, "6.0.0.zip") == path
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    content = b"0123456789" * 1000
+    etag = '"v1"'
+
+    # The number of bytes sent before the connection is dropped or None
+    interrupt = None
+    requests = []
+
+    def do_GET(self):
+        RangeHandler.requests.append(dict(self.headers))
+
+        content = RangeHandler.content
+        range_header = self.headers.get("Range", None)
+
+        if self.headers.get("If-None-Match") == RangeHandler.etag:
+            self.send_response(304)
+            self.send_header("ETag", RangeHandler.etag)
+            self.end_headers()
+            return
+
+        if range_header and self.headers.get("If-Range") == RangeHandler.etag:
+            offset = int(range_header.split("=")[1].rstrip("-"))
+            body = content[offset:]
+
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {offset}-{len(content) - 1}/{len(content)}"
+            )
+        else:
+            body = content
+            self.send_response(200)
+
+        self.send_header("ETag", RangeHandler.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if RangeHandler.interrupt is not None:
+            body = body[: RangeHandler.interrupt]
+            RangeHandler.interrupt = None
+            self.close_connection = True
+
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def range_server():
+    RangeHandler.requests = []
+    RangeHandler.interrupt = None
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    httpd.daemon_threads = True
+
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield "http://127.0.0.1:{}/file.bin".format(httpd.server_address[1])
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_url_download_resume(testdirectory, range_server):
+    cwd = testdirectory.path()
+    part_path = os.path.join(cwd, "partial")
+
+    download = UrlDownload()
+
+    # The connection is dropped after 3000 bytes
+    RangeHandler.interrupt = 3000
+
+    with pytest.raises(WurfError):
+        download.download(cwd=cwd, source=range_server, part_path=part_path)
+
+    assert not testdirectory.contains_file("file.bin")
+    assert len(os.listdir(part_path)) == 2
+
+    hasher = hashlib.sha256()
+    path = download.download(
+        cwd=cwd, source=range_server, part_path=part_path, hasher=hasher
+    )
+
+    assert os.path.join(cwd, "file.bin") == path
+    assert RangeHandler.requests[-1]["Range"] == "bytes=3000-"
+
+    with open(path, "rb") as f:
+        assert f.read() == RangeHandler.content
+
+    assert hasher.hexdigest() == hashlib.sha256(RangeHandler.content).hexdigest()
+    assert os.listdir(part_path) == []
+
+
+def test_url_download_resume_changed(testdirectory, range_server):
+    cwd = testdirectory.path()
+    part_path = os.path.join(cwd, "partial")
+
+    download = UrlDownload()
+
+    RangeHandler.interrupt = 3000
+
+    with pytest.raises(WurfError):
+        download.download(cwd=cwd, source=range_server, part_path=part_path)
+
+    # The file changed on the server, so the download starts over
+    RangeHandler.etag = '"v2"'
+
+    try:
+        path = download.download(cwd=cwd, source=range_server, part_path=part_path)
+    finally:
+        RangeHandler.etag = '"v1"'
+
+    with open(path, "rb") as f:
+        assert f.read() == RangeHandler.content
+
+
+def test_url_download_validators(testdirectory, range_server):
+    cwd = testdirectory.path()
+    part_path = os.path.join(cwd, "partial")
+
+    download = UrlDownload()
+
+    validators = {}
+    path = download.download(
+        cwd=cwd, source=range_server, part_path=part_path, validators=validators
+    )
+
+    assert os.path.isfile(path)
+    assert validators == {
+        "etag": '"v1"',
+        "last_modified": None,
+        "content_length": len(RangeHandler.content),
+    }
+
+    # The file was not modified
+    for part in [part_path, None]:
+        path = download.download(
+            cwd=cwd, source=range_server, part_path=part, validators=dict(validators)
+        )
+        assert path is None
+        assert RangeHandler.requests[-1]["If-None-Match"] == '"v1"'
+
+    # The file was modified
+    RangeHandler.etag = '"v2"'
+
+    try:
+        path = download.download(
+            cwd=cwd, source=range_server, part_path=part_path, validators=validators
+        )
+    finally:
+        RangeHandler.etag = '"v1"'
+
+    assert os.path.isfile(path)
+    assert validators["etag"] == '"v2"'